@@ -0,0 +1,109 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: data_passing
+   :synopsis: A module deciding how data is handed from one state to another
+
+"""
+from copy import deepcopy
+
+from rafcon.core.config import global_config
+from rafcon.utils import log
+
+try:
+    from numpy import ndarray, generic as numpy_scalar
+except ImportError:
+    ndarray = numpy_scalar = None
+
+logger = log.get_logger(__name__)
+
+DATA_PASSING_COPY = "copy"
+DATA_PASSING_REFERENCE = "reference"
+
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, range, type)
+
+
+def data_passing_by_reference_enabled():
+    """Checks whether values, that cannot be mutated by the receiving state, are passed by reference
+
+    :return: True if DATA_PASSING_POLICY is set to "reference" in the config, False else
+    :rtype: bool
+    """
+    return global_config.get_config_value("DATA_PASSING_POLICY", DATA_PASSING_COPY) == DATA_PASSING_REFERENCE
+
+
+def is_immutable(value):
+    """Checks whether a value cannot be changed in place
+
+    Tuples and frozensets are only immutable, if all of their elements are.
+
+    :param value: the value to be checked
+    :rtype: bool
+    """
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return True
+    if numpy_scalar is not None and isinstance(value, numpy_scalar):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(is_immutable(element) for element in value)
+    return False
+
+
+def read_only_view(array):
+    """Creates a view on a NumPy array, through which the data of the array cannot be changed
+
+    Arrays holding Python objects are copied instead, as their elements could still be changed in place.
+
+    :param numpy.ndarray array: the array to be shared
+    :return: a read-only view on the array or a copy of it
+    :rtype: numpy.ndarray
+    """
+    if array.dtype.hasobject:
+        return deepcopy(array)
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def share_value(value):
+    """Hands over a value without copying it, if the receiver cannot change it in place
+
+    Immutable values are passed by reference, NumPy arrays are passed as read-only views and all other values are
+    deep-copied. A state wanting to change a shared array thus has to copy it explicitly (copy-on-write).
+
+    :param value: the value to be handed over
+    :return: the value, a read-only view on it or a copy of it
+    """
+    if is_immutable(value):
+        return value
+    if ndarray is not None and isinstance(value, ndarray):
+        return read_only_view(value)
+    return deepcopy(value)
+
+
+def pass_value(value):
+    """Hands over a value from one state to another according to the configured DATA_PASSING_POLICY
+
+    :param value: the value to be handed over
+    :return: a deep copy of the value for the "copy" policy, see :func:`share_value` for the "reference" policy
+    """
+    if data_passing_by_reference_enabled():
+        return share_value(value)
+    return deepcopy(value)
+
+
+def pass_values(dictionary):
+    """Hands over all values of a dictionary according to the configured DATA_PASSING_POLICY
+
+    :param dict dictionary: the dictionary to be handed over
+    :return: a new dictionary holding the passed values
+    :rtype: dict
+    """
+    if data_passing_by_reference_enabled():
+        return {key: share_value(value) for key, value in dictionary.items()}
+    return deepcopy(dictionary)
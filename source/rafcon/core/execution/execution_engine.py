@@ -37,59 +37,205 @@ from rafcon.utils import plugins
 logger = log.get_logger(__name__)
 
 
+class ExecutionContext(object):
+    """The execution data of a single state machine run by the execution engine
+
+    Every state machine executed in parallel to others has its own context, so that it can be started, paused, stepped
+    and stopped independently. The execution history is kept by the state machine itself.
+
+    :ivar state_machine_id: the id of the state machine executed in the context, None for the default context
+    :ivar status: the execution status of the state machine, including its execution condition variable
+    :ivar state_machine: the state machine, which is executed in the context
+    :ivar start_state_paths: the paths of the states, from which the execution starts
+    :ivar state_machine_running: whether the state machine did not finish its execution yet
+    :ivar synchronization_counter: counts how often the execution waited on the execution condition variable
+    """
+
+    def __init__(self, state_machine_id=None, status=None):
+        self.state_machine_id = state_machine_id
+        self.status = status or ExecutionStatus(StateMachineExecutionStatus.STOPPED)
+        self.state_machine = None
+        self.start_state_paths = []
+        self.state_machine_running = False
+        self.wait_for_finishing_thread = None
+        # the thread, that wants to synchronize, has to acquire the self.status.execution_condition_variable
+        # then it can read or set the synchronization_counter; this is only relevant for tests
+        self.synchronization_counter = 0
+        self._run_to_states = []
+        self._run_to_states_lock = Lock()
+
+    def finished_or_stopped(self):
+        """Condition check on finished or stopped status of the execution
+
+        :return: outcome of condition check stopped or finished
+        :rtype: bool
+        """
+        return (self.status.execution_mode is StateMachineExecutionStatus.STOPPED) or \
+               (self.status.execution_mode is StateMachineExecutionStatus.FINISHED)
+
+    @property
+    def run_to_states(self):
+        """Property for the _run_to_states field
+
+        """
+        with self._run_to_states_lock:
+            return self._run_to_states
+
+    @run_to_states.setter
+    def run_to_states(self, run_to_states):
+        if not isinstance(run_to_states, list):
+            raise TypeError("run_to_states must be of type list")
+        with self._run_to_states_lock:
+            self._run_to_states = run_to_states
+
+
 class ExecutionEngine(Observable):
     """A class that cares for the execution of the state machine
 
+    The active state machine is executed in the default execution context, whose status is the status of the
+    execution engine. State machines started while another state machine is executed in the default context get an
+    execution context of their own. All methods controlling the execution take an optional state machine id to select
+    the execution context; without id, the default context is controlled. Ids of state machines, which are not
+    executed, are ignored with a warning.
+
     :ivar state_machine_manager: holds the state machine manager of all states that can be executed
     :ivar status: holds the current execution status of the state machine
     :ivar execution_history: the history of the execution TODO: should be an list
 
     """
 
-    __wait_for_finishing_thread = None
-    __running_state_machine = None
-
     def __init__(self, state_machine_manager):
         Observable.__init__(self)
         self.state_machine_manager = state_machine_manager
         self._status = ExecutionStatus(StateMachineExecutionStatus.STOPPED)
+        self._default_context = ExecutionContext(status=self._status)
+        # the contexts of the state machines executed in parallel to the default context, by state machine id
+        self._execution_contexts = {}
+        self._execution_contexts_lock = Lock()
         logger.debug("State machine execution engine initialized")
-        self.start_state_paths = []
 
-        self.execution_engine_lock = Lock()
-        self._run_to_states = []
-        self.run_to_states = []
-        self.state_machine_running = False
-        # the thread, that wants to synchronize, has to acquire the self._status.execution_condition_variable
-        # then it can read or set the synchronization_counter; this is only relevant for tests
-        self.synchronization_counter = 0
         # counts how often a state asks for the current execution status
         self.state_counter = 0
         self.state_counter_lock = Lock()
 
+    def get_execution_context(self, state_machine_id=None):
+        """Returns the execution context of a state machine
+
+        :param state_machine_id: the id of the state machine, None for the default context
+        :return: the context, in which the state machine is executed; None, if the state machine is neither executed
+            in a context of its own nor the state machine of the default context
+        :rtype: ExecutionContext
+        """
+        context = self._find_execution_context(state_machine_id)
+        if context is None:
+            logger.warning("The state machine with id {0} is not executed".format(state_machine_id))
+        return context
+
+    def get_execution_contexts(self):
+        """Returns the default execution context and the contexts of all state machines executed in parallel to it
+
+        :rtype: list
+        """
+        with self._execution_contexts_lock:
+            return [self._default_context] + list(self._execution_contexts.values())
+
+    def _find_execution_context(self, state_machine_id):
+        if state_machine_id is None:
+            return self._default_context
+        with self._execution_contexts_lock:
+            context = self._execution_contexts.get(state_machine_id)
+        if context is not None:
+            return context
+        default_state_machine = self._default_context.state_machine
+        if self.state_machine_manager.active_state_machine_id == state_machine_id or \
+                default_state_machine is not None and default_state_machine.state_machine_id == state_machine_id:
+            return self._default_context
+        return None
+
+    def get_execution_context_of_state(self, state):
+        """Returns the execution context of the state machine the state belongs to
+
+        :param rafcon.core.states.state.State state: the executed state
+        :return: the context of the state machine of the state; the default context, if the state does not belong to a
+            state machine executed by the engine
+        :rtype: ExecutionContext
+        """
+        state_machine = state.get_state_machine()
+        context = self._find_execution_context(state_machine.state_machine_id if state_machine else None)
+        return context or self._default_context
+
+    def _get_execution_context_for_start(self, state_machine_id):
+        """Selects the execution context for starting or resuming the execution of a state machine
+
+        The default context is used, if no state machine id is given, if the state machine is already executed in the
+        default context or if the default context is idle. Otherwise, the state machine gets a context of its own.
+
+        :param state_machine_id: the id of the state machine to be executed
+        :rtype: ExecutionContext
+        """
+        if state_machine_id is None:
+            return self._default_context
+        default_context = self._default_context
+        with self._execution_contexts_lock:
+            context = self._execution_contexts.get(state_machine_id)
+            if context is not None and (not context.finished_or_stopped() or context.state_machine_running):
+                return context
+            if default_context.finished_or_stopped() and not default_context.state_machine_running:
+                self._execution_contexts.pop(state_machine_id, None)
+                return default_context
+            if default_context.state_machine is not None and \
+                    default_context.state_machine.state_machine_id == state_machine_id:
+                return default_context
+            if context is None:
+                context = ExecutionContext(state_machine_id)
+                self._execution_contexts[state_machine_id] = context
+            return context
+
+    def remove_execution_context(self, state_machine_id):
+        """Removes the execution context of a state machine, which is not executed anymore
+
+        :param state_machine_id: the id of the state machine
+        """
+        with self._execution_contexts_lock:
+            context = self._execution_contexts.get(state_machine_id)
+            if context is not None and context.finished_or_stopped() and not context.state_machine_running:
+                del self._execution_contexts[state_machine_id]
+
+    def _get_state_machine_of_context(self, context):
+        if context is self._default_context:
+            return self.state_machine_manager.get_active_state_machine()
+        return self.state_machine_manager.state_machines.get(context.state_machine_id)
+
     @Observable.observed
-    def pause(self):
+    def pause(self, state_machine_id=None):
         """Set the execution mode to paused
+
+        :param state_machine_id: the id of the state machine to be paused, None for the default context
         """
-        if self.state_machine_manager.active_state_machine_id is None:
+        context = self.get_execution_context(state_machine_id)
+        if context is None:
+            return
+        state_machine = self._get_state_machine_of_context(context)
+        if context is self._default_context and self.state_machine_manager.active_state_machine_id is None or \
+                state_machine is None:
             logger.info("'Pause' is not a valid action to initiate state machine execution.")
             return
-        if self.state_machine_manager.get_active_state_machine() is not None:
-            self.state_machine_manager.get_active_state_machine().root_state.recursively_pause_states()
+        state_machine.root_state.recursively_pause_states()
 
         logger.debug("Pause execution ...")
-        self.set_execution_mode(StateMachineExecutionStatus.PAUSED)
+        self._set_execution_mode_of_context(context, StateMachineExecutionStatus.PAUSED)
 
-    def finished_or_stopped(self):
+    def finished_or_stopped(self, state_machine_id=None):
         """ Condition check on finished or stopped status
 
         The method returns a value which is equivalent with not 'active' status of the current state machine.
 
-        :return: outcome of condition check stopped or finished
+        :param state_machine_id: the id of the state machine to be checked, None for the default context
+        :return: outcome of condition check stopped or finished, True for a state machine that is not executed
         :rtype: bool
         """
-        return (self._status.execution_mode is StateMachineExecutionStatus.STOPPED) or \
-               (self._status.execution_mode is StateMachineExecutionStatus.FINISHED)
+        context = self._find_execution_context(state_machine_id)
+        return context is None or context.finished_or_stopped()
 
     @Observable.observed
     def start(self, state_machine_id=None, start_state_path=None):
@@ -97,46 +243,50 @@ class ExecutionEngine(Observable):
 
         If no state machine is running start a specific state machine.
         If no state machine is provided the currently active state machine is started.
-        If there is already a state machine running, just resume it without taking the passed state_machine_id argument
-        into account.
+        If the state machine is already running, just resume it. If another state machine is running, the state
+        machine is started in an execution context of its own, without changing the active state machine.
 
         :param state_machine_id: The id if the state machine to be started
         :param start_state_path: The path of the state in the state machine, from which the execution will start
         :return:
         """
+        context = self._get_execution_context_for_start(state_machine_id)
 
-        if not self.finished_or_stopped():
+        if not context.finished_or_stopped():
             logger.debug("Resume execution engine ...")
-            self.run_to_states = []
-            if self.state_machine_manager.get_active_state_machine() is not None:
-                self.state_machine_manager.get_active_state_machine().root_state.recursively_resume_states()
-                if isinstance(state_machine_id, int) and \
-                        state_machine_id != self.state_machine_manager.get_active_state_machine().state_machine_id:
-                    logger.info("Resumed state machine with id {0} but start of state machine id {1} was requested."
-                                "".format(self.state_machine_manager.get_active_state_machine().state_machine_id,
-                                          state_machine_id))
-            self.set_execution_mode(StateMachineExecutionStatus.STARTED)
+            context.run_to_states = []
+            state_machine = self._get_state_machine_of_context(context)
+            if state_machine is not None:
+                state_machine.root_state.recursively_resume_states()
+            self._set_execution_mode_of_context(context, StateMachineExecutionStatus.STARTED)
         else:
             # do not start another state machine before the old one did not finish its execution
-            if self.state_machine_running:
+            if context.state_machine_running:
                 logger.warning("An old state machine is still running! Make sure that it terminates,"
                                " before you can start another state machine! {0}".format(self))
                 return
 
             logger.debug("Start execution engine ...")
-            if state_machine_id is not None:
-                self.state_machine_manager.active_state_machine_id = state_machine_id
-
-            if not self.state_machine_manager.active_state_machine_id:
-                logger.error("There exists no active state machine!")
+            if context is self._default_context:
+                if state_machine_id is not None:
+                    self.state_machine_manager.active_state_machine_id = state_machine_id
+
+                if not self.state_machine_manager.active_state_machine_id:
+                    logger.error("There exists no active state machine!")
+                    return
+            elif state_machine_id not in self.state_machine_manager.state_machines:
+                logger.error("There exists no state machine with id {0}!".format(state_machine_id))
                 return
+            state_machine = self._get_state_machine_of_context(context)
 
             if not global_config.get_config_value("SCRIPT_RECOMPILATION_ON_STATE_EXECUTION", True):
-                self.recompile_execution_scripts_recursively()
+                self.recompile_execution_scripts_recursively(state_machine)
+            elif global_config.get_config_value("SCRIPT_PRECOMPILATION_ON_START", True):
+                self.precompile_execution_scripts_recursively(state_machine)
 
-            self.set_execution_mode(StateMachineExecutionStatus.STARTED)
+            self._set_execution_mode_of_context(context, StateMachineExecutionStatus.STARTED)
 
-            self.start_state_paths = []
+            context.start_state_paths = []
 
             if start_state_path:
                 path_list = start_state_path.split("/")
@@ -146,183 +296,198 @@ class ExecutionEngine(Observable):
                         cur_path = path
                     else:
                         cur_path = cur_path + "/" + path
-                    self.start_state_paths.append(cur_path)
+                    context.start_state_paths.append(cur_path)
 
-            self._run_active_state_machine()
+            self._run_state_machine(context, state_machine)
 
     @Observable.observed
-    def stop(self):
+    def stop(self, state_machine_id=None):
         """Set the execution mode to stopped
+
+        :param state_machine_id: the id of the state machine to be stopped, None for the default context
         """
         logger.debug("Stop the state machine execution ...")
-        if self.state_machine_manager.get_active_state_machine() is not None:
-            self.state_machine_manager.get_active_state_machine().root_state.recursively_preempt_states()
-        self.__set_execution_mode_to_stopped()
+        context = self.get_execution_context(state_machine_id)
+        if context is None:
+            return
+        state_machine = self._get_state_machine_of_context(context)
+        if state_machine is not None:
+            state_machine.root_state.recursively_preempt_states()
+        context.run_to_states = []
+        self._set_execution_mode_of_context(context, StateMachineExecutionStatus.STOPPED)
 
         # Notifies states waiting in step mode or those that are paused about execution stop
-        with self._status.execution_condition_variable:
-            self._status.execution_condition_variable.notify_all()
-        self.__running_state_machine = None
+        with context.status.execution_condition_variable:
+            context.status.execution_condition_variable.notify_all()
 
-    def join(self, timeout=None):
+    def join(self, timeout=None, state_machine_id=None):
         """Blocking wait for the execution to finish
 
         :param float timeout: Maximum time to wait or None for infinitely
+        :param state_machine_id: the id of the state machine to wait for, None for the default context
         :return: True if the execution finished, False if no state machine was started or a timeout occurred
         :rtype: bool
         """
-        if self.__wait_for_finishing_thread:
+        context = self.get_execution_context(state_machine_id)
+        if context is None:
+            return False
+        wait_for_finishing_thread = context.wait_for_finishing_thread
+        if wait_for_finishing_thread:
             if not timeout:
                 # signal handlers won't work if timeout is None and the thread is joined
                 while True:
-                    self.__wait_for_finishing_thread.join(0.5)
-                    if not self.__wait_for_finishing_thread.isAlive():
+                    wait_for_finishing_thread.join(0.5)
+                    if not wait_for_finishing_thread.is_alive():
                         break
             else:
-                self.__wait_for_finishing_thread.join(timeout)
-            return not self.__wait_for_finishing_thread.is_alive()
+                wait_for_finishing_thread.join(timeout)
+            return not wait_for_finishing_thread.is_alive()
         else:
             logger.warning("Cannot join as state machine was not started yet.")
             return False
 
-    def __set_execution_mode_to_stopped(self):
-        """Stop and reset execution engine"""
-        self.run_to_states = []
-        self.set_execution_mode(StateMachineExecutionStatus.STOPPED)
-
-    def __set_execution_mode_to_finished(self):
-        """Stop and reset execution engine"""
-        self.run_to_states = []
-        self.set_execution_mode(StateMachineExecutionStatus.FINISHED)
-
-    def _run_active_state_machine(self):
+    def _run_active_state_machine(self, context=None):
         """Store running state machine and observe its status
-        """
 
-        # Create new concurrency queue for root state to be able to synchronize with the execution
-        self.__running_state_machine = self.state_machine_manager.get_active_state_machine()
-        if not self.__running_state_machine:
-            logger.error("The running state machine must not be None")
-        self.__running_state_machine.root_state.concurrency_queue = queue.Queue(maxsize=0)
+        :param ExecutionContext context: the context to run the state machine in, the default context if None
+        """
+        context = context or self._default_context
+        self._run_state_machine(context, self._get_state_machine_of_context(context))
 
-        if self.__running_state_machine:
-            self.__running_state_machine.start()
+    def _run_state_machine(self, context, state_machine):
+        """Run the state machine in the given execution context and observe its status
 
-            self.__wait_for_finishing_thread = threading.Thread(target=self._wait_for_finishing)
-            self.__wait_for_finishing_thread.start()
+        :param ExecutionContext context: the context to run the state machine in
+        :param rafcon.core.state_machine.StateMachine state_machine: the state machine to be run
+        """
+        if state_machine:
+            context.state_machine = state_machine
+            # Create new concurrency queue for root state to be able to synchronize with the execution
+            state_machine.root_state.concurrency_queue = queue.Queue(maxsize=0)
+            context.state_machine_running = True
+            state_machine.start()
+
+            context.wait_for_finishing_thread = threading.Thread(target=self._wait_for_finishing, args=(context,))
+            context.wait_for_finishing_thread.start()
         else:
             logger.warning("Currently no active state machine! Please create a new state machine.")
-            self.set_execution_mode(StateMachineExecutionStatus.STOPPED)
-
-    def _wait_for_finishing(self):
-        """Observe running state machine and stop engine if execution has finished"""
-        self.state_machine_running = True
-        self.__running_state_machine.join()
-        self.__set_execution_mode_to_finished()
-        self.state_machine_manager.active_state_machine_id = None
+            self._set_execution_mode_of_context(context, StateMachineExecutionStatus.STOPPED)
+
+    def _wait_for_finishing(self, context):
+        """Observe running state machine and stop engine if execution has finished
+
+        :param ExecutionContext context: the context of the running state machine
+        """
+        context.state_machine.join()
+        context.run_to_states = []
+        self._set_execution_mode_of_context(context, StateMachineExecutionStatus.FINISHED)
+        if context is self._default_context:
+            self.state_machine_manager.active_state_machine_id = None
         plugins.run_on_state_machine_execution_finished()
-        # self.__set_execution_mode_to_stopped()
-        self.state_machine_running = False
+        context.state_machine_running = False
 
-    def backward_step(self):
+    def backward_step(self, state_machine_id=None):
         """Take a backward step for all active states in the state machine
         """
         logger.debug("Executing backward step ...")
-        self.run_to_states = []
-        self.set_execution_mode(StateMachineExecutionStatus.BACKWARD)
+        context = self.get_execution_context(state_machine_id)
+        if context is None:
+            return
+        context.run_to_states = []
+        self._set_execution_mode_of_context(context, StateMachineExecutionStatus.BACKWARD)
 
     @Observable.observed
     def step_mode(self, state_machine_id=None):
         """Set the execution mode to stepping mode. Transitions are only triggered if a new step is triggered
         """
         logger.debug("Activate step mode")
+        self._step(StateMachineExecutionStatus.STEP_MODE, state_machine_id)
 
-        if state_machine_id is not None:
-            self.state_machine_manager.active_state_machine_id = state_machine_id
-
-        self.run_to_states = []
-        if self.finished_or_stopped():
-            self.set_execution_mode(StateMachineExecutionStatus.STEP_MODE)
-            self._run_active_state_machine()
-        else:
-            self.set_execution_mode(StateMachineExecutionStatus.STEP_MODE)
-
-    def step_into(self):
+    def step_into(self, state_machine_id=None):
         """Take a forward step (into) for all active states in the state machine
         """
         logger.debug("Execution step into ...")
-        self.run_to_states = []
-        if self.finished_or_stopped():
-            self.set_execution_mode(StateMachineExecutionStatus.FORWARD_INTO)
-            self._run_active_state_machine()
-        else:
-            self.set_execution_mode(StateMachineExecutionStatus.FORWARD_INTO)
+        self._step(StateMachineExecutionStatus.FORWARD_INTO, state_machine_id)
 
-    def step_over(self):
+    def step_over(self, state_machine_id=None):
         """Take a forward step (over) for all active states in the state machine
         """
         logger.debug("Execution step over ...")
-        self.run_to_states = []
-        if self.finished_or_stopped():
-            self.set_execution_mode(StateMachineExecutionStatus.FORWARD_OVER)
-            self._run_active_state_machine()
-        else:
-            self.set_execution_mode(StateMachineExecutionStatus.FORWARD_OVER)
+        self._step(StateMachineExecutionStatus.FORWARD_OVER, state_machine_id)
 
-    def step_out(self):
+    def step_out(self, state_machine_id=None):
         """Take a forward step (out) for all active states in the state machine
         """
         logger.debug("Execution step out ...")
-        self.run_to_states = []
-        if self.finished_or_stopped():
-            self.set_execution_mode(StateMachineExecutionStatus.FORWARD_OUT)
-            self._run_active_state_machine()
+        self._step(StateMachineExecutionStatus.FORWARD_OUT, state_machine_id)
+
+    def _step(self, execution_mode, state_machine_id=None):
+        """Set a step mode and run the state machine, if it is not executed yet
+
+        :param execution_mode: the step mode
+        :param state_machine_id: the id of the state machine to step, None for the default context
+        """
+        context = self._get_execution_context_for_start(state_machine_id)
+        if context is self._default_context and state_machine_id is not None:
+            self.state_machine_manager.active_state_machine_id = state_machine_id
+
+        context.run_to_states = []
+        if context.finished_or_stopped():
+            self._set_execution_mode_of_context(context, execution_mode)
+            self._run_active_state_machine(context)
         else:
-            self.set_execution_mode(StateMachineExecutionStatus.FORWARD_OUT)
+            self._set_execution_mode_of_context(context, execution_mode)
 
     def run_to_selected_state(self, path, state_machine_id=None):
         """Execute the state machine until a specific state. This state won't be executed. This is an asynchronous task
         """
-        if self.state_machine_manager.get_active_state_machine() is not None:
-            self.state_machine_manager.get_active_state_machine().root_state.recursively_resume_states()
-
-        if not self.finished_or_stopped():
+        context = self._get_execution_context_for_start(state_machine_id)
+        if not context.finished_or_stopped():
+            state_machine = self._get_state_machine_of_context(context)
+            if state_machine is not None:
+                state_machine.root_state.recursively_resume_states()
             logger.debug("Resume execution engine and run to selected state!")
-            self.run_to_states = []
-            self.run_to_states.append(path)
-            self.set_execution_mode(StateMachineExecutionStatus.RUN_TO_SELECTED_STATE)
+            context.run_to_states = []
+            context.run_to_states.append(path)
+            self._set_execution_mode_of_context(context, StateMachineExecutionStatus.RUN_TO_SELECTED_STATE)
         else:
             logger.debug("Start execution engine and run to selected state!")
-            if state_machine_id is not None:
+            if context is self._default_context and state_machine_id is not None:
                 self.state_machine_manager.active_state_machine_id = state_machine_id
-            self.set_execution_mode(StateMachineExecutionStatus.RUN_TO_SELECTED_STATE)
-            self.run_to_states = []
-            self.run_to_states.append(path)
-            self._run_active_state_machine()
-
-    def _wait_while_in_pause_or_in_step_mode(self):
+            state_machine = self._get_state_machine_of_context(context)
+            if state_machine is not None:
+                state_machine.root_state.recursively_resume_states()
+            self._set_execution_mode_of_context(context, StateMachineExecutionStatus.RUN_TO_SELECTED_STATE)
+            context.run_to_states = []
+            context.run_to_states.append(path)
+            self._run_active_state_machine(context)
+
+    def _wait_while_in_pause_or_in_step_mode(self, context):
         """ Waits as long as the execution_mode is in paused or step_mode
         """
-        while (self._status.execution_mode is StateMachineExecutionStatus.PAUSED) \
-                or (self._status.execution_mode is StateMachineExecutionStatus.STEP_MODE):
-            with self._status.execution_condition_variable:
-                self.synchronization_counter += 1
-                logger.verbose("Increase synchronization_counter: " + str(self.synchronization_counter))
-                self._status.execution_condition_variable.wait()
-
-    def _wait_if_required(self, container_state, next_child_state_to_execute, woke_up_from_pause_or_step_mode):
+        status = context.status
+        while (status.execution_mode is StateMachineExecutionStatus.PAUSED) \
+                or (status.execution_mode is StateMachineExecutionStatus.STEP_MODE):
+            with status.execution_condition_variable:
+                context.synchronization_counter += 1
+                logger.verbose("Increase synchronization_counter: " + str(context.synchronization_counter))
+                status.execution_condition_variable.wait()
+
+    def _wait_if_required(self, context, container_state, next_child_state_to_execute,
+                          woke_up_from_pause_or_step_mode):
         """ Calls a blocking wait for the calling thread, depending on the execution mode.
 
+        :param context: the execution context of the state machine of :param container_state
         :param container_state: the current hierarhcy state to handle the execution mode for
         :param next_child_state_to_execute: the next child state for :param container_state to be executed
         :param woke_up_from_pause_or_step_mode: a flag to check if the execution just woke up from paused- or step-mode
         """
         wait = True
-        # if there is a state in self.run_to_states then RAFCON was commanded
+        # if there is a state in context.run_to_states then RAFCON was commanded
         #    a) a step_over
         #    b) a step_out
         #    c) a run_until
-        for state_path in copy.deepcopy(self.run_to_states):
+        for state_path in copy.deepcopy(context.run_to_states):
             next_child_state_path = None
             # can be None in case of no transition given
             if next_child_state_to_execute:
@@ -330,10 +495,10 @@ class ExecutionEngine(Observable):
             if state_path == container_state.get_path():
                 # the execution did a whole step_over inside hierarchy state "state" (case a) )
                 # or a whole step_out into the hierarchy state "state" (case b) )
-                # thus we delete its state path from self.run_to_states
+                # thus we delete its state path from context.run_to_states
                 # and wait for another step (of maybe different kind)
                 wait = True
-                self.run_to_states.remove(state_path)
+                context.run_to_states.remove(state_path)
                 break
             elif state_path == next_child_state_path:
                 # this is the case that execution has reached a specific state explicitly marked via
@@ -341,7 +506,7 @@ class ExecutionEngine(Observable):
                 # if this is the case run_to_selected_state() is finished and the execution
                 # has to wait for new execution commands
                 wait = True
-                self.run_to_states.remove(state_path)
+                context.run_to_states.remove(state_path)
                 break
             # don't wait if its just a normal step
             else:
@@ -351,12 +516,12 @@ class ExecutionEngine(Observable):
         # don't wait if the the execution just woke up from step mode or pause
         if wait and not woke_up_from_pause_or_step_mode:
             logger.debug("Stepping mode: waiting for next step!")
-            with self._status.execution_condition_variable:
-                self.synchronization_counter += 1
-                logger.verbose("Increase synchronization_counter: " + str(self.synchronization_counter))
-                self._status.execution_condition_variable.wait()
+            with context.status.execution_condition_variable:
+                context.synchronization_counter += 1
+                logger.verbose("Increase synchronization_counter: " + str(context.synchronization_counter))
+                context.status.execution_condition_variable.wait()
             # if the status was set to PAUSED or STEP_MODE don't wake up!
-            self._wait_while_in_pause_or_in_step_mode()
+            self._wait_while_in_pause_or_in_step_mode(context)
             # container_state was notified => thus, a new user command was issued, which has to be handled!
             container_state.execution_history.new_execution_command_handled = False
 
@@ -364,7 +529,8 @@ class ExecutionEngine(Observable):
         """Checks the current execution status and returns it.
 
         Depending on the execution state, the calling thread (currently only hierarchy states) waits for the
-        execution to continue.
+        execution to continue. The execution status is the one of the execution context of the state machine
+        :param container_state belongs to.
 
         If the execution mode is any of the step modes, a condition variable stops the current execution,
         until it gets notified by the step_*() or backward_step() functions.
@@ -377,46 +543,49 @@ class ExecutionEngine(Observable):
             self.state_counter += 1
             # logger.verbose("Increase state_counter!" + str(self.state_counter))
 
+        context = self.get_execution_context_of_state(container_state)
+        status = context.status
         woke_up_from_pause_or_step_mode = False
 
-        if (self._status.execution_mode is StateMachineExecutionStatus.PAUSED) \
-                or (self._status.execution_mode is StateMachineExecutionStatus.STEP_MODE):
-            self._wait_while_in_pause_or_in_step_mode()
+        if (status.execution_mode is StateMachineExecutionStatus.PAUSED) \
+                or (status.execution_mode is StateMachineExecutionStatus.STEP_MODE):
+            self._wait_while_in_pause_or_in_step_mode(context)
             # new command was triggered => execution command has to handled
             container_state.execution_history.new_execution_command_handled = False
             woke_up_from_pause_or_step_mode = True
 
         # no elif here: if the execution woke up from e.g. paused mode, it has to check the current execution mode
-        if self._status.execution_mode is StateMachineExecutionStatus.STARTED:
+        if status.execution_mode is StateMachineExecutionStatus.STARTED:
             # logger.debug("Execution engine started!")
             pass
 
-        elif self._status.execution_mode is StateMachineExecutionStatus.STOPPED:
+        elif status.execution_mode is StateMachineExecutionStatus.STOPPED:
             logger.debug("Execution engine stopped. State '{0}' is going to quit in the case of "
                          "no preemption handling has to be done!".format(container_state.name))
 
-        elif self._status.execution_mode is StateMachineExecutionStatus.FINISHED:
+        elif status.execution_mode is StateMachineExecutionStatus.FINISHED:
             # this must never happen during execution of the execution engine
             raise Exception
 
         else:  # all other step modes
             logger.verbose("before wait")
-            self._wait_if_required(container_state, next_child_state_to_execute, woke_up_from_pause_or_step_mode)
+            self._wait_if_required(context, container_state, next_child_state_to_execute,
+                                   woke_up_from_pause_or_step_mode)
             logger.verbose("after wait")
 
             # calculate states to which should be run
-            if self._status.execution_mode is StateMachineExecutionStatus.BACKWARD:
+            if status.execution_mode is StateMachineExecutionStatus.BACKWARD:
                 pass
-            elif self._status.execution_mode is StateMachineExecutionStatus.FORWARD_INTO:
+            elif status.execution_mode is StateMachineExecutionStatus.FORWARD_INTO:
                 pass
-            elif self._status.execution_mode is StateMachineExecutionStatus.FORWARD_OVER:
+            elif status.execution_mode is StateMachineExecutionStatus.FORWARD_OVER:
                 if not container_state.execution_history.new_execution_command_handled:
                     # the state that called this method is a hierarchy state => thus we save this state and wait until
                     # thise very state will execute its next state; only then we will wait on the condition variable
-                    self.run_to_states.append(container_state.get_path())
+                    context.run_to_states.append(container_state.get_path())
                 else:
                     pass
-            elif self._status.execution_mode is StateMachineExecutionStatus.FORWARD_OUT:
+            elif status.execution_mode is StateMachineExecutionStatus.FORWARD_OUT:
                 from rafcon.core.states.state import State
                 if isinstance(container_state.parent, State):
                     if not container_state.execution_history.new_execution_command_handled:
@@ -425,14 +594,14 @@ class ExecutionEngine(Observable):
                             parent_path = container_state.parent.parent.get_path()
                         else:
                             parent_path = container_state.parent.get_path()
-                        self.run_to_states.append(parent_path)
+                        context.run_to_states.append(parent_path)
                     else:
                         pass
                 else:
                     # if step_out is called from the highest level just run the state machine to the end
-                    self.run_to_states = []
-                    self.set_execution_mode(StateMachineExecutionStatus.STARTED)
-            elif self._status.execution_mode is StateMachineExecutionStatus.RUN_TO_SELECTED_STATE:
+                    context.run_to_states = []
+                    self._set_execution_mode_of_context(context, StateMachineExecutionStatus.STARTED)
+            elif status.execution_mode is StateMachineExecutionStatus.RUN_TO_SELECTED_STATE:
                 # "run_to_states" were already updated thus doing nothing
                 pass
 
@@ -440,25 +609,26 @@ class ExecutionEngine(Observable):
 
         # in the case that the stop method wakes up the paused or step mode a StateMachineExecutionStatus.STOPPED
         # will be returned
-        return_value = self._status.execution_mode
+        return_value = status.execution_mode
 
         return return_value
 
     def _modify_run_to_states(self, state):
         """
         This is a special case. Inside a hierarchy state a step_over is triggered and affects the last child.
-        In this case the self.run_to_states has to be modified in order to contain the parent of the hierarchy state.
+        In this case the run_to_states have to be modified in order to contain the parent of the hierarchy state.
         Otherwise the execution won't respect the step_over any more and run until the end of the state machine.
         The same holds for a step_out.
         The reason for this is, that handle_execution_mode() can not be called between
         the last state of a hierarchy state and the termination of the hierarchy state itself.
         """
-        if self._status.execution_mode is StateMachineExecutionStatus.FORWARD_OVER or \
-                self._status.execution_mode is StateMachineExecutionStatus.FORWARD_OUT:
-            for state_path in copy.deepcopy(self.run_to_states):
+        context = self.get_execution_context_of_state(state)
+        if context.status.execution_mode is StateMachineExecutionStatus.FORWARD_OVER or \
+                context.status.execution_mode is StateMachineExecutionStatus.FORWARD_OUT:
+            for state_path in copy.deepcopy(context.run_to_states):
                 if state_path == state.get_path():
                     logger.verbose("Modifying run_to_states; triggered by state %s!", state.name)
-                    self.run_to_states.remove(state_path)
+                    context.run_to_states.remove(state_path)
                     from rafcon.core.states.state import State
                     if isinstance(state.parent, State):
                         from rafcon.core.states.library_state import LibraryState
@@ -466,7 +636,7 @@ class ExecutionEngine(Observable):
                             parent_path = state.parent.parent.get_path()
                         else:
                             parent_path = state.parent.get_path()
-                        self.run_to_states.append(parent_path)
+                        context.run_to_states.append(parent_path)
                     break
 
     def execute_state_machine_from_path(self, state_machine=None, path=None, start_state_path=None, wait_for_execution_finished=True):
@@ -488,49 +658,87 @@ class ExecutionEngine(Observable):
             state_machine.state_machine_id, start_state_path=start_state_path)
 
         if wait_for_execution_finished:
-            self.join()
-            self.stop()
+            self.join(state_machine_id=state_machine.state_machine_id)
+            self.stop(state_machine.state_machine_id)
         return state_machine
 
-    def recompile_execution_scripts_recursively(self):
+    def _get_execution_states_recursively(self, state_machine=None):
+        """Collects all execution states of a state machine, including those within libraries
+
+        :param state_machine: the state machine to collect the states of, the active state machine if None
+        :return: the execution states
+        :rtype: list
+        """
         from rafcon.core.states.execution_state import ExecutionState
         from rafcon.core.states.container_state import ContainerState
+        from rafcon.core.states.library_state import LibraryState
 
-        def recompile_execution_state_scripts(state):
+        def collect_execution_states(state):
             if isinstance(state, ExecutionState):
-                try:
-                    state.script.compile_module()
-                except ImportError as e:
-                    logger.info(
-                        "The script of the state '{}' (id {}) uses a module that is not available: {}".format(
-                            state.name, state.state_id, str(e)))
-                except Exception as e:
-                    logger.error("The script of the state '{}' (id {}) contains a {}: {}".format(
-                        state.name, state.state_id, e.__class__.__name__, str(e)))
+                execution_states.append(state)
             elif isinstance(state, ContainerState):
                 for child_state in state.states.values():
-                    recompile_execution_state_scripts(child_state)
-
-        state_machine = self.state_machine_manager.get_active_state_machine()
-        recompile_execution_state_scripts(state_machine.root_state)
-
-
-
+                    collect_execution_states(child_state)
+            elif isinstance(state, LibraryState) and state.state_copy_initialized:
+                # state copies created on their first execution compile their scripts when executed
+                collect_execution_states(state.state_copy)
+
+        execution_states = []
+        state_machine = state_machine or self.state_machine_manager.get_active_state_machine()
+        collect_execution_states(state_machine.root_state)
+        return execution_states
+
+    def recompile_execution_scripts_recursively(self, state_machine=None):
+        for state in self._get_execution_states_recursively(state_machine):
+            try:
+                state.script.compile_module()
+            except ImportError as e:
+                logger.info(
+                    "The script of the state '{}' (id {}) uses a module that is not available: {}".format(
+                        state.name, state.state_id, str(e)))
+            except Exception as e:
+                logger.error("The script of the state '{}' (id {}) contains a {}: {}".format(
+                    state.name, state.state_id, e.__class__.__name__, str(e)))
+
+    def precompile_execution_scripts_recursively(self, state_machine=None):
+        """Compiles the scripts of all execution states of a state machine into the code cache
+
+        The modules of the scripts are built on the execution of the states, but the states of wide concurrency states
+        do not have to compile their scripts at the same time. Errors are reported on the execution of the state.
+        """
+        for state in self._get_execution_states_recursively(state_machine):
+            try:
+                state.script.precompile()
+            except Exception as e:
+                logger.debug("The script of the state '{}' (id {}) could not be precompiled: {}".format(
+                    state.name, state.state_id, e))
 
     @Observable.observed
-    def set_execution_mode(self, execution_mode, notify=True):
+    def set_execution_mode(self, execution_mode, notify=True, state_machine_id=None):
         """ An observed setter for the execution mode of the state machine status. This is necessary for the
         monitoring client to update the local state machine in the same way as the root state machine of the server.
 
         :param execution_mode: the new execution mode of the state machine
+        :param notify: whether to wake up the states waiting for a new execution mode
+        :param state_machine_id: the id of the state machine of the execution context, None for the default context
         :raises exceptions.TypeError: if the execution mode is of the wrong type
         """
         if not isinstance(execution_mode, StateMachineExecutionStatus):
             raise TypeError("status must be of type StateMachineExecutionStatus")
-        self._status.execution_mode = execution_mode
+        context = self.get_execution_context(state_machine_id)
+        if context is None:
+            return
+        status = context.status
+        status.execution_mode = execution_mode
         if notify:
-            with self._status.execution_condition_variable:
-                self._status.execution_condition_variable.notify_all()
+            with status.execution_condition_variable:
+                status.execution_condition_variable.notify_all()
+
+    def _set_execution_mode_of_context(self, context, execution_mode):
+        if context is self._default_context:
+            self.set_execution_mode(execution_mode)
+        else:
+            self.set_execution_mode(execution_mode, state_machine_id=context.state_machine_id)
 
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
@@ -545,16 +753,40 @@ class ExecutionEngine(Observable):
 
     @property
     def run_to_states(self):
-        """Property for the _run_to_states field
+        """Property for the run_to_states of the default execution context
 
         """
-        with self.execution_engine_lock:
-            return self._run_to_states
+        return self._default_context.run_to_states
 
     @run_to_states.setter
     def run_to_states(self, run_to_states):
-        if not isinstance(run_to_states, list):
-            raise TypeError("run_to_states must be of type list")
-        with self.execution_engine_lock:
-            self._run_to_states = run_to_states
+        self._default_context.run_to_states = run_to_states
 
+    @property
+    def start_state_paths(self):
+        """Property for the start_state_paths of the default execution context
+
+        """
+        return self._default_context.start_state_paths
+
+    @start_state_paths.setter
+    def start_state_paths(self, start_state_paths):
+        self._default_context.start_state_paths = start_state_paths
+
+    @property
+    def synchronization_counter(self):
+        """Property for the synchronization_counter of the default execution context
+
+        """
+        return self._default_context.synchronization_counter
+
+    @synchronization_counter.setter
+    def synchronization_counter(self, synchronization_counter):
+        self._default_context.synchronization_counter = synchronization_counter
+
+    @property
+    def state_machine_running(self):
+        """Property for the state_machine_running flag of the default execution context
+
+        """
+        return self._default_context.state_machine_running
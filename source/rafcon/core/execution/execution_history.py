@@ -23,23 +23,27 @@ from builtins import range
 from builtins import str
 import time
 import copy
-from collections import Iterable, Sized
+from collections import Iterable, Sized, deque
 import json
 from jsonconversion.decoder import JSONObjectDecoder
 from jsonconversion.encoder import JSONObjectEncoder
 
 import shelve
-from threading import Lock
+import atexit
+from threading import Lock, Thread
+from queue import Queue, Full
 from enum import Enum
 from gtkmvc3.observable import Observable
 
+from rafcon.core.data_passing import pass_values
 from rafcon.core.id_generator import history_item_id_generator
 from rafcon.utils import log
+from rafcon.utils.execution_log import BinaryExecutionLogWriter
 logger = log.get_logger(__name__)
 import os
 import subprocess
 import pickle
-from weakref import ref
+from weakref import ref, WeakSet
 
 
 class ExecutionHistoryStorage(object):
@@ -62,6 +66,9 @@ class ExecutionHistoryStorage(object):
             except Exception:
                 logger.exception('Exception:')
 
+    def store_history_item(self, history_item):
+        self.store_item(history_item.history_item_id, history_item.to_dict())
+
     def flush(self):
         with self.store_lock:
             try:
@@ -98,19 +105,220 @@ class ExecutionHistoryStorage(object):
                 logger.exception('Exception:')
 
 
+class BinaryExecutionHistoryStorage(object):
+    """Stores history items in an append-only binary execution log
+
+    In contrast to the :class:`ExecutionHistoryStorage`, writing an item only appends a record to the file and
+    flushing does not reopen the file. The log can be read with :func:`rafcon.utils.execution_log.open_execution_log`.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.store_lock = Lock()
+        self.writer = None
+        try:
+            self.writer = BinaryExecutionLogWriter(filename)
+            logger.debug('Openend log file for writing %s' % self.filename)
+        except Exception:
+            logger.exception('Exception:')
+
+    def store_item(self, key, value):
+        with self.store_lock:
+            try:
+                self.writer.write_item(native_str(key), value)
+            except Exception:
+                logger.exception('Exception:')
+
+    def store_history_item(self, history_item):
+        self.store_item(history_item.history_item_id, history_item.to_dict())
+
+    def flush(self):
+        with self.store_lock:
+            try:
+                self.writer.flush()
+            except Exception:
+                logger.exception('Exception:')
+
+    def close(self, make_read_and_writable_for_all=False):
+        with self.store_lock:
+            try:
+                if self.writer.closed:
+                    return
+                self.writer.close()
+                logger.debug('Closed log file %s' % self.filename)
+                if make_read_and_writable_for_all:
+                    os.chmod(self.filename, 0o666)
+            except Exception:
+                logger.exception('Exception:')
+
+    def __del__(self):
+        if self.writer is not None and not self.writer.closed:
+            self.close()
+
+
+BACK_PRESSURE_BLOCK = "block"
+BACK_PRESSURE_DROP = "drop"
+BACK_PRESSURE_SAMPLE = "sample"
+
+# the asynchronous storages not closed yet, whose writer threads are drained when the interpreter exits
+_open_async_storages = WeakSet()
+
+
+@atexit.register
+def _close_async_storages():
+    for async_storage in list(_open_async_storages):
+        async_storage.close()
+
+
+class AsyncExecutionHistoryStorage(object):
+    """Stores history items on a background thread
+
+    The threads executing the states only take a snapshot of the data of the history items, which refers to the current
+    data of the states (see :meth:`HistoryItem.get_state_snapshot`). The items are passed to the writer thread through a
+    bounded queue. The writer thread serializes and stores them, so that the executing threads neither pickle the data
+    nor wait for the disk. If the queue is full, the back-pressure policy decides what happens:
+
+    * "block": the executing thread waits until there is space in the queue, no item is lost
+    * "drop": the item is not logged
+    * "sample": if the queue is more than half full, only every n-th item is logged, the others are dropped
+
+    Closing the storage drains the queue before the underlying storage is closed. Storages not closed explicitly are
+    closed when the interpreter exits.
+
+    :ivar storage: the storage writing the items, e.g. an :class:`ExecutionHistoryStorage`
+    :ivar int queue_size: the maximum number of items waiting for being stored
+    :ivar str back_pressure_policy: one of "block", "drop" or "sample"
+    :ivar int sampling_interval: every how many items an item is logged if the "sample" policy is active
+    :ivar int number_of_dropped_items: the number of items, which were not logged
+    """
+
+    def __init__(self, storage, queue_size=1000, back_pressure_policy=BACK_PRESSURE_BLOCK, sampling_interval=10):
+        if back_pressure_policy not in (BACK_PRESSURE_BLOCK, BACK_PRESSURE_DROP, BACK_PRESSURE_SAMPLE):
+            raise ValueError("Invalid back-pressure policy: {0}".format(back_pressure_policy))
+        self.storage = storage
+        self.queue_size = max(int(queue_size), 1)
+        self.back_pressure_policy = back_pressure_policy
+        self.sampling_interval = max(int(sampling_interval), 1)
+        self.number_of_dropped_items = 0
+        self._number_of_sampled_items = 0
+        self._queue = Queue(maxsize=self.queue_size)
+        self._closed = False
+        self._close_lock = Lock()
+        self._counter_lock = Lock()
+        self._writer_thread = Thread(target=self._write_items, name="ExecutionHistoryWriter")
+        self._writer_thread.daemon = True
+        self._writer_thread.start()
+        _open_async_storages.add(self)
+
+    @property
+    def filename(self):
+        return self.storage.filename
+
+    def _write_items(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    break
+                history_item, state_snapshot = task
+                record = history_item.to_dict(state_snapshot)
+                self.storage.store_item(record['history_item_id'], record)
+            except Exception:
+                logger.exception('Exception:')
+            finally:
+                self._queue.task_done()
+
+    def _drop_item(self):
+        with self._counter_lock:
+            self.number_of_dropped_items += 1
+
+    def _is_sampled(self):
+        # items can be pushed by several threads of a concurrency state
+        if self.back_pressure_policy == BACK_PRESSURE_SAMPLE and self._queue.qsize() > self.queue_size // 2:
+            with self._counter_lock:
+                self._number_of_sampled_items += 1
+                sampled = self._number_of_sampled_items % self.sampling_interval == 0
+            if not sampled:
+                self._drop_item()
+                return False
+        return True
+
+    def _put(self, task):
+        if self.back_pressure_policy == BACK_PRESSURE_BLOCK:
+            self._queue.put(task)
+            return
+        try:
+            self._queue.put_nowait(task)
+        except Full:
+            self._drop_item()
+
+    def store_history_item(self, history_item):
+        """Takes a snapshot of a history item and hands it over to the writer thread
+
+        The snapshot is taken right away, as the item refers to data of the state, which may change during the further
+        execution, and as the link to the previous item is cut, if the item is removed from a bounded execution
+        history.
+
+        :param HistoryItem history_item: the item to be stored
+        """
+        if self._closed or not self._is_sampled():
+            return
+        try:
+            state_snapshot = history_item.get_state_snapshot()
+        except Exception:
+            logger.exception('Exception:')
+            return
+        self._put((history_item, state_snapshot))
+
+    def store_item(self, key, value):
+        self.storage.store_item(key, value)
+
+    def flush(self):
+        """Waits until all items handed over so far are stored and flushes the underlying storage"""
+        self._queue.join()
+        self.storage.flush()
+
+    def close(self, make_read_and_writable_for_all=False):
+        """Stores all remaining items and closes the underlying storage
+
+        :param bool make_read_and_writable_for_all: passed to the underlying storage
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        _open_async_storages.discard(self)
+        self._queue.put(None)
+        self._writer_thread.join()
+        if self.number_of_dropped_items:
+            logger.warning("{0} history items were not logged to {1} due to back-pressure".format(
+                self.number_of_dropped_items, self.filename))
+        self.storage.close(make_read_and_writable_for_all)
+
+
 class ExecutionHistory(Observable, Iterable, Sized):
     """A class for the history of a state machine execution
 
         It stores all history elements in a stack wise fashion.
 
+        The history can be bounded by a maximum number of items and/or a maximum age of the items. In this case, it
+        works as a ring buffer: the oldest items are removed from memory, when new items are pushed. If an execution
+        history storage is set, all items are also stored on disk, independent of the bounds. Backward stepping is
+        only possible within the retained items.
+
         :ivar initial_prev: optional link to a previous element for the first element pushed into this history of
                             type :class:`rafcon.core.execution.execution_history.HistoryItem`
+        :ivar int max_length: the maximum number of items kept in memory, None or 0 for no limit
+        :ivar float max_age: the maximum age in seconds of the items kept in memory, None or 0 for no limit
     """
 
-    def __init__(self, initial_prev=None):
+    def __init__(self, initial_prev=None, max_length=None, max_age=None):
         super(ExecutionHistory, self).__init__()
-        self._history_items = []            
+        self._history_items = deque()
         self.initial_prev = initial_prev
+        self.max_length = max_length
+        self.max_age = max_age
+        self.number_of_removed_items = 0
         self.execution_history_storage = None
         self.new_execution_command_handled = True
 
@@ -138,8 +346,55 @@ class ExecutionHistory(Observable, Iterable, Sized):
         return len(self._history_items)
 
     def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._history_items)[index]
         return self._history_items[index]
 
+    @property
+    def bounded(self):
+        """Whether the oldest history items are removed from memory"""
+        return bool(self.max_length) or bool(self.max_age)
+
+    def _remove_old_items(self):
+        """Removes the items exceeding the maximum length or age of the history from memory
+
+        The links to removed items are cut, so that they can be garbage collected.
+        """
+        history_items = self._history_items
+        min_timestamp = time.time() - self.max_age if self.max_age else None
+        # the last item is always kept
+        while len(history_items) > 1 and \
+                ((self.max_length and len(history_items) > self.max_length) or
+                 (min_timestamp is not None and history_items[0].timestamp < min_timestamp)):
+            removed_item = history_items.popleft()
+            removed_item.next = None
+            history_items[0].prev = None
+            self.number_of_removed_items += 1
+
+    def backward_step_possible(self, container_state):
+        """Checks whether the items needed to step back within a container state are still in the history
+
+        This is always the case for unbounded histories. For bounded histories, all items of the last execution of the
+        last child of the container state must still be in memory. If the oldest retained item belongs to this
+        execution and items were already removed, the first items of the execution might be missing.
+
+        :param container_state: the container state that is executed backwards
+        :return: True if a backward step is possible, False else
+        :rtype: bool
+        """
+        if not self.bounded or not self.number_of_removed_items:
+            return True
+        last_history_item = self.get_last_history_item()
+        if last_history_item is None:
+            return False
+        if last_history_item.state_reference is container_state:  # leaves the container state
+            return True
+        for index, history_item in enumerate(self._history_items):
+            if history_item.run_id == last_history_item.run_id and \
+                    history_item.state_reference is last_history_item.state_reference:
+                return index > 0
+        return False
+
     def get_last_history_item(self):
         """Returns the history item that was added last
 
@@ -157,7 +412,7 @@ class ExecutionHistory(Observable, Iterable, Sized):
         if last_history_item is not None:
             last_history_item.next = current_item
         if self.execution_history_storage is not None:
-            self.execution_history_storage.store_item(current_item.history_item_id, current_item.to_dict())
+            self.execution_history_storage.store_history_item(current_item)
         try:
             self._history_items.append(current_item)
         except AttributeError:
@@ -165,6 +420,8 @@ class ExecutionHistory(Observable, Iterable, Sized):
                 pass # this is fine
             else:
                 raise
+        if self.bounded:
+            self._remove_old_items()
         return current_item
 
     @Observable.observed
@@ -223,14 +480,14 @@ class ExecutionHistory(Observable, Iterable, Sized):
         last_history_item = self.get_last_history_item()
         return_item = ConcurrencyItem(state, self.get_last_history_item(),
                                       number_concurrent_threads, state.run_id,
-                                      self.execution_history_storage)
+                                      self.execution_history_storage, self.max_length, self.max_age)
         return self._push_item(last_history_item, return_item)
 
     @Observable.observed
     def push_state_machine_start_history_item(self, state_machine, run_id):
         return_item = StateMachineStartItem(state_machine, run_id)
         if self.execution_history_storage is not None:
-            self.execution_history_storage.store_item(return_item.history_item_id, return_item.to_dict())
+            self.execution_history_storage.store_history_item(return_item)
         self._history_items.append(return_item)
         return return_item
 
@@ -263,7 +520,7 @@ class HistoryItem(object):
 
     def __init__(self, state, prev, run_id):
         self._state_reference = state
-        self.path = copy.deepcopy(state.get_path())
+        self.path = state.get_path()
         self.timestamp = time.time()
         self.run_id = run_id
         self.prev = prev
@@ -290,7 +547,16 @@ class HistoryItem(object):
     def __str__(self):
         return "HistoryItem with reference state name %s (time: %s)" % (self.state_reference.name, self.timestamp)
 
-    def to_dict(self):
+    def get_state_snapshot(self):
+        """Returns the data of the item, which refers to the current state of the execution
+
+        This covers the data of the referenced state and the link to the previous item, which may change after the item
+        was created. The data is not serialized, the semantic data is copied shallowly. Passed to :meth:`to_dict`, the
+        snapshot allows to create the record of the item later, e.g. by another thread.
+
+        :return: the snapshot of the data
+        :rtype: dict
+        """
         record = dict()
 
         # here always the correct path is desired
@@ -319,25 +585,37 @@ class HistoryItem(object):
         # self.state_reference.name (<- name of the user when using a library and changing the name)
         # self.state_reference.state_copy.name (<- the name of the library root state)
         record['state_name'] = self.state_reference.name
+        record['semantic_data'] = dict(target_state.semantic_data)
+        record['description'] = target_state.description
+
+        if self.prev is not None:
+            record['prev_history_item_id'] = self.prev.history_item_id
+        else:
+            record['prev_history_item_id'] = None
+        return record
+
+    def to_dict(self, state_snapshot=None):
+        """Returns the record of the item, in which all data values are pickled
+
+        :param dict state_snapshot: the result of :meth:`get_state_snapshot` taken before, if None, the current data of
+            the state is used
+        :return: the record of the item
+        :rtype: dict
+        """
+        record = dict(state_snapshot if state_snapshot is not None else self.get_state_snapshot())
         record['timestamp'] = self.timestamp
         record['run_id'] = self.run_id  # library state and state copy have the same run_id
         record['history_item_id'] = self.history_item_id
 
         # semantic data
         semantic_data_dict = {}
-        for k, v in target_state.semantic_data.items():
+        for k, v in record['semantic_data'].items():
             try:
                 semantic_data_dict[k] = pickle.dumps(v)
             except Exception as e:
                 semantic_data_dict['!' + k] = (str(e), str(v))
         record['semantic_data'] = semantic_data_dict
 
-        record['description'] = target_state.description
-
-        if self.prev is not None:
-            record['prev_history_item_id'] = self.prev.history_item_id
-        else:
-            record['prev_history_item_id'] = None
         # store the specialized class name as item_type,
         # e.g. CallItem, ReturnItem, StatemachineStartItem when saved
         record['item_type'] = self.__class__.__name__
@@ -355,8 +633,8 @@ class StateMachineStartItem(HistoryItem):
     def __str__(self):
         return "StateMachineStartItem with name %s (time: %s)" % (self.sm_dict['root_state_storage_id'], self.timestamp)
 
-    def to_dict(self):
-        record = HistoryItem.to_dict(self)
+    def to_dict(self, state_snapshot=None):
+        record = HistoryItem.to_dict(self, state_snapshot)
         record.update(self.sm_dict)
         record['call_type'] = 'EXECUTE'
         record['state_name'] = 'StateMachineStartItem'
@@ -364,10 +642,6 @@ class StateMachineStartItem(HistoryItem):
         record['path'] = ''
         record['path_by_name'] = ''
         record['os_environment'] = self.os_environment
-        if self.prev is not None:
-            record['prev_history_item_id'] = self.prev.history_item_id
-        else:
-            record['prev_history_item_id'] = None
         return record
 
 
@@ -387,10 +661,10 @@ class ScopedDataItem(HistoryItem):
             raise Exception('unkown calltype, neither CONTAINER nor EXECUTE')
         self.call_type = call_type
         self.scoped_data = {} if state_for_scoped_data is None else copy.deepcopy(state_for_scoped_data._scoped_data)
-        self.child_state_input_output_data = copy.deepcopy(child_state_input_output_data)
+        self.child_state_input_output_data = pass_values(child_state_input_output_data)
 
-    def to_dict(self):
-        record = HistoryItem.to_dict(self)
+    def to_dict(self, state_snapshot=None):
+        record = HistoryItem.to_dict(self, state_snapshot)
         scoped_data_dict = {}
         for k, v in self.scoped_data.items():
             try:
@@ -442,8 +716,8 @@ class CallItem(ScopedDataItem):
     def __str__(self):
         return "CallItem %s" % (ScopedDataItem.__str__(self))
 
-    def to_dict(self):
-        record = ScopedDataItem.to_dict(self)
+    def to_dict(self, state_snapshot=None):
+        record = ScopedDataItem.to_dict(self, state_snapshot)
         return record
 
 
@@ -457,8 +731,8 @@ class ReturnItem(ScopedDataItem):
     def __str__(self):
         return "ReturnItem %s" % (ScopedDataItem.__str__(self))
 
-    def to_dict(self):
-        record = ScopedDataItem.to_dict(self)
+    def to_dict(self, state_snapshot=None):
+        record = ScopedDataItem.to_dict(self, state_snapshot)
         if self.outcome is not None:
             record['outcome_name'] = self.outcome.to_dict()['name']
             record['outcome_id'] = self.outcome.to_dict()['outcome_id']
@@ -471,20 +745,21 @@ class ReturnItem(ScopedDataItem):
 class ConcurrencyItem(HistoryItem):
     """A class to hold all the data for an invocation of several concurrent threads.
     """
-    def __init__(self, container_state, prev, number_concurrent_threads, run_id, execution_history_storage):
+    def __init__(self, container_state, prev, number_concurrent_threads, run_id, execution_history_storage,
+                 max_length=None, max_age=None):
         HistoryItem.__init__(self, container_state, prev, run_id)
         self.execution_histories = []
 
         for i in range(number_concurrent_threads):
-            execution_history = ExecutionHistory(initial_prev=self)
+            execution_history = ExecutionHistory(initial_prev=self, max_length=max_length, max_age=max_age)
             execution_history.set_execution_history_storage(execution_history_storage)
             self.execution_histories.append(execution_history)
 
     def __str__(self):
         return "ConcurrencyItem %s" % (HistoryItem.__str__(self))
 
-    def to_dict(self):
-        record = HistoryItem.to_dict(self)
+    def to_dict(self, state_snapshot=None):
+        record = HistoryItem.to_dict(self, state_snapshot)
         record['call_type'] = 'CONTAINER'
         return record
 
@@ -0,0 +1,187 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: execution_pool
+   :synopsis: A module holding a pool of reusable worker threads for the execution of states
+
+"""
+from builtins import object
+import threading
+
+from rafcon.core.config import global_config
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+EXECUTION_MODE_THREADS = "threads"
+EXECUTION_MODE_POOLED = "pooled"
+
+
+class ExecutionTask(object):
+    """A handle for a function that is executed by the :class:`ExecutionPool`
+
+    The handle offers the `join` interface of a `threading.Thread`, so that states can treat it like their thread.
+
+    :ivar target: the function to be executed
+    """
+
+    def __init__(self, target):
+        self.target = target
+        self._finished = threading.Event()
+
+    def run(self):
+        try:
+            self.target()
+        except Exception:
+            logger.exception("Unhandled exception during the execution of {0}".format(self.target))
+        finally:
+            self.target = None
+            self._finished.set()
+
+    def join(self, timeout=None):
+        """Waits until the task was executed
+
+        :param float timeout: the maximum time in seconds to wait
+        """
+        self._finished.wait(timeout)
+
+    def is_alive(self):
+        return not self._finished.is_set()
+
+
+class _PoolWorker(threading.Thread):
+    """A daemon thread that executes the tasks assigned to it until its pool is shut down"""
+
+    def __init__(self, pool, index):
+        super(_PoolWorker, self).__init__(name="ExecutionPoolWorker-{0}".format(index))
+        self.daemon = True
+        self._pool = pool
+        self._task = None
+        self._task_assigned = threading.Event()
+
+    def assign(self, task):
+        self._task = task
+        self._task_assigned.set()
+
+    def run(self):
+        while True:
+            self._task_assigned.wait()
+            self._task_assigned.clear()
+            task, self._task = self._task, None
+            if task is None:  # the pool is shut down
+                return
+            task.run()
+            if not self._pool._worker_idle(self):
+                return
+
+
+class ExecutionPool(object):
+    """A pool of reusable worker threads for the execution of states
+
+    Creating a new thread for every state execution is costly for state machines consisting of many small states. The
+    pool keeps at most `max_workers` finished worker threads alive and hands them the next state to be executed. Tasks
+    never wait for a free worker and are never executed in the submitting thread: the branches of a concurrency state
+    have to run at the same time, as they may wait for each other or for their preemption. Thus, if all workers are
+    busy, the task is executed in a dedicated thread, which terminates afterwards.
+
+    :ivar int max_workers: the maximum number of worker threads kept by the pool
+    """
+
+    def __init__(self, max_workers):
+        if max_workers < 1:
+            raise ValueError("The execution pool requires at least one worker")
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._idle_workers = []
+        self._number_of_workers = 0
+        self._shut_down = False
+
+    def submit(self, target):
+        """Executes the target function in a worker thread
+
+        If all workers are busy, the function is executed in a dedicated thread, which is not reused afterwards.
+
+        :param target: the function to be executed
+        :return: a handle to wait for the execution of the function
+        :rtype: ExecutionTask
+        """
+        task = ExecutionTask(target)
+        worker = None
+        with self._lock:
+            if self._idle_workers:
+                worker = self._idle_workers.pop()
+            elif self._number_of_workers < self.max_workers and not self._shut_down:
+                self._number_of_workers += 1
+                worker = _PoolWorker(self, self._number_of_workers)
+                worker.start()
+        if worker:
+            worker.assign(task)
+        else:
+            threading.Thread(target=task.run).start()
+        return task
+
+    def _worker_idle(self, worker):
+        """Puts a worker back into the pool after it finished its task
+
+        :return: False if the worker has to terminate as the pool was shut down, True else
+        """
+        with self._lock:
+            if self._shut_down:
+                self._number_of_workers -= 1
+                return False
+            self._idle_workers.append(worker)
+            return True
+
+    @property
+    def number_of_workers(self):
+        with self._lock:
+            return self._number_of_workers
+
+    def shutdown(self):
+        """Terminates all idle workers; busy workers terminate after finishing their current task"""
+        with self._lock:
+            self._shut_down = True
+            idle_workers = self._idle_workers
+            self._idle_workers = []
+            self._number_of_workers -= len(idle_workers)
+        for worker in idle_workers:
+            worker.assign(None)
+
+
+_execution_pool = None
+_execution_pool_lock = threading.Lock()
+
+
+def pooled_execution_enabled():
+    """Checks whether states are to be executed in the pooled execution mode
+
+    :return: True if EXECUTION_MODE is set to "pooled" in the config, False else
+    :rtype: bool
+    """
+    return global_config.get_config_value("EXECUTION_MODE", EXECUTION_MODE_THREADS) == EXECUTION_MODE_POOLED
+
+
+def get_execution_pool():
+    """Returns the execution pool shared by all states, which is created on first use
+
+    :rtype: ExecutionPool
+    """
+    global _execution_pool
+    with _execution_pool_lock:
+        if _execution_pool is None:
+            _execution_pool = ExecutionPool(global_config.get_config_value("EXECUTION_POOL_MAX_WORKERS", 16))
+        return _execution_pool
+
+
+def shutdown_execution_pool():
+    """Shuts down the shared execution pool, a new one is created on the next use"""
+    global _execution_pool
+    with _execution_pool_lock:
+        if _execution_pool is not None:
+            _execution_pool.shutdown()
+            _execution_pool = None
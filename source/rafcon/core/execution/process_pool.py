@@ -0,0 +1,349 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: process_pool
+   :synopsis: A module holding a pool of worker processes for the execution of the scripts of execution states
+
+"""
+from builtins import object
+import os
+import imp
+import signal
+import pickle
+import threading
+import traceback
+import multiprocessing
+
+from rafcon.core.config import global_config
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+EXECUTION_BACKEND_THREAD = "thread"
+EXECUTION_BACKEND_PROCESS = "process"
+EXECUTION_BACKENDS = (EXECUTION_BACKEND_THREAD, EXECUTION_BACKEND_PROCESS)
+
+# the interval in seconds in which a state waiting for its worker process checks for its preemption
+PREEMPTION_CHECK_INTERVAL = 0.05
+
+
+def _get_multiprocessing_context():
+    """Returns the multiprocessing context used to create worker processes
+
+    The workers are created lazily from the running, multi-threaded RAFCON process. Forking it could copy locks held
+    by other threads, e.g. of the logging module, into the worker. Thus, the workers are started by a fork server or
+    are spawned. Python 2 only supports forking.
+    """
+    if not hasattr(multiprocessing, "get_context"):
+        return multiprocessing
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(start_method)
+
+
+class WorkerState(object):
+    """Represents the executed state within the worker process
+
+    The object is passed as `self` to the `execute` function of the script. It offers the members of a state that
+    scripts usually use. `preemptive_wait` and `wait_for_interruption` return as soon as the state is preempted in
+    the RAFCON process.
+
+    :ivar name: the name of the state
+    :ivar state_id: the id of the state
+    :ivar persistent_variables: the persistent variables of the state, which are transferred back after the execution
+    :ivar logger: the logger of the state
+    """
+
+    def __init__(self, name, state_id, path, persistent_variables, preempted_event):
+        self.name = name
+        self.state_id = state_id
+        self.persistent_variables = persistent_variables
+        self.logger = log.get_logger(name)
+        self._path = path
+        self._preempted = preempted_event
+
+    def get_path(self):
+        return self._path
+
+    @property
+    def preempted(self):
+        return self._preempted.is_set()
+
+    def preemptive_wait(self, time=None):
+        """Waits for the given time or until the state is preempted, see
+        :meth:`rafcon.core.states.state.State.preemptive_wait`
+
+        :return: True, if the wait was preempted, False else
+        """
+        return self._preempted.wait(time)
+
+    def wait_for_interruption(self, timeout=None):
+        return self._preempted.wait(timeout)
+
+
+class GlobalVariableManagerProxy(object):
+    """Forwards the calls of the global variable manager from the worker process to the RAFCON process
+
+    The values are transferred as copies, thus variables cannot be accessed per reference.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __getattr__(self, method_name):
+        if method_name.startswith('_'):
+            raise AttributeError(method_name)
+
+        def call(*args, **kwargs):
+            self._connection.send(("gvm", method_name, args, kwargs))
+            succeeded, value = self._connection.recv()
+            if not succeeded:
+                raise value
+            return value
+        return call
+
+
+def _get_picklable_exception(exception):
+    try:
+        pickle.loads(pickle.dumps(exception))
+        return exception
+    except Exception:
+        return RuntimeError("{0}: {1}".format(type(exception).__name__, exception))
+
+
+def _run_worker(connection, preempted_event):
+    """The main loop of a worker process, executing the scripts sent through the connection"""
+    from rafcon.core.script import get_compiled_code
+    # interrupts are handled by the RAFCON process, which stops the execution
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    global_variable_manager = GlobalVariableManagerProxy(connection)
+    while True:
+        try:
+            task = connection.recv()
+        except (EOFError, IOError):
+            return
+        if task is None:
+            return
+        script_text, filename, state_data, inputs, outputs, backward_execution = task
+        state = WorkerState(preempted_event=preempted_event, **state_data)
+        try:
+            module = imp.new_module(os.path.splitext(os.path.basename(filename))[0] + state.state_id)
+            exec(get_compiled_code(script_text, filename), module.__dict__)
+            if backward_execution:
+                if hasattr(module, "backward_execute"):
+                    result = module.backward_execute(state, inputs, outputs, global_variable_manager)
+                else:
+                    result = None
+            else:
+                result = module.execute(state, inputs, outputs, global_variable_manager)
+            connection.send(("result", result, outputs, state.persistent_variables))
+        except Exception as e:
+            connection.send(("error", _get_picklable_exception(e), traceback.format_exc()))
+
+
+class WorkerProcess(object):
+    """A process executing the scripts of execution states, controlled via a pipe
+
+    :ivar process: the worker process
+    """
+
+    def __init__(self, index):
+        context = _get_multiprocessing_context()
+        self._connection, child_connection = context.Pipe()
+        self._preempted = context.Event()
+        self.process = context.Process(target=_run_worker, args=(child_connection, self._preempted),
+                                       name="ScriptProcessPoolWorker-{0}".format(index))
+        self.process.daemon = True
+        self.process.start()
+        child_connection.close()
+
+    def execute(self, state, script_text, filename, inputs, outputs, backward_execution=False):
+        """Executes the script in the worker process
+
+        The call blocks until the script returned. Calls to the global variable manager are served meanwhile and the
+        preemption of the state is forwarded to the worker process.
+
+        :param rafcon.core.states.execution_state.ExecutionState state: the executed state
+        :param str script_text: the source code of the script
+        :param str filename: the filename of the script, used for tracebacks
+        :param dict inputs: the input data of the script
+        :param dict outputs: the output data of the script, which is updated with the outputs of the worker process
+        :param bool backward_execution: Flag whether to run the script in backwards mode
+        :return: the return value of the execute function
+        :raises exceptions.RuntimeError: if the worker process terminated unexpectedly
+        """
+        import rafcon.core.singleton
+        self._preempted.clear()
+        state_data = {
+            'name': state.name,
+            'state_id': state.state_id,
+            'path': state.get_path(),
+            'persistent_variables': state.persistent_variables
+        }
+        self._connection.send((script_text, filename, state_data, inputs, outputs, backward_execution))
+        while True:
+            while not self._connection.poll(PREEMPTION_CHECK_INTERVAL):
+                if state.preempted and not self._preempted.is_set():
+                    self._preempted.set()
+                if not self.process.is_alive():
+                    raise RuntimeError("The worker process executing {0} terminated unexpectedly".format(state))
+            try:
+                message = self._connection.recv()
+            except EOFError:
+                raise RuntimeError("The worker process executing {0} terminated unexpectedly".format(state))
+            if message[0] == "gvm":
+                _, method_name, args, kwargs = message
+                try:
+                    value = getattr(rafcon.core.singleton.global_variable_manager, method_name)(*args, **kwargs)
+                    self._connection.send((True, value))
+                except Exception as e:
+                    self._connection.send((False, _get_picklable_exception(e)))
+            elif message[0] == "result":
+                _, result, worker_outputs, persistent_variables = message
+                outputs.update(worker_outputs)
+                state.persistent_variables = persistent_variables
+                return result
+            else:
+                _, exception, formatted_traceback = message
+                logger.debug("Traceback of the worker process executing {0}:\n{1}".format(state, formatted_traceback))
+                raise exception
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def terminate(self):
+        try:
+            self._connection.send(None)
+        except (IOError, OSError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self._connection.close()
+
+
+class ScriptProcessPool(object):
+    """A pool of worker processes executing the scripts of execution states
+
+    Execution states using the process execution backend run their scripts in one of the worker processes, so that
+    CPU-bound scripts of concurrently executed states are not serialized by the global interpreter lock. The scripts
+    cannot start further states, thus a state waits for a free worker, if all `number_of_processes` processes are
+    busy. The inputs, outputs and persistent variables of the state as well as the values of global variables are
+    transferred as copies and thus have to be picklable.
+
+    :ivar int number_of_processes: the maximum number of worker processes
+    """
+
+    def __init__(self, number_of_processes):
+        if number_of_processes < 1:
+            raise ValueError("The script process pool requires at least one process")
+        self.number_of_processes = number_of_processes
+        self._condition = threading.Condition()
+        self._idle_workers = []
+        self._number_of_workers = 0
+        self._shut_down = False
+
+    def execute(self, state, script_text, filename, inputs, outputs, backward_execution=False):
+        """Executes a script in a worker process of the pool
+
+        See :meth:`WorkerProcess.execute`. If the state is preempted while waiting for a free worker, the script is
+        not executed and None is returned.
+        """
+        worker = self._acquire_worker(state)
+        if worker is None:
+            return None
+        try:
+            result = worker.execute(state, script_text, filename, inputs, outputs, backward_execution)
+        except RuntimeError:
+            if not worker.is_alive():
+                self._discard_worker(worker)
+                worker = None
+            raise
+        finally:
+            if worker is not None:
+                self._release_worker(worker)
+        return result
+
+    def _acquire_worker(self, state):
+        with self._condition:
+            while True:
+                if self._idle_workers:
+                    return self._idle_workers.pop()
+                if self._number_of_workers < self.number_of_processes:
+                    self._number_of_workers += 1
+                    index = self._number_of_workers
+                    break
+                if state.preempted:
+                    return None
+                self._condition.wait(PREEMPTION_CHECK_INTERVAL)
+        try:
+            return WorkerProcess(index)
+        except Exception:
+            with self._condition:
+                self._number_of_workers -= 1
+                self._condition.notify()
+            raise
+
+    def _release_worker(self, worker):
+        with self._condition:
+            if not self._shut_down:
+                self._idle_workers.append(worker)
+                self._condition.notify()
+                return
+            self._number_of_workers -= 1
+        worker.terminate()
+
+    def _discard_worker(self, worker):
+        with self._condition:
+            self._number_of_workers -= 1
+            self._condition.notify()
+        worker.terminate()
+
+    @property
+    def number_of_workers(self):
+        with self._condition:
+            return self._number_of_workers
+
+    def shutdown(self):
+        """Terminates all idle workers; busy workers terminate after finishing their current script"""
+        with self._condition:
+            self._shut_down = True
+            idle_workers = self._idle_workers
+            self._idle_workers = []
+            self._number_of_workers -= len(idle_workers)
+        for worker in idle_workers:
+            worker.terminate()
+
+
+_script_process_pool = None
+_script_process_pool_lock = threading.Lock()
+
+
+def get_script_process_pool():
+    """Returns the script process pool shared by all states, which is created on first use
+
+    The number of processes is set by SCRIPT_PROCESS_POOL_SIZE, with 0 referring to the number of CPUs.
+
+    :rtype: ScriptProcessPool
+    """
+    global _script_process_pool
+    with _script_process_pool_lock:
+        if _script_process_pool is None:
+            number_of_processes = global_config.get_config_value("SCRIPT_PROCESS_POOL_SIZE", 0)
+            if not number_of_processes:
+                number_of_processes = multiprocessing.cpu_count()
+            _script_process_pool = ScriptProcessPool(number_of_processes)
+        return _script_process_pool
+
+
+def shutdown_script_process_pool():
+    """Shuts down the shared script process pool, a new one is created on the next use"""
+    global _script_process_pool
+    with _script_process_pool_lock:
+        if _script_process_pool is not None:
+            _script_process_pool.shutdown()
+            _script_process_pool = None
@@ -21,10 +21,13 @@
 """
 
 from builtins import str
+from builtins import object
 import time
 import copy
+from collections import deque
 from gtkmvc3.observable import Observable
-from threading import Lock, currentThread, RLock
+from threading import Lock, Condition, currentThread, RLock
+from rafcon.core.data_passing import pass_value
 from rafcon.core.id_generator import *
 
 from rafcon.utils.type_helpers import type_inherits_of_type
@@ -33,11 +36,113 @@ from rafcon.utils import type_helpers
 logger = log.get_logger(__name__)
 
 
+class VariableLock(object):
+    """A lock of a global variable, which is granted to the waiting threads in the order of their requests
+
+    In addition, the lock collects statistics about its contention.
+
+    :ivar holder: the thread currently holding the lock
+    :ivar int acquisitions: the number of successful acquisitions
+    :ivar int contentions: the number of lock requests that had to wait for the lock
+    :ivar int timeouts: the number of acquisitions that were given up because of a timeout
+    :ivar float total_wait_time: the summed up time threads waited for the lock in seconds
+    :ivar float max_wait_time: the longest time a thread waited for the lock in seconds
+    """
+
+    def __init__(self):
+        self._condition = Condition(Lock())
+        self._locked = False
+        self._waiters = deque()
+        self.holder = None
+        self.acquisitions = 0
+        self.contentions = 0
+        self.timeouts = 0
+        self.total_wait_time = 0.
+        self.max_wait_time = 0.
+
+    def acquire(self, blocking=True, timeout=None):
+        """Acquires the lock
+
+        :param bool blocking: whether to wait for the lock, if it is held by another thread
+        :param float timeout: the maximum time in seconds to wait for the lock, None to wait without limit
+        :return: True if the lock was acquired, False else
+        """
+        with self._condition:
+            if not self._locked and not self._waiters:
+                self._take()
+                return True
+            if not blocking:
+                return False
+            waiter = object()
+            self._waiters.append(waiter)
+            start_time = time.time()
+            try:
+                while self._locked or self._waiters[0] is not waiter:
+                    if timeout is None:
+                        self._condition.wait()
+                    else:
+                        remaining_time = start_time + timeout - time.time()
+                        if remaining_time <= 0:
+                            self.timeouts += 1
+                            return False
+                        self._condition.wait(remaining_time)
+                self._take()
+                return True
+            finally:
+                self._waiters.remove(waiter)
+                wait_time = time.time() - start_time
+                self.contentions += 1
+                self.total_wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+                # the next waiter might be able to take the lock now
+                self._condition.notify_all()
+
+    def _take(self):
+        self._locked = True
+        self.holder = currentThread()
+        self.acquisitions += 1
+
+    def release(self):
+        """Releases the lock
+
+        The lock may be released by any thread, not only by the one holding it.
+
+        :raises exceptions.RuntimeError: if the lock is not locked
+        """
+        with self._condition:
+            if not self._locked:
+                raise RuntimeError("Cannot release an unlocked lock")
+            self._locked = False
+            self.holder = None
+            self._condition.notify_all()
+
+    def locked(self):
+        return self._locked
+
+    def get_statistics(self):
+        """Returns the contention statistics of the lock
+
+        :return: a dictionary with the name of the holding thread, the number of waiting threads, the number of
+            acquisitions, contentions and timeouts as well as the total and maximum waiting time in seconds
+        :rtype: dict
+        """
+        with self._condition:
+            return {
+                'holder': self.holder.name if self.holder is not None else None,
+                'waiting_threads': len(self._waiters),
+                'acquisitions': self.acquisitions,
+                'contentions': self.contentions,
+                'timeouts': self.timeouts,
+                'total_wait_time': self.total_wait_time,
+                'max_wait_time': self.max_wait_time
+            }
+
+
 class GlobalVariableManager(Observable):
     """A class for organizing all global variables of the state machine
 
     :ivar __global_variable_dictionary: the dictionary, where all global variables are stored
-    :ivar __variable_locks: a dictionary that holds one mutex for each global variable
+    :ivar __variable_locks: a dictionary that holds one :class:`VariableLock` for each global variable
     :ivar __global_lock: a mutex to prevent that the dictionary is written by two threads simultaneously
     :ivar __access_keys: a dictionary that holds an access key to each locked global variable
     :ivar __variable_references: a dictionary that stores whether a variable can be returned by reference or not
@@ -84,7 +189,7 @@ class GlobalVariableManager(Observable):
                 else:  # case not locked
                     access_key = self.lock_variable(key, block=True)
             else:
-                self.__variable_locks[key] = Lock()
+                self.__variable_locks[key] = VariableLock()
                 access_key = self.lock_variable(key, block=True)
 
             # --- variable locked
@@ -132,13 +237,13 @@ class GlobalVariableManager(Observable):
                 if per_reference or per_reference is None:
                     return_value = self.__global_variable_dictionary[key]
                 else:
-                    return_value = copy.deepcopy(self.__global_variable_dictionary[key])
+                    return_value = pass_value(self.__global_variable_dictionary[key])
             else:
                 if per_reference:
                     self.unlock_variable(key, access_key)
                     raise RuntimeError("Variable cannot be accessed by reference")
                 else:
-                    return_value = copy.deepcopy(self.__global_variable_dictionary[key])
+                    return_value = pass_value(self.__global_variable_dictionary[key])
             # --- release variable
 
             if unlock:
@@ -181,32 +286,27 @@ class GlobalVariableManager(Observable):
         logger.debug("Global variable %s was deleted!" % str(key))
 
     @Observable.observed
-    def lock_variable(self, key, block=False):
+    def lock_variable(self, key, block=False, timeout=None):
         """Locks a global variable
 
+        Threads waiting for the same variable get the lock in the order of their requests.
+
         :param key: the key of the global variable to be locked
         :param block: a flag to specify if to wait for locking the variable in blocking mode
+        :param float timeout: the maximum time in seconds to wait in blocking mode, None to wait without limit
+        :return: the access key or False, if the variable could not be locked
         """
         key = str(key)
         # watch out for releasing the __dictionary_lock properly
         try:
             if key in self.__variable_locks:
-                # acquire without arguments is blocking
-                lock_successful = self.__variable_locks[key].acquire(False)
-                if lock_successful or block:
-                    if (not lock_successful) and block:  # case: lock could not be acquired => wait for it as block=True
-                        duration = 0.
-                        loop_time = 0.1
-                        while not self.__variable_locks[key].acquire(False):
-                            time.sleep(loop_time)
-                            duration += loop_time
-                            if int(duration*10) % 20 == 0:
-                                # while loops informs the user about long locked variables
-                                logger.verbose("Variable '{2}' is locked and thread {0} waits already {1} seconds to "
-                                               "access it.".format(currentThread(), duration, key))
+                if self.__variable_locks[key].acquire(block, timeout):
                     access_key = global_variable_id_generator()
                     self.__access_keys[key] = access_key
                     return access_key
+                elif block:
+                    logger.warning("Global variable {0} could not be locked within {1} seconds".format(key, timeout))
+                    return False
                 else:
                     logger.warning("Global variable {} already locked".format(str(key)))
                     return False
@@ -288,6 +388,24 @@ class GlobalVariableManager(Observable):
             return self.__variable_locks[key].locked()
         return False
 
+    def get_lock_statistics(self, key=None):
+        """Returns the contention statistics of the lock of a global variable
+
+        The statistics help to find global variables, for which threads often have to wait.
+
+        :param key: the key of the global variable, None for the statistics of all global variables
+        :return: the statistics of the lock, see :meth:`VariableLock.get_statistics`, or a dictionary mapping the keys
+            of all global variables onto these statistics
+        :rtype: dict
+        :raises exceptions.AttributeError: if the global variable does not exist
+        """
+        if key is None:
+            return {key: lock.get_statistics() for key, lock in list(self.__variable_locks.items())}
+        key = str(key)
+        if key not in self.__variable_locks:
+            raise AttributeError("Global variable %s does not exist!" % str(key))
+        return self.__variable_locks[key].get_statistics()
+
     def get_all_keys_starting_with(self, start_key):
         """ Returns all keys, which start with a certain pattern defined in :param start_key.
 
@@ -316,7 +434,7 @@ class GlobalVariableManager(Observable):
             if key in self.__variable_references and self.__variable_references[key]:
                 dict_copy[key] = value
             else:
-                dict_copy[key] = copy.deepcopy(value)
+                dict_copy[key] = pass_value(value)
 
         return dict_copy
 
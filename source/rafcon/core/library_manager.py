@@ -30,6 +30,7 @@ from rafcon.core.custom_exceptions import LibraryNotFoundException
 import rafcon.core.config as config
 
 from rafcon.utils import log
+from rafcon.utils import filesystem_watcher
 logger = log.get_logger(__name__)
 
 
@@ -45,6 +46,9 @@ class LibraryManager(Observable):
     The library_root_path can be relative paths and could include environment variables.
     A library is pointed on by the file system path library_os_path which again partial consists of 
     library_root_path + library_path (partly) + library_name.
+    If a library watcher is configured (see LIBRARY_WATCHER in the config.yaml), the library folders are indexed and
+    watched for changes. On a refresh, only the changed folders are read again and only the changed libraries are
+    removed from the loaded libraries.
     :ivar _libraries: a dictionary to hold  all libraries
     """
 
@@ -61,13 +65,24 @@ class LibraryManager(Observable):
 
         # loaded libraries
         self._loaded_libraries = {}
+        self._library_interfaces = {}
         self._libraries_instances = {}
 
+        # index of the library folders and the watcher detecting changes of these folders and of the loaded libraries
+        self._library_folders = {}
+        self._watched_libraries = {}
+        self._library_watcher = None
+        self._library_watcher_type = None
+
     def prepare_destruction(self):
         self.clean_loaded_libraries()
+        self._close_library_watcher()
 
     def clean_loaded_libraries(self):
         self._loaded_libraries.clear()
+        self._library_interfaces.clear()
+        for lib_os_path in list(self._watched_libraries):
+            self._unwatch_library(lib_os_path)
 
     def initialize(self):
         """Initializes the library manager
@@ -78,6 +93,11 @@ class LibraryManager(Observable):
         singleton.py before the state*.pys are loaded
         """
         logger.debug("Initializing LibraryManager: Loading libraries ... ")
+        self._reset_library_index()
+        self._load_libraries()
+        logger.debug("Initialization of LibraryManager done")
+
+    def _load_libraries(self):
         self._libraries = {}
         self._library_root_paths = {}
         self._replaced_libraries = {}
@@ -119,7 +139,70 @@ class LibraryManager(Observable):
             logger.debug("Adding library '{1}' from {0}".format(library_root_path, library_root_key))
 
         self._libraries = OrderedDict(sorted(self._libraries.items()))
-        logger.debug("Initialization of LibraryManager done")
+
+    def _reset_library_index(self):
+        """Removes all folders from the library index and creates the library watcher according to the config"""
+        watcher_type = config.global_config.get_config_value("LIBRARY_WATCHER", "")
+        if watcher_type != self._library_watcher_type:
+            # changes of the loaded libraries cannot be detected any more
+            self.clean_loaded_libraries()
+            self._close_library_watcher()
+            self._library_watcher = filesystem_watcher.create_watcher(watcher_type) if watcher_type else None
+            self._library_watcher_type = watcher_type
+        elif self._library_watcher is not None:
+            for folder_path in self._library_folders:
+                self._library_watcher.unwatch(folder_path)
+        self._library_folders = {}
+
+    def _close_library_watcher(self):
+        """Closes the library watcher, which releases e.g. its inotify file descriptor"""
+        if self._library_watcher is not None:
+            self._library_watcher.close()
+        self._library_watcher = None
+        self._library_watcher_type = None
+        self._library_folders = {}
+
+    def _update_library_index(self, changed_paths):
+        """Removes the changed folders and libraries from the library index and the loaded libraries
+
+        :param changed_paths: the paths of the changed folders
+        """
+        for changed_path in changed_paths:
+            # the folders containing the changed folder have to be read again, to update their sub-trees
+            folder_path = changed_path
+            while folder_path in self._library_folders or folder_path == changed_path:
+                self._library_folders.pop(folder_path, None)
+                parent_path = os.path.dirname(folder_path)
+                if parent_path == folder_path:
+                    break
+                folder_path = parent_path
+            for lib_os_path in list(self._watched_libraries):
+                if changed_path == lib_os_path or changed_path.startswith(lib_os_path + os.sep):
+                    logger.debug("Library {0} changed and is loaded again on its next usage".format(lib_os_path))
+                    self._loaded_libraries.pop(lib_os_path, None)
+                    self._library_interfaces.pop(lib_os_path, None)
+                    self._unwatch_library(lib_os_path)
+
+    def _watch_library(self, lib_os_path, completely=True):
+        """Watches the folders and files of a library, which is going to be loaded
+
+        :param lib_os_path: the path of the library
+        :param completely: whether the library is loaded completely or only its interface (the root state) is loaded
+        """
+        if self._library_watcher is None or not os.path.isdir(lib_os_path):
+            return
+        if completely:
+            folder_paths = [folder_path for folder_path, _, _ in os.walk(lib_os_path)]
+        else:
+            folder_paths = [lib_os_path] + [os.path.join(lib_os_path, name) for name in os.listdir(lib_os_path)
+                                            if os.path.isdir(os.path.join(lib_os_path, name))]
+        for folder_path in folder_paths:
+            self._library_watcher.watch(folder_path, files=True)
+        self._watched_libraries[lib_os_path] = folder_paths
+
+    def _unwatch_library(self, lib_os_path):
+        for folder_path in self._watched_libraries.pop(lib_os_path, []):
+            self._library_watcher.unwatch(folder_path)
 
     @staticmethod
     def _clean_path(path):
@@ -165,6 +248,10 @@ class LibraryManager(Observable):
         :param library_path: the path to add all libraries from
         :param target_dict: the target dictionary to store all loaded libraries to
         """
+        if library_path in self._library_folders:
+            # the folder did not change since it was read
+            target_dict.update(self._library_folders[library_path])
+            return
         for library_name in os.listdir(library_path):
             library_folder_path, library_name = self.check_clean_path_of_library(library_path, library_name)
             full_library_path = os.path.join(library_path, library_name)
@@ -176,12 +263,28 @@ class LibraryManager(Observable):
                     target_dict[library_name] = {}
                     self._load_nested_libraries(full_library_path, target_dict[library_name])
                     target_dict[library_name] = OrderedDict(sorted(target_dict[library_name].items()))
+        if self._library_watcher is not None:
+            self._library_watcher.watch(library_path)
+            self._library_folders[library_path] = target_dict
 
     @Observable.observed
     def refresh_libraries(self):
         """Deletes all loaded libraries and reloads them from the file system
+
+        With a library watcher, only the folders that changed since the last refresh are read again. Loaded libraries
+        that changed are removed, so that they are loaded again on their next usage.
         """
-        self.initialize()
+        if self._library_watcher is None:
+            self.initialize()
+            return
+        changed_paths = self._library_watcher.get_changed_paths()
+        if changed_paths is None:
+            # changes were lost
+            self.clean_loaded_libraries()
+            self.initialize()
+            return
+        self._update_library_index(changed_paths)
+        self._load_libraries()
 
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
@@ -383,7 +486,6 @@ class LibraryManager(Observable):
         # state_machine = storage.load_state_machine_from_path(lib_os_path)
         # return state_machine.version, state_machine.root_state
 
-        # TODO observe changes on file system and update data
         if lib_os_path in self._loaded_libraries:
             # this list can also be taken to open library state machines TODO -> implement it -> because faster
             state_machine = self._loaded_libraries[lib_os_path]
@@ -392,7 +494,8 @@ class LibraryManager(Observable):
             state_copy = copy.deepcopy(state_machine.root_state)
             return state_machine.version, state_copy
         else:
-            state_machine = storage.load_state_machine_from_path(lib_os_path)
+            self._watch_library(lib_os_path)
+            state_machine = storage.load_state_machine_from_path(lib_os_path, use_library_cache=True)
             self._loaded_libraries[lib_os_path] = state_machine
             if config.global_config.get_config_value("NO_PROGRAMMATIC_CHANGE_OF_LIBRARY_STATES_PERFORMED", False):
                 return state_machine.version, state_machine.root_state
@@ -400,6 +503,42 @@ class LibraryManager(Observable):
                 state_copy = copy.deepcopy(state_machine.root_state)
                 return state_machine.version, state_copy
 
+    def get_library_template(self, lib_os_path):
+        """ A method to get the shared root state of the library specified via the lib_os_path.
+
+        The returned state is used by all LibraryStates of the library as template and must not be changed.
+
+        :param lib_os_path: the location of the library
+        :return: the version of the library and its root state
+        """
+        if lib_os_path not in self._loaded_libraries:
+            self._watch_library(lib_os_path)
+            self._loaded_libraries[lib_os_path] = storage.load_state_machine_from_path(lib_os_path,
+                                                                                       use_library_cache=True)
+        state_machine = self._loaded_libraries[lib_os_path]
+        return state_machine.version, state_machine.root_state
+
+    def get_library_interface(self, lib_os_path):
+        """ A method to get the interface of the library specified via the lib_os_path without loading the library.
+
+        Only the root state of the library is loaded, without its child states. If the library is already loaded, its
+        root state is returned. The returned state must not be changed.
+
+        :param lib_os_path: the location of the library
+        :return: the version of the library and its (not completely loaded) root state
+        """
+        if lib_os_path in self._loaded_libraries:
+            return self.get_library_template(lib_os_path)
+        if lib_os_path not in self._library_interfaces:
+            self._watch_library(lib_os_path, completely=False)
+            try:
+                self._library_interfaces[lib_os_path] = storage.load_state_machine_interface(lib_os_path,
+                                                                                             use_library_cache=True)
+            except ValueError:
+                # e.g. libraries of an old format, which are only supported when loaded completely
+                return self.get_library_template(lib_os_path)
+        return self._library_interfaces[lib_os_path]
+
     def remove_library_from_file_system(self, library_path, library_name):
         """Remove library from hard disk."""
         library_file_system_path = self.get_os_path_to_library(library_path, library_name)[0]
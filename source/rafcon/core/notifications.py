@@ -0,0 +1,54 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: notifications
+   :synopsis: A module to switch the observer notifications of the core objects to a headless mode
+
+"""
+
+from gtkmvc3.support.wrappers import ObsWrapperBase
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+_notify_method_before = ObsWrapperBase._notify_method_before
+_notify_method_after = ObsWrapperBase._notify_method_after
+
+
+def _notify_method_before_if_observed(self, instance, name, args, kwargs):
+    if self._ObsWrapperBase__models or self._ObsWrapperBase__observers:
+        _notify_method_before(self, instance, name, args, kwargs)
+
+
+def _notify_method_after_if_observed(self, instance, name, res_val, args, kwargs):
+    if self._ObsWrapperBase__models or self._ObsWrapperBase__observers:
+        _notify_method_after(self, instance, name, res_val, args, kwargs)
+
+
+def enable_headless_notifications():
+    """Only emits the notifications of observed methods, if the observable has observers
+
+    Without GUI, no models observe the core objects. In the headless mode, the notifications of all observed methods
+    called during the execution return immediately instead of searching for the observers. Observers and models
+    registered afterwards are still notified. Overrides of the notification methods, e.g. for invalidating the hashes
+    of states, are not affected.
+    """
+    ObsWrapperBase._notify_method_before = _notify_method_before_if_observed
+    ObsWrapperBase._notify_method_after = _notify_method_after_if_observed
+    logger.debug("Headless notifications enabled")
+
+
+def disable_headless_notifications():
+    """Emits the notifications of all observed methods again, see :func:`enable_headless_notifications`"""
+    ObsWrapperBase._notify_method_before = _notify_method_before
+    ObsWrapperBase._notify_method_after = _notify_method_after
+
+
+def headless_notifications_enabled():
+    return ObsWrapperBase._notify_method_after is _notify_method_after_if_observed
@@ -20,12 +20,17 @@ from future.utils import string_types
 from builtins import str
 import os
 import imp
+import marshal
+import hashlib
+import threading
+from collections import OrderedDict
 import yaml
 from gtkmvc3.observable import Observable
 
 from rafcon.core.config import global_config
 from rafcon.core.id_generator import generate_script_id
 from rafcon.core.storage.storage import SCRIPT_FILE
+from rafcon.core.execution.process_pool import EXECUTION_BACKEND_PROCESS, get_script_process_pool
 import rafcon.core.singleton
 
 from rafcon.utils import filesystem
@@ -37,6 +42,120 @@ DEFAULT_SCRIPT_FILE = "default_script.py"
 
 DEFAULT_SCRIPT = filesystem.read_file(os.path.dirname(__file__), DEFAULT_SCRIPT_FILE)
 
+# the maximum number of code objects kept in memory and stored in SCRIPT_CODE_CACHE_PATH, the least recently used
+# code objects are removed first
+CODE_CACHE_MAX_ENTRIES = 1000
+CODE_CACHE_MAX_FILES = 1000
+
+# code objects of compiled scripts in the order of their last use, see get_compiled_code
+_code_cache = OrderedDict()
+_code_cache_lock = threading.Lock()
+
+
+def _get_code_cache_key(script_text, filename):
+    code_hash = hashlib.sha256()
+    code_hash.update(filename.encode('utf-8'))
+    code_hash.update(b'\0')
+    code_hash.update(script_text.encode('utf-8'))
+    return code_hash.hexdigest()
+
+
+def _load_cached_code(cache_path, key):
+    """Reads a code object stored by :func:`_store_cached_code`
+
+    :return: the code object or None if no valid code object was stored for the key
+    """
+    cache_file = os.path.join(cache_path, key + ".code")
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, 'rb') as f:
+            magic = imp.get_magic()
+            if f.read(len(magic)) != magic:  # the code object was stored by another Python version
+                return None
+            code = marshal.load(f)
+        # the modification time marks the last use for pruning the cache
+        os.utime(cache_file, None)
+        return code
+    except Exception as e:
+        logger.debug("Could not load cached code from {0}: {1}".format(cache_file, e))
+        return None
+
+
+def _store_cached_code(cache_path, key, code):
+    """Marshals a code object into the cache directory, prefixed by the magic number of the Python version"""
+    cache_file = os.path.join(cache_path, key + ".code")
+    tmp_file = "{0}.{1}.tmp".format(cache_file, os.getpid())
+    try:
+        if not os.path.isdir(cache_path):
+            os.makedirs(cache_path)
+        with open(tmp_file, 'wb') as f:
+            f.write(imp.get_magic())
+            marshal.dump(code, f)
+        os.rename(tmp_file, cache_file)
+        _prune_cached_code(cache_path)
+    except Exception as e:
+        logger.debug("Could not store compiled code in {0}: {1}".format(cache_file, e))
+
+
+def _prune_cached_code(cache_path):
+    """Removes the least recently used code objects, if more than CODE_CACHE_MAX_FILES are stored"""
+    cache_files = [os.path.join(cache_path, name) for name in os.listdir(cache_path) if name.endswith(".code")]
+    if len(cache_files) <= CODE_CACHE_MAX_FILES:
+        return
+    modification_times = {}
+    for cache_file in cache_files:
+        try:
+            modification_times[cache_file] = os.path.getmtime(cache_file)
+        except OSError:
+            pass
+    for cache_file in sorted(modification_times, key=modification_times.get)[:-CODE_CACHE_MAX_FILES]:
+        try:
+            os.remove(cache_file)
+        except OSError:
+            pass
+
+
+def get_compiled_code(script_text, filename):
+    """Compiles a script or returns the code object of a previous compilation of the very same script
+
+    The code objects are cached per hash of the script text and filename, so that an unchanged script is not compiled
+    again, while every change of the script leads to a new compilation. If SCRIPT_CODE_CACHE_PATH is set, the code
+    objects are additionally stored in this directory, to skip the compilation after a restart. Both caches are bounded
+    and drop the least recently used code objects first.
+
+    :param str script_text: the source code of the script
+    :param str filename: the filename shown in tracebacks
+    :return: the code object of the script
+    """
+    if not global_config.get_config_value("SCRIPT_CODE_CACHE", True):
+        return compile(script_text, filename, 'exec')
+    key = _get_code_cache_key(script_text, filename)
+    with _code_cache_lock:
+        code = _code_cache.pop(key, None)
+        if code is not None:
+            _code_cache[key] = code
+    if code is None:
+        cache_path = global_config.get_config_value("SCRIPT_CODE_CACHE_PATH", "")
+        if cache_path:
+            cache_path = os.path.expanduser(cache_path)
+            code = _load_cached_code(cache_path, key)
+        if code is None:
+            code = compile(script_text, filename, 'exec')
+            if cache_path:
+                _store_cached_code(cache_path, key, code)
+        with _code_cache_lock:
+            _code_cache[key] = code
+            while len(_code_cache) > CODE_CACHE_MAX_ENTRIES:
+                _code_cache.popitem(last=False)
+    return code
+
+
+def clear_code_cache():
+    """Removes all code objects from the in-memory cache of compiled scripts"""
+    with _code_cache_lock:
+        _code_cache.clear()
+
 
 class Script(Observable, yaml.YAMLObject):
     """A class for representing the script file for all execution states in a state machine.
@@ -46,6 +165,7 @@ class Script(Observable, yaml.YAMLObject):
     :ivar path: the path where the script resides
     :ivar filename: the full name of the script file
     :ivar _compiled_module: the compiled module
+    :ivar _compile_lock: a lock serializing the compilations of this script
     :ivar _script_id: the id of the script
     :ivar check_path: a flag to indicate if the path should be checked for existence
 
@@ -61,6 +181,7 @@ class Script(Observable, yaml.YAMLObject):
         self._path = None
         self._filename = None
         self._compiled_module = None
+        self._compile_lock = threading.Lock()
         self._script_id = generate_script_id()
         self._parent = None
 
@@ -79,14 +200,25 @@ class Script(Observable, yaml.YAMLObject):
         if not isinstance(script_text, string_types):
             raise ValueError("The script text needs to be a string")
         self._script = script_text
+        self._invalidate_hash_of_parent()
 
     def set_script_without_compilation(self, script_text):
         self._script = script_text
         self._compiled_module = None
+        self._invalidate_hash_of_parent()
+
+    def _invalidate_hash_of_parent(self):
+        # the script is not a state element, thus its modifications are not observed by the state
+        parent = self.parent
+        if parent is not None:
+            parent.invalidate_hash()
 
     def execute(self, state, inputs=None, outputs=None, backward_execution=False):
         """Execute the user 'execute' function specified in the script
 
+        If the execution backend of the state is "process", the function is executed in a worker process of the
+        :class:`rafcon.core.execution.process_pool.ScriptProcessPool`.
+
         :param ExecutionState state: the state belonging to the execute function, refers to 'self'
         :param dict inputs: the input data of the script
         :param dict outputs: the output data of the script
@@ -94,12 +226,15 @@ class Script(Observable, yaml.YAMLObject):
         :return: Return value of the execute script
         :rtype: str | int
         """
-        if not self.compiled_module or global_config.get_config_value("SCRIPT_RECOMPILATION_ON_STATE_EXECUTION", True):
-            self.compile_module()
         if not outputs:
             outputs = {}
         if not inputs:
             inputs = {}
+        if getattr(state, "execution_backend", None) == EXECUTION_BACKEND_PROCESS:
+            return get_script_process_pool().execute(state, self.script, self._get_code_filename(), inputs, outputs,
+                                                     backward_execution)
+        if not self.compiled_module or global_config.get_config_value("SCRIPT_RECOMPILATION_ON_STATE_EXECUTION", True):
+            self.compile_module()
         if backward_execution:
             if hasattr(self._compiled_module, "backward_execute"):
                 return self._compiled_module.backward_execute(
@@ -127,23 +262,44 @@ class Script(Observable, yaml.YAMLObject):
     def compile_module(self):
         """Builds a temporary module from the script file
 
+        Compiling the script text is skipped, if the script was compiled before, see :func:`get_compiled_code`. The
+        module is always built freshly, so that the global variables of the script are reset.
+
+        Only the compilations of the same script are serialized. The interpreter-wide import lock is not held, so that
+        scripts of concurrently executed states (including their module-level imports) do not block each other.
+
         :raises exceptions.IOError: if the compilation of the script module failed
         """
-        try:
-            imp.acquire_lock()
-
-            code = compile(self.script, '%s (%s)' % (self.filename, self._script_id), 'exec')
-            # load module
-            module_name = os.path.splitext(self.filename)[0] + str(self._script_id)
-            tmp_module = imp.new_module(module_name)
-            exec(code, tmp_module.__dict__)
-            # return the module
-            self.compiled_module = tmp_module
-        except Exception as e:
-            self.compiled_module = None
-            raise
-        finally:
-            imp.release_lock()
+        with self._compile_lock:
+            try:
+                code = get_compiled_code(self.script, self._get_code_filename())
+                # load module
+                module_name = os.path.splitext(self.filename)[0] + str(self._script_id)
+                tmp_module = imp.new_module(module_name)
+                exec(code, tmp_module.__dict__)
+                # return the module
+                self.compiled_module = tmp_module
+            except Exception as e:
+                self.compiled_module = None
+                raise
+
+    def precompile(self):
+        """Compiles the script text into the code cache without building the module
+
+        This moves the compilation of the script to the start of the execution, see
+        :meth:`rafcon.core.execution.execution_engine.ExecutionEngine.precompile_execution_scripts_recursively`.
+
+        :raises exceptions.SyntaxError: if the script contains syntax errors
+        """
+        if global_config.get_config_value("SCRIPT_CODE_CACHE", True):
+            get_compiled_code(self.script, self._get_code_filename())
+
+    def _get_code_filename(self):
+        """Returns the filename of the compiled code, which is the full path of the script file if available"""
+        path = self._path
+        if path is None and self.parent is not None:
+            path = self.parent.file_system_path
+        return os.path.join(path, self.filename) if path else self.filename
 
     @classmethod
     def to_yaml(cls, dumper, data):
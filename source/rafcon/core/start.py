@@ -38,9 +38,11 @@ from yaml_configuration.config import config_path
 import rafcon.utils.filesystem as filesystem
 
 from rafcon.core.config import global_config
+from rafcon.core import notifications
 import rafcon.core.singleton as core_singletons
 from rafcon.core.storage import storage
 from rafcon.core.states.state import StateExecutionStatus
+from rafcon.core.execution.process_pool import shutdown_script_process_pool
 
 from rafcon.utils import plugins
 from rafcon.utils import resources
@@ -221,11 +223,18 @@ def signal_handler(signal, frame):
     logger.info("Shutting down ...")
 
     try:
-        if not state_machine_execution_engine.finished_or_stopped():
-            state_machine_execution_engine.stop()
-            state_machine_execution_engine.join(3)  # Wait max 3 sec for the execution to stop
+        running_contexts = [context for context in state_machine_execution_engine.get_execution_contexts()
+                            if not context.finished_or_stopped()]
+        for context in running_contexts:
+            state_machine_execution_engine.stop(context.state_machine_id)
+        # Wait max 3 sec for the execution of all state machines to stop
+        deadline = time.time() + 3
+        for context in running_contexts:
+            state_machine_execution_engine.join(max(deadline - time.time(), 0.01), context.state_machine_id)
     except Exception:
         logger.exception("Could not stop state machine")
+    shutdown_script_process_pool()
+    notifications.disable_headless_notifications()
 
     _user_abort = True
 
@@ -262,6 +271,10 @@ def main():
 
     setup_configuration(user_input.config_path)
 
+    # rafcon_core always runs without GUI, the config value only allows to switch off the headless notifications
+    if global_config.get_config_value("HEADLESS_NOTIFICATIONS", True):
+        notifications.enable_headless_notifications()
+
     post_setup_plugins(user_input)
 
     first_sm = None
@@ -286,6 +299,8 @@ def main():
             time.sleep(1)
 
     logger.info("State machine execution finished!")
+    shutdown_script_process_pool()
+    notifications.disable_headless_notifications()
     plugins.run_hook("post_destruction")
     logging.shutdown()
 
@@ -137,6 +137,12 @@ class DataFlow(StateElement):
             'to_key': state_element.to_key
         }
 
+    def _invalidate_data_flow_routing_of_parent(self):
+        """Informs the parent that the origin or target of the data flow changed"""
+        from rafcon.core.states.container_state import ContainerState
+        if isinstance(self.parent, ContainerState):
+            self.parent.invalidate_data_flow_routing()
+
 #########################################################################
 # Properties for all class field that must be observed by the gtkmvc3
 #########################################################################
@@ -165,6 +171,7 @@ class DataFlow(StateElement):
             self._from_state = old_from_state
             self._from_key = old_from_key
             raise ValueError("The data flow origin could not be changed: {0}".format(message))
+        self._invalidate_data_flow_routing_of_parent()
 
     @property
     def from_state(self):
@@ -180,6 +187,7 @@ class DataFlow(StateElement):
             raise ValueError("from_state must be a string")
 
         self._change_property_with_validity_check('_from_state', from_state)
+        self._invalidate_data_flow_routing_of_parent()
 
     @property
     def from_key(self):
@@ -195,6 +203,7 @@ class DataFlow(StateElement):
             raise ValueError("from_key must be of type int")
 
         self._change_property_with_validity_check('_from_key', from_key)
+        self._invalidate_data_flow_routing_of_parent()
 
     @lock_state_machine
     @Observable.observed
@@ -220,6 +229,7 @@ class DataFlow(StateElement):
             self._to_state = old_to_state
             self._to_key = old_to_key
             raise ValueError("The data flow target could not be changed: {0}".format(message))
+        self._invalidate_data_flow_routing_of_parent()
 
     @property
     def to_state(self):
@@ -235,6 +245,7 @@ class DataFlow(StateElement):
             raise ValueError("to_state must be a string")
 
         self._change_property_with_validity_check('_to_state', to_state)
+        self._invalidate_data_flow_routing_of_parent()
 
     @property
     def to_key(self):
@@ -250,6 +261,7 @@ class DataFlow(StateElement):
             raise ValueError("to_key must be of type int")
 
         self._change_property_with_validity_check('_to_key', to_key)
+        self._invalidate_data_flow_routing_of_parent()
 
     @property
     def data_flow_id(self):
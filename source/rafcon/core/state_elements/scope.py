@@ -123,6 +123,9 @@ class ScopedData(StateElement):
     _value_type = type(None)
     _value = None
     _data_port_type = None
+    # scoped data is only used during the execution and is not part of the hash of its state
+    _hash_irrelevant_methods = frozenset(['parent', 'name', 'value', 'value_type', 'from_state', 'data_port_type',
+                                          'timestamp'])
     _primary_key = None
 
     def __init__(self, name, value, value_type, from_state, data_port_type, parent=None, safe_init=True):
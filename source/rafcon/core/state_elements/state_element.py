@@ -44,6 +44,8 @@ class StateElement(Observable, YAMLObject, JSONObject, Hashable):
     :ivar rafcon.core.states.state.State StateElement.parent: Parent state of the state element
     """
     _parent = None
+    #: Names of observed methods, which do not change the hash of the state element
+    _hash_irrelevant_methods = frozenset(['parent'])
 
     yaml_tag = u'!StateElement'
 
@@ -99,6 +101,11 @@ class StateElement(Observable, YAMLObject, JSONObject, Hashable):
     def __lt__(self, other):
         return self.__cmp__(other) < 0
 
+    def _notify_method_after(self, instance, name, res_val, args, kwargs):
+        if name not in self._hash_irrelevant_methods and self.parent is not None:
+            self.parent.invalidate_hash()
+        super(StateElement, self)._notify_method_after(instance, name, res_val, args, kwargs)
+
     @property
     def parent(self):
         """Getter for the parent state of the state element
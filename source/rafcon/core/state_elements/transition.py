@@ -119,6 +119,12 @@ class Transition(StateElement):
             'to_outcome': state_element.to_outcome
         }
 
+    def _invalidate_transition_index_of_parent(self):
+        """Informs the parent that the origin of the transition changed"""
+        from rafcon.core.states.container_state import ContainerState
+        if isinstance(self.parent, ContainerState):
+            self.parent.invalidate_transition_index()
+
 #########################################################################
 # Properties for all class field that must be observed by the gtkmvc3
 #########################################################################
@@ -148,6 +154,7 @@ class Transition(StateElement):
             self._from_state = old_from_state
             self._from_outcome = old_from_outcome
             raise ValueError("The transition origin could not be changed: {0}".format(message))
+        self._invalidate_transition_index_of_parent()
 
     @lock_state_machine
     @Observable.observed
@@ -191,6 +198,7 @@ class Transition(StateElement):
             raise ValueError("from_state must be a string")
 
         self._change_property_with_validity_check('_from_state', from_state)
+        self._invalidate_transition_index_of_parent()
 
     @property
     def from_outcome(self):
@@ -207,6 +215,7 @@ class Transition(StateElement):
             raise ValueError("from_outcome must be of type int")
 
         self._change_property_with_validity_check('_from_outcome', from_outcome)
+        self._invalidate_transition_index_of_parent()
 
     @property
     def to_state(self):
@@ -33,7 +33,8 @@ from gtkmvc3.observable import Observable
 from jsonconversion.jsonobject import JSONObject
 
 import rafcon
-from rafcon.core.execution.execution_history import ExecutionHistory, ExecutionHistoryStorage
+from rafcon.core.execution.execution_history import ExecutionHistory, ExecutionHistoryStorage, \
+    BinaryExecutionHistoryStorage, AsyncExecutionHistoryStorage
 from rafcon.core.id_generator import generate_state_machine_id, run_id_generator
 from rafcon.utils import log
 from rafcon.utils.hashable import Hashable
@@ -225,7 +226,9 @@ class StateMachine(Observable, JSONObject, Hashable):
 
     @Observable.observed
     def _add_new_execution_history(self):
-        new_execution_history = ExecutionHistory()
+        new_execution_history = ExecutionHistory(
+            max_length=global_config.get_config_value("EXECUTION_HISTORY_MAX_LENGTH", 0),
+            max_age=global_config.get_config_value("EXECUTION_HISTORY_MAX_AGE", 0))
 
         if global_config.get_config_value("EXECUTION_LOG_ENABLE", False):
             base_dir = global_config.get_config_value("EXECUTION_LOG_PATH", "%RAFCON_TEMP_PATH_BASE/execution_logs")
@@ -233,10 +236,20 @@ class StateMachine(Observable, JSONObject, Hashable):
                 base_dir = base_dir.replace('%RAFCON_TEMP_PATH_BASE', RAFCON_TEMP_PATH_BASE)
             if not os.path.exists(base_dir):
                 os.makedirs(base_dir)
-            shelve_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.shelve' %
-                                       (time.strftime('%Y-%m-%d-%H:%M:%S', time.localtime()),
-                                        self.root_state.name.replace(' ', '-')))
-            execution_history_store = ExecutionHistoryStorage(shelve_name)
+            if global_config.get_config_value("EXECUTION_LOG_FORMAT", "shelve") == "binary":
+                execution_history_storage_class, extension = BinaryExecutionHistoryStorage, 'log'
+            else:
+                execution_history_storage_class, extension = ExecutionHistoryStorage, 'shelve'
+            log_name = os.path.join(base_dir, '%s_rafcon_execution_log_%s.%s' %
+                                    (time.strftime('%Y-%m-%d-%H:%M:%S', time.localtime()),
+                                     self.root_state.name.replace(' ', '-'), extension))
+            execution_history_store = execution_history_storage_class(log_name)
+            if global_config.get_config_value("EXECUTION_LOG_ASYNC_WRITER", True):
+                execution_history_store = AsyncExecutionHistoryStorage(
+                    execution_history_store,
+                    queue_size=global_config.get_config_value("EXECUTION_LOG_QUEUE_SIZE", 1000),
+                    back_pressure_policy=global_config.get_config_value("EXECUTION_LOG_BACK_PRESSURE_POLICY", "block"),
+                    sampling_interval=global_config.get_config_value("EXECUTION_LOG_SAMPLING_INTERVAL", 10))
             new_execution_history.set_execution_history_storage(execution_history_store)
         self._execution_histories.append(new_execution_history)
         return new_execution_history
@@ -121,6 +121,8 @@ class StateMachineManager(Observable):
             logger.error("There is no state_machine with state_machine_id: %s" % state_machine_id)
             return removed_state_machine
 
+        core_singletons.state_machine_execution_engine.remove_execution_context(state_machine_id)
+
         # destroy execution history
         removed_state_machine.destroy_execution_histories()
         return removed_state_machine
@@ -59,6 +59,13 @@ class BarrierConcurrencyState(ConcurrencyState):
 
         The decider state is not considered in the backward execution case.
 
+        The child states are processed in the order they finish. If a quorum is set, the barrier already continues
+        when this number of child states finished (first K of N): the child states still running are preempted and
+        the ones not started yet (see CONCURRENCY_MAX_RUNNING_BRANCHES) are skipped. Only the outputs of the child
+        states finishing within the quorum are passed on, while the decider state gets the final outcomes of all
+        executed child states.
+
+    :ivar quorum: the number of child states that have to finish, 0 for all child states
     """
     yaml_tag = u'!BarrierConcurrencyState'
 
@@ -66,6 +73,7 @@ class BarrierConcurrencyState(ConcurrencyState):
                  income=None, outcomes=None, states=None, transitions=None, data_flows=None, start_state_id=None,
                  scoped_variables=None, decider_state=None, load_from_storage=False, safe_init=True):
         self.__init_running = True
+        self._quorum = 0
         states = {} if states is None else states
         if decider_state is not None:
             if isinstance(decider_state, DeciderState):
@@ -111,23 +119,30 @@ class BarrierConcurrencyState(ConcurrencyState):
 
         try:
             concurrency_history_item = self.setup_forward_or_backward_execution()
-            self.start_child_states(concurrency_history_item, decider_state)
+            scheduler = self.create_child_state_scheduler(concurrency_history_item, decider_state)
+            quorum = 0 if self.backward_execution else self.quorum
+            number_of_finished_states = 0
 
             # print("bcs1")
 
             #######################################################
-            # wait for all child threads to finish
+            # process the child states as soon as they finish
             #######################################################
-            for history_index, state in enumerate(self.states.values()):
-                # skip the decider state
-                if state is not decider_state:
-                    self.join_state(state, history_index, concurrency_history_item)
-                    self.add_state_execution_output_to_scoped_data(state.output_data, state)
-                    self.update_scoped_variables_with_output_dictionary(state.output_data, state)
-                    # save the errors of the child state executions for the decider state
-                    if 'error' in state.output_data:
-                        child_errors[state.state_id] = (state.name, state.output_data['error'])
-                    final_outcomes_dict[state.state_id] = (state.name, state.final_outcome)
+            for history_index, state in scheduler.finished_states():
+                self.join_state(state, history_index, concurrency_history_item)
+                final_outcomes_dict[state.state_id] = (state.name, state.final_outcome)
+                if quorum and number_of_finished_states >= quorum:
+                    # the child state was preempted after the quorum was reached
+                    continue
+                number_of_finished_states += 1
+                self.add_state_execution_output_to_scoped_data(state.output_data, state)
+                self.update_scoped_variables_with_output_dictionary(state.output_data, state)
+                # save the errors of the child state executions for the decider state
+                if 'error' in state.output_data:
+                    child_errors[state.state_id] = (state.name, state.output_data['error'])
+                if number_of_finished_states == quorum:
+                    scheduler.skip_pending_states()
+                    scheduler.preempt_running_states()
 
             # print("bcs2")
 
@@ -239,6 +254,34 @@ class BarrierConcurrencyState(ConcurrencyState):
 
         return True, message
 
+    def __copy__(self):
+        state = super(BarrierConcurrencyState, self).__copy__()
+        state._quorum = self.quorum
+        return state
+
+    @staticmethod
+    def state_to_dict(state):
+        dict_representation = ContainerState.state_to_dict(state)
+        # only stored if set, so that the files of existing state machines do not change
+        if state.quorum:
+            dict_representation['quorum'] = state.quorum
+        return dict_representation
+
+    @property
+    def quorum(self):
+        """Property for the _quorum field
+
+        """
+        return self._quorum
+
+    @quorum.setter
+    @lock_state_machine
+    @Observable.observed
+    def quorum(self, quorum):
+        if not isinstance(quorum, int) or quorum < 0:
+            raise ValueError("The quorum has to be a non-negative integer")
+        self._quorum = quorum
+
     @lock_state_machine
     def add_state(self, state, storage_load=False):
         """Overwrite the parent class add_state method
@@ -316,6 +359,7 @@ class BarrierConcurrencyState(ConcurrencyState):
                     scoped_variables=dictionary['scoped_variables'],
                     load_from_storage=True,
                     safe_init=safe_init)
+        state._quorum = dictionary.get('quorum', 0)
         try:
             state.description = dictionary['description']
         except (TypeError, KeyError):  # (Very) old state machines do not have a description field
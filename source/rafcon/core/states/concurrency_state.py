@@ -17,17 +17,100 @@
 """
 from future import standard_library
 standard_library.install_aliases()
+from builtins import object
+from collections import deque
 import queue
 
 from gtkmvc3.observable import Observable
 
 import rafcon.core.singleton as singleton
+from rafcon.core.config import global_config
 from rafcon.core.states.container_state import ContainerState
 from rafcon.core.execution.execution_history import CallType
 from rafcon.core.execution.execution_history import CallItem, ReturnItem, ConcurrencyItem
 from rafcon.core.states.state import StateExecutionStatus
 from rafcon.core.state_elements.logical_port import Outcome
 
+# the interval in seconds in which the scheduler checks for child states that terminated without notifying it
+CHILD_STATE_LIVENESS_CHECK_INTERVAL = 0.5
+
+
+class ChildStateScheduler(object):
+    """Starts the child states of a concurrency state and reports them in the order they finish
+
+    The finished child states are processed as soon as they finish, instead of joining them in the order of the
+    states dict. At most `max_running_states` child states are running at the same time, further child states are
+    started as soon as running ones finish. Once the concurrency state is preempted, no further child states are
+    started.
+
+    :ivar max_running_states: the maximum number of simultaneously running child states, 0 for no limit
+    """
+
+    def __init__(self, concurrency_state, concurrency_history_item, child_states, max_running_states=0):
+        """
+        :param ConcurrencyState concurrency_state: the concurrency state executing the child states
+        :param concurrency_history_item: the concurrency history item holding the execution histories of the children
+        :param child_states: the child states to be executed as tuples of history index and state
+        :param int max_running_states: the maximum number of simultaneously running child states, 0 for no limit
+        """
+        self.max_running_states = max_running_states
+        self._concurrency_state = concurrency_state
+        self._concurrency_history_item = concurrency_history_item
+        self._concurrency_queue = queue.Queue(maxsize=0)
+        self._pending_states = deque(child_states)
+        self._running_states = {}
+
+    def finished_states(self):
+        """Starts the child states and yields them as soon as they finish
+
+        The yielded child states are not joined yet, see :meth:`ConcurrencyState.join_state`.
+
+        :return: a generator of tuples of the history index and the finished child state
+        """
+        self._start_pending_states()
+        while self._running_states:
+            state_id = self._get_finished_state_id()
+            yield self._running_states.pop(state_id)
+            self._start_pending_states()
+
+    def skip_pending_states(self):
+        """Prevents the start of all child states that were not started yet
+
+        :return: the skipped child states as tuples of history index and state
+        """
+        skipped_states = list(self._pending_states)
+        self._pending_states.clear()
+        return skipped_states
+
+    def preempt_running_states(self):
+        """Preempts all child states that are still running"""
+        for _, state in list(self._running_states.values()):
+            state.recursively_preempt_states()
+
+    def _start_pending_states(self):
+        if self._concurrency_state.preempted:
+            # the child states would reset their preemption flag when being started
+            self.skip_pending_states()
+            return
+        while self._pending_states and \
+                (not self.max_running_states or len(self._running_states) < self.max_running_states):
+            history_index, state = self._pending_states.popleft()
+            self._running_states[state.state_id] = (history_index, state)
+            self._concurrency_state.start_child_state(state, history_index, self._concurrency_history_item,
+                                                      self._concurrency_queue)
+
+    def _get_finished_state_id(self):
+        while True:
+            try:
+                state_id = self._concurrency_queue.get(timeout=CHILD_STATE_LIVENESS_CHECK_INTERVAL)
+                if state_id in self._running_states:
+                    return state_id
+            except queue.Empty:
+                # a child state whose thread terminated without finalizing is treated as finished
+                for state_id, (_, state) in self._running_states.items():
+                    if state.thread is None or not state.thread.is_alive():
+                        return state_id
+
 
 class ConcurrencyState(ContainerState):
     """A class to represent a concurrency state for the state machine
@@ -77,39 +160,54 @@ class ConcurrencyState(ContainerState):
             concurrency_history_item = self.execution_history.push_concurrency_history_item(self, len(self.states))
         return concurrency_history_item
 
-    def start_child_states(self, concurrency_history_item, do_not_start_state=None):
-        """ Utility function to start all child states of the concurrency state.
+    def start_child_state(self, state, history_index, concurrency_history_item, concurrency_queue):
+        """ Utility function to start a single child state of the concurrency state.
+
+        :param state: the child state to be started
+        :param history_index: the index of the execution history stack in the concurrency history item
+                                for the given state
+        :param concurrency_history_item: the concurrency history item that stores the execution history stacks of all
+                                        children
+        :param concurrency_queue: the queue, into which the child state puts its id when it finishes
+        """
+        state.input_data = self.get_inputs_for_state(state)
+        state.output_data = self.create_output_dictionary_for_state(state)
+        state.concurrency_queue = concurrency_queue
+        state.concurrency_queue_id = history_index
+
+        state.generate_run_id()
+        if not self.backward_execution:
+            # care for the history items; this item is only for execution visualization
+            concurrency_history_item.execution_histories[history_index].push_call_history_item(
+                state, CallType.EXECUTE, self, state.input_data)
+        else:  # backward execution
+            last_history_item = concurrency_history_item.execution_histories[history_index].pop_last_item()
+            assert isinstance(last_history_item, ReturnItem)
+        state.start(concurrency_history_item.execution_histories[history_index], self.backward_execution, False)
+
+    def create_child_state_scheduler(self, concurrency_history_item, do_not_start_state=None):
+        """ Creates a scheduler, which starts the child states and reports them in the order they finish.
+
+        The number of simultaneously running child states is limited by CONCURRENCY_MAX_RUNNING_BRANCHES. In the
+        backward execution, only the child states that were executed before are started.
 
         :param concurrency_history_item: each concurrent child branch gets an execution history stack of this
                                         concurrency history item
-        :param do_not_start_state: optionally the id of a state can be passed, that must not be started (e.g. in the
-                                    case of the barrier concurrency state the decider state)
-        :return:
+        :param do_not_start_state: optionally the state, that must not be started (e.g. in the case of the barrier
+                                    concurrency state the decider state)
+        :rtype: ChildStateScheduler
         """
         self.state_execution_status = StateExecutionStatus.EXECUTE_CHILDREN
-        # actually the queue is not needed in the barrier concurrency case
-        # to avoid code duplication both concurrency states have the same start child function
-        concurrency_queue = queue.Queue(maxsize=0)  # infinite Queue size
-
+        child_states = []
         for index, state in enumerate(self.states.values()):
-            if state is not do_not_start_state:
-
-                state.input_data = self.get_inputs_for_state(state)
-                state.output_data = self.create_output_dictionary_for_state(state)
-                state.concurrency_queue = concurrency_queue
-                state.concurrency_queue_id = index
-
-                state.generate_run_id()
-                if not self.backward_execution:
-                    # care for the history items; this item is only for execution visualization
-                    concurrency_history_item.execution_histories[index].push_call_history_item(
-                        state, CallType.EXECUTE, self, state.input_data)
-                else:  # backward execution
-                    last_history_item = concurrency_history_item.execution_histories[index].pop_last_item()
-                    assert isinstance(last_history_item, ReturnItem)
-                state.start(concurrency_history_item.execution_histories[index], self.backward_execution, False)
-
-        return concurrency_queue
+            if state is do_not_start_state:
+                continue
+            if self.backward_execution and not len(concurrency_history_item.execution_histories[index]):
+                # the child state was not executed, e.g. as a quorum was reached before its start
+                continue
+            child_states.append((index, state))
+        max_running_states = global_config.get_config_value("CONCURRENCY_MAX_RUNNING_BRANCHES", 0)
+        return ChildStateScheduler(self, concurrency_history_item, child_states, max_running_states)
 
     def join_state(self, state, history_index, concurrency_history_item):
         """ a utility function to join a state
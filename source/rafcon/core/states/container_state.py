@@ -28,6 +28,7 @@ from collections import OrderedDict
 from gtkmvc3.observable import Observable
 
 from rafcon.core.custom_exceptions import RecoveryModeException
+from rafcon.core.data_passing import pass_value
 from rafcon.core.decorators import lock_state_machine
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
 from rafcon.core.id_generator import *
@@ -70,7 +71,11 @@ class ContainerState(State):
 
         self._states = OrderedDict()
         self._transitions = {}
+        # index of the transitions by their origin (from_state, from_outcome), see get_transition_for_outcome
+        self._transitions_by_origin = None
         self._data_flows = {}
+        # routing tables of the data flows, see _get_data_flow_routing
+        self._data_flow_routing = None
         self._scoped_variables = {}
         self._scoped_data = {}
         self._current_state = None
@@ -105,20 +110,23 @@ class ContainerState(State):
         self._states = states if states is not None else {}
         for _, state in self._states.items():
             state._parent = ref(self)
+            state.invalidate_path()
         self._transitions = transitions if transitions is not None else {}
         for _, transition in self._transitions.items():
             transition._parent = ref(self)
+        self.invalidate_transition_index()
         self._data_flows = data_flows if data_flows is not None else {}
         for _, data_flow in self._data_flows.items():
             data_flow._parent = ref(self)
+        self.invalidate_data_flow_routing()
 
     # ---------------------------------------------------------------------------------------------
     # ----------------------------------- generic methods -----------------------------------------
     # ---------------------------------------------------------------------------------------------
 
     @lock_state_machine
-    def update_hash(self, obj_hash):
-        super(ContainerState, self).update_hash(obj_hash)
+    def update_hash_of_content(self, obj_hash):
+        super(ContainerState, self).update_hash_of_content(obj_hash)
         for state_element in sorted(self.states.values()) + sorted(list(self.transitions.values()) +
                                                                    list(self.data_flows.values()) +
                                                                    list(self.scoped_variables.values())):
@@ -205,7 +213,7 @@ class ContainerState(State):
         state = self.__class__(self.name, self.state_id, input_data_ports, output_data_ports, income, outcomes, states,
                                transitions, data_flows, None, scoped_variables, safe_init=False)
         state._description = deepcopy(self.description)
-        state._semantic_data = deepcopy(self.semantic_data)
+        state._set_semantic_data(deepcopy(self.semantic_data))
         state._file_system_path = self.file_system_path
         return state
 
@@ -1155,10 +1163,11 @@ class ContainerState(State):
         """
 
         # overwrite the start state in the case that a specific start state is specific e.g. by start_from_state
-        if self.get_path() in state_machine_execution_engine.start_state_paths:
+        start_state_paths = state_machine_execution_engine.get_execution_context_of_state(self).start_state_paths
+        if self.get_path() in start_state_paths:
             for state_id, state in self.states.items():
-                if state.get_path() in state_machine_execution_engine.start_state_paths:
-                    state_machine_execution_engine.start_state_paths.remove(self.get_path())
+                if state.get_path() in start_state_paths:
+                    start_state_paths.remove(self.get_path())
                     self._start_state_modified = True
                     return state
 
@@ -1230,11 +1239,9 @@ class ContainerState(State):
         :raises exceptions.AttributeError: if the outcome of the state with the state_id==from_state_id
                                             is already connected
         """
-        for trans_key, transition in self.transitions.items():
-            if transition.from_state == from_state_id:
-                if transition.from_outcome == from_outcome:
-                    raise AttributeError("Outcome %s of state %s is already connected" %
-                                         (str(from_outcome), str(from_state_id)))
+        if (from_state_id, from_outcome) in self._get_transitions_by_origin():
+            raise AttributeError("Outcome %s of state %s is already connected" %
+                                 (str(from_outcome), str(from_state_id)))
 
     @lock_state_machine
     def create_transition(self, from_state_id, from_outcome, to_state_id, to_outcome, transition_id):
@@ -1275,6 +1282,7 @@ class ContainerState(State):
         else:
             self.transitions[transition_id] = \
                 Transition(None, None, to_state_id, to_outcome, transition_id, self)
+        self.invalidate_transition_index()
 
         # notify all states waiting for transition to be connected
         with self._transitions_cv:
@@ -1305,6 +1313,7 @@ class ContainerState(State):
 
         new_transition = Transition(from_state_id, from_outcome, to_state_id, to_outcome, transition_id, self)
         self.transitions[transition_id] = new_transition
+        self.invalidate_transition_index()
 
         # notify all states waiting for transition to be connected
         with self._transitions_cv:
@@ -1324,11 +1333,41 @@ class ContainerState(State):
             raise TypeError("state must be of type State")
         if not isinstance(outcome, Outcome):
             raise TypeError("outcome must be of type Outcome")
-        result_transition = None
-        for key, transition in self.transitions.items():
-            if transition.from_state == state.state_id and transition.from_outcome == outcome.outcome_id:
-                result_transition = transition
-        return result_transition
+        return self._get_transitions_by_origin().get((state.state_id, outcome.outcome_id))
+
+    def invalidate_path(self):
+        """Resets the cached paths of the container state and of all its descendants"""
+        super(ContainerState, self).invalidate_path()
+        for state in self._states.values():
+            state.invalidate_path()
+
+    def invalidate_transition_index(self):
+        """Discards the index of transitions by their origin
+
+        Must be called whenever the origin of a transition changes or transitions are added or removed without using
+        the methods of the container state. The index is rebuilt on its next usage.
+        """
+        self._transitions_by_origin = None
+
+    def _get_transitions_by_origin(self):
+        """Returns the transitions of the container state indexed by their origin
+
+        The index maps (from_state, from_outcome) to the transition starting there. If the transitions dictionary was
+        replaced or its size changed, the index is considered outdated and rebuilt.
+
+        :return: dictionary transitions_by_origin[(from_state, from_outcome)] of
+                 :class:`rafcon.core.state_elements.transition.Transition`
+        :rtype: dict
+        """
+        transitions = self._transitions
+        index = self._transitions_by_origin
+        if index is None or index[0] is not transitions or index[1] != len(transitions):
+            transitions_by_origin = {}
+            for transition in list(transitions.values()):
+                transitions_by_origin[(transition.from_state, transition.from_outcome)] = transition
+            index = (transitions, len(transitions), transitions_by_origin)
+            self._transitions_by_origin = index
+        return index[2]
 
     @lock_state_machine
     @Observable.observed
@@ -1344,7 +1383,9 @@ class ContainerState(State):
             raise AttributeError("The transition_id %s does not exist" % str(transition_id))
 
         self.transitions[transition_id].parent = None
-        return self.transitions.pop(transition_id)
+        transition = self.transitions.pop(transition_id)
+        self.invalidate_transition_index()
+        return transition
 
     @lock_state_machine
     def remove_outcome_hook(self, outcome_id):
@@ -1395,6 +1436,7 @@ class ContainerState(State):
 
         self.data_flows[data_flow_id] = DataFlow(from_state_id, from_data_port_id, to_state_id, to_data_port_id,
                                                  data_flow_id, self)
+        self.invalidate_data_flow_routing()
         return data_flow_id
 
     @lock_state_machine
@@ -1409,7 +1451,43 @@ class ContainerState(State):
             raise AttributeError("The data_flow_id %s does not exist" % str(data_flow_id))
 
         self._data_flows[data_flow_id].parent = None
-        return self._data_flows.pop(data_flow_id)
+        data_flow = self._data_flows.pop(data_flow_id)
+        self.invalidate_data_flow_routing()
+        return data_flow
+
+    def invalidate_data_flow_routing(self):
+        """Discards the routing tables of the data flows
+
+        Must be called whenever the origin or target of a data flow changes or data flows are added or removed without
+        using the methods of the container state. The routing tables are rebuilt on their next usage.
+        """
+        self._data_flow_routing = None
+
+    def _get_data_flow_routing(self):
+        """Returns the routing tables of the data flows of the container state
+
+        The first table maps each connected target port (to_state, to_key) to the list of its sources, given as tuple
+        of the scoped data key of the source port and the source state id. The second table maps each source port
+        (from_state, from_key) to the list of port ids of the container state itself it is connected to, which are
+        used to forward data to scoped variables. Both lists keep the order of the data flows. If the data flows
+        dictionary was replaced or its size changed, the tables are considered outdated and rebuilt.
+
+        :return: port_sources[(to_state, to_key)], scoped_targets[(from_state, from_key)]
+        :rtype: dict, dict
+        """
+        data_flows = self._data_flows
+        routing = self._data_flow_routing
+        if routing is None or routing[0] is not data_flows or routing[1] != len(data_flows):
+            port_sources = {}
+            scoped_targets = {}
+            for data_flow in list(data_flows.values()):
+                port_sources.setdefault((data_flow.to_state, data_flow.to_key), []).append(
+                    (str(data_flow.from_key) + data_flow.from_state, data_flow.from_state))
+                if data_flow.to_state == self.state_id:
+                    scoped_targets.setdefault((data_flow.from_state, data_flow.from_key), []).append(data_flow.to_key)
+            routing = (data_flows, len(data_flows), port_sources, scoped_targets)
+            self._data_flow_routing = routing
+        return routing[2], routing[3]
 
     @lock_state_machine
     def remove_data_flows_with_data_port_id(self, data_port_id):
@@ -1571,23 +1649,20 @@ class ContainerState(State):
         tmp_dict = self.get_default_input_values_for_state(state)
         result_dict.update(tmp_dict)
 
+        port_sources, _ = self._get_data_flow_routing()
         for input_port_key, value in state.input_data_ports.items():
             # for all input keys fetch the correct data_flow connection and read data into the result_dict
             actual_value = None
             actual_value_time = 0
-            for data_flow_key, data_flow in self.data_flows.items():
-
-                if data_flow.to_key == input_port_key:
-                    if data_flow.to_state == state.state_id:
-                        # fetch data from the scoped_data list: the key is the data_port_key + the state_id
-                        key = str(data_flow.from_key) + data_flow.from_state
-                        if key in self.scoped_data:
-                            if actual_value is None or actual_value_time < self.scoped_data[key].timestamp:
-                                actual_value = deepcopy(self.scoped_data[key].value)
-                                actual_value_time = self.scoped_data[key].timestamp
+            for key, _ in port_sources.get((state.state_id, input_port_key), ()):
+                # fetch data from the scoped_data list: the key is the data_port_key + the state_id
+                if key in self.scoped_data:
+                    if actual_value is None or actual_value_time < self.scoped_data[key].timestamp:
+                        actual_value = self.scoped_data[key].value
+                        actual_value_time = self.scoped_data[key].timestamp
 
             if actual_value is not None:
-                result_dict[value.name] = actual_value
+                result_dict[value.name] = pass_value(actual_value)
 
         return result_dict
 
@@ -1595,7 +1670,9 @@ class ContainerState(State):
     # ---------------------------- functions to modify the scoped data ----------------------------
     # ---------------------------------------------------------------------------------------------
 
-    @lock_state_machine
+    # The scoped data is execution data and not part of the structure of the state machine. Thus, these functions do
+    # not acquire the modification lock of the state machine, which is reserved for edits.
+
     def add_input_data_to_scoped_data(self, dictionary):
         """Add a dictionary to the scoped data
 
@@ -1605,21 +1682,20 @@ class ContainerState(State):
         :param dictionary: The dictionary that is added to the scoped data
         :param state: The state to which the input_data was passed (should be self in most cases)
         """
+        _, scoped_targets = self._get_data_flow_routing()
         for dict_key, value in dictionary.items():
             for input_data_port_key, data_port in list(self.input_data_ports.items()):
                 if dict_key == data_port.name:
                     self.scoped_data[str(input_data_port_key) + self.state_id] = \
                         ScopedData(data_port.name, value, type(value), self.state_id, ScopedVariable, parent=self)
                     # forward the data to scoped variables
-                    for data_flow_key, data_flow in self.data_flows.items():
-                        if data_flow.from_key == input_data_port_key and data_flow.from_state == self.state_id:
-                            if data_flow.to_state == self.state_id and data_flow.to_key in self.scoped_variables:
-                                current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                                self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                    ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
-                                               ScopedVariable, parent=self)
+                    for to_key in scoped_targets.get((self.state_id, input_data_port_key), ()):
+                        if to_key in self.scoped_variables:
+                            current_scoped_variable = self.scoped_variables[to_key]
+                            self.scoped_data[str(to_key) + self.state_id] = \
+                                ScopedData(current_scoped_variable.name, value, type(value), self.state_id,
+                                           ScopedVariable, parent=self)
 
-    @lock_state_machine
     def add_state_execution_output_to_scoped_data(self, dictionary, state):
         """Add a state execution output to the scoped data
 
@@ -1638,27 +1714,26 @@ class ContainerState(State):
                     self.scoped_data[str(output_data_port_key) + state.state_id] = \
                         ScopedData(data_port.name, value, type(value), state.state_id, OutputDataPort, parent=self)
 
-    @lock_state_machine
     def add_default_values_of_scoped_variables_to_scoped_data(self):
         """Add the scoped variables default values to the scoped_data dictionary
 
         """
-        for key, scoped_var in self.scoped_variables.items():
+        for key, scoped_var in list(self.scoped_variables.items()):
             self.scoped_data[str(scoped_var.data_port_id) + self.state_id] = \
                 ScopedData(scoped_var.name, scoped_var.default_value, scoped_var.data_type, self.state_id,
                            ScopedVariable, parent=self)
 
-    @lock_state_machine
     def update_scoped_variables_with_output_dictionary(self, dictionary, state):
         """Update the values of the scoped variables with the output dictionary of a specific state.
 
         :param: the dictionary to update the scoped variables with
         :param: the state the output dictionary belongs to
         """
+        _, scoped_targets = self._get_data_flow_routing()
         for key, value in dictionary.items():
             output_data_port_key = None
             # search for the correct output data port key of the source state
-            for o_key, o_port in state.output_data_ports.items():
+            for o_key, o_port in list(state.output_data_ports.items()):
                 if o_port.name == key:
                     output_data_port_key = o_key
                     break
@@ -1666,14 +1741,13 @@ class ContainerState(State):
                 if not key == "error":
                     logger.warning("Output variable %s was written during state execution, "
                                    "that has no data port connected to it.", str(key))
-            for data_flow_key, data_flow in self.data_flows.items():
-                if data_flow.from_key == output_data_port_key and data_flow.from_state == state.state_id:
-                    if data_flow.to_state == self.state_id:  # is target of data flow own state id?
-                        if data_flow.to_key in self.scoped_variables.keys():  # is target data port scoped?
-                            current_scoped_variable = self.scoped_variables[data_flow.to_key]
-                            self.scoped_data[str(data_flow.to_key) + self.state_id] = \
-                                ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
-                                           ScopedVariable, parent=self)
+                continue
+            for to_key in scoped_targets.get((state.state_id, output_data_port_key), ()):
+                if to_key in self.scoped_variables:  # is target data port scoped?
+                    current_scoped_variable = self.scoped_variables[to_key]
+                    self.scoped_data[str(to_key) + self.state_id] = \
+                        ScopedData(current_scoped_variable.name, value, type(value), state.state_id,
+                                   ScopedVariable, parent=self)
 
     # ---------------------------------------------------------------------------------------------
     # ------------------------ functions to modify the scoped data end ----------------------------
@@ -1696,6 +1770,7 @@ class ContainerState(State):
                 transition._from_state = self.state_id
             if transition.to_state == old_state_id:
                 transition._to_state = self.state_id
+        self.invalidate_transition_index()
 
         # change id in all data_flows
         for data_flow in self.data_flows.values():
@@ -1703,6 +1778,7 @@ class ContainerState(State):
                 data_flow._from_state = self.state_id
             if data_flow.to_state == old_state_id:
                 data_flow._to_state = self.state_id
+        self.invalidate_data_flow_routing()
 
     def get_state_for_transition(self, transition):
         """Calculate the target state of a transition
@@ -1730,32 +1806,30 @@ class ContainerState(State):
         else:
             output_dict = self.output_data
 
+        port_sources, _ = self._get_data_flow_routing()
         for output_name, value in self.output_data.items():
             output_port_id = self.get_io_data_port_id_from_name_and_type(output_name, OutputDataPort)
             actual_value = None
             actual_value_was_written = False
             actual_value_time = 0
-            for data_flow_id, data_flow in self.data_flows.items():
-                if data_flow.to_state == self.state_id:
-                    if data_flow.to_key == output_port_id:
-                        scoped_data_key = str(data_flow.from_key) + data_flow.from_state
-                        if scoped_data_key in self.scoped_data:
-                            # if self.scoped_data[scoped_data_key].timestamp > actual_value_time is True
-                            # the data of a previous execution of the same state is overwritten
-                            if actual_value is None or self.scoped_data[scoped_data_key].timestamp > actual_value_time:
-                                actual_value = deepcopy(self.scoped_data[scoped_data_key].value)
-                                actual_value_time = self.scoped_data[scoped_data_key].timestamp
-                                actual_value_was_written = True
-                        else:
-                            if not self.backward_execution:
-                                logger.debug(
-                                    "Output data with name {0} of state {1} was not found in the scoped data "
-                                    "of state {2}. Thus the state did not write onto this output. "
-                                    "This can mean a state machine design error.".format(
-                                        str(output_name), str(self.states[data_flow.from_state].get_path()),
-                                        self.get_path()))
+            for scoped_data_key, from_state in port_sources.get((self.state_id, output_port_id), ()):
+                if scoped_data_key in self.scoped_data:
+                    # if self.scoped_data[scoped_data_key].timestamp > actual_value_time is True
+                    # the data of a previous execution of the same state is overwritten
+                    if actual_value is None or self.scoped_data[scoped_data_key].timestamp > actual_value_time:
+                        actual_value = self.scoped_data[scoped_data_key].value
+                        actual_value_time = self.scoped_data[scoped_data_key].timestamp
+                        actual_value_was_written = True
+                else:
+                    if not self.backward_execution:
+                        logger.debug(
+                            "Output data with name {0} of state {1} was not found in the scoped data "
+                            "of state {2}. Thus the state did not write onto this output. "
+                            "This can mean a state machine design error.".format(
+                                str(output_name), str(self.states[from_state].get_path()),
+                                self.get_path()))
             if actual_value_was_written:
-                output_dict[output_name] = actual_value
+                output_dict[output_name] = pass_value(actual_value)
 
     # ---------------------------------------------------------------------------------------------
     # -------------------------------------- check methods ---------------------------------------
@@ -2253,6 +2327,7 @@ class ContainerState(State):
         for old_transition in old_transitions.values():
             if old_transition not in self._transitions.values() and old_transition.parent is self:
                 old_transition.parent = None
+        self.invalidate_transition_index()
 
     @property
     def data_flows(self):
@@ -2310,6 +2385,7 @@ class ContainerState(State):
         for old_data_flow in old_data_flows.values():
             if old_data_flow not in self._data_flows.values() and old_data_flow.parent is self:
                 old_data_flow.parent = None
+        self.invalidate_data_flow_routing()
 
     @property
     def start_state_id(self):
@@ -2418,7 +2494,6 @@ class ContainerState(State):
         return self._scoped_data
 
     @scoped_data.setter
-    @lock_state_machine
     # @Observable.observed
     def scoped_data(self, scoped_data):
         if not isinstance(scoped_data, dict):
@@ -30,6 +30,7 @@ from rafcon.core.states.state import State
 from rafcon.core.decorators import lock_state_machine
 from rafcon.core.state_elements.logical_port import Outcome
 from rafcon.core.script import Script
+from rafcon.core.execution.process_pool import EXECUTION_BACKEND_THREAD, EXECUTION_BACKENDS
 from rafcon.core.states.state import StateExecutionStatus
 from rafcon.core.execution.execution_history import CallType
 from rafcon.core.config import global_config
@@ -42,6 +43,9 @@ class ExecutionState(State):
     """A class to represent a state for executing arbitrary functions
 
     This kind of state does not have any child states.
+
+    :ivar execution_backend: "thread" to execute the script in the thread of the state, "process" to execute it in a
+        worker process of the :class:`rafcon.core.execution.process_pool.ScriptProcessPool`
     """
 
     yaml_tag = u'!ExecutionState'
@@ -50,6 +54,7 @@ class ExecutionState(State):
                  income=None, outcomes=None, path=None, filename=None, check_path=True, safe_init=True):
         State.__init__(self, name, state_id, input_data_ports, output_data_ports, income, outcomes, safe_init=safe_init)
         self._script = None
+        self._execution_backend = EXECUTION_BACKEND_THREAD
         self.script = Script(path, filename, parent=self)
         self.logger = log.get_logger(self.name)
         # here all persistent variables that should be available for the next state run should be stored
@@ -62,7 +67,8 @@ class ExecutionState(State):
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
-        return str(self) == str(other) and self.script_text == other.script_text
+        return str(self) == str(other) and self.script_text == other.script_text and \
+            self.execution_backend == other.execution_backend
 
     def __copy__(self):
         input_data_ports = {key: copy(self._input_data_ports[key]) for key in self._input_data_ports.keys()}
@@ -73,9 +79,10 @@ class ExecutionState(State):
                                safe_init=False)
 
         state.script_text = deepcopy(self.script_text)
+        state._execution_backend = self.execution_backend
 
         state._description = deepcopy(self.description)
-        state._semantic_data = deepcopy(self.semantic_data)
+        state._set_semantic_data(deepcopy(self.semantic_data))
         state._file_system_path = self.file_system_path
         return state
 
@@ -83,10 +90,19 @@ class ExecutionState(State):
         return self.__copy__()
 
     @lock_state_machine
-    def update_hash(self, obj_hash):
-        super(ExecutionState, self).update_hash(obj_hash)
+    def update_hash_of_content(self, obj_hash):
+        # the execution backend is part of the hashed state dict, see state_to_dict
+        super(ExecutionState, self).update_hash_of_content(obj_hash)
         obj_hash.update(self.get_object_hash_string(self.script.script))
 
+    @staticmethod
+    def state_to_dict(state):
+        dict_representation = State.state_to_dict(state)
+        # only stored if set, so that the files of existing state machines do not change
+        if state.execution_backend != EXECUTION_BACKEND_THREAD:
+            dict_representation['execution_backend'] = state.execution_backend
+        return dict_representation
+
     @classmethod
     def from_dict(cls, dictionary):
         name = dictionary['name']
@@ -97,6 +113,7 @@ class ExecutionState(State):
         outcomes = dictionary['outcomes']
         safe_init = global_config.get_config_value("LOAD_SM_WITH_CHECKS", True)
         state = cls(name, state_id, input_data_ports, output_data_ports, income, outcomes, safe_init=safe_init)
+        state._execution_backend = dictionary.get('execution_backend', EXECUTION_BACKEND_THREAD)
         try:
             state.description = dictionary['description']
         except (TypeError, KeyError):  # (Very) old state machines do not have a description field
@@ -202,6 +219,21 @@ class ExecutionState(State):
             raise AttributeError("The script of a ExecutionState has to reference the state it-self.")
         self._script = script
 
+    @property
+    def execution_backend(self):
+        """Property for the _execution_backend field
+
+        """
+        return self._execution_backend
+
+    @execution_backend.setter
+    @lock_state_machine
+    @Observable.observed
+    def execution_backend(self, execution_backend):
+        if execution_backend not in EXECUTION_BACKENDS:
+            raise ValueError("The execution backend has to be one of {0}".format(", ".join(EXECUTION_BACKENDS)))
+        self._execution_backend = execution_backend
+
     @property
     def script_text(self):
         return self._script.script
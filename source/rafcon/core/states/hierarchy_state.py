@@ -28,6 +28,7 @@ from rafcon.core.execution.execution_history import CallItem, ReturnItem
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
 from rafcon.core.states.state import StateExecutionStatus
 from rafcon.core.execution.execution_history import CallType
+from rafcon.core.execution.execution_pool import pooled_execution_enabled
 
 logger = log.get_logger(__name__)
 
@@ -117,6 +118,13 @@ class HierarchyState(ContainerState):
                     else:
                         break
                 elif execution_mode == StateMachineExecutionStatus.BACKWARD:
+                    if not self.execution_history.backward_step_possible(self):
+                        logger.warning("Cannot step back any further in {0}, as the execution history was "
+                                       "truncated".format(self))
+                        state_machine = self.get_state_machine()
+                        singleton.state_machine_execution_engine.step_mode(
+                            state_machine.state_machine_id if state_machine else None)
+                        continue
                     break_loop = self._handle_backward_execution_before_child_execution()
                     if break_loop:
                         break
@@ -202,10 +210,15 @@ class HierarchyState(ContainerState):
         if not self.backward_execution:  # only add history item if it is not a backward execution
             self.execution_history.push_call_history_item(
                 self.child_state, CallType.EXECUTE, self, self.child_state.input_data)
-        self.child_state.start(self.execution_history, backward_execution=self.backward_execution,
-                               generate_run_id=False)
+        if pooled_execution_enabled():
+            # the hierarchy state waits for its child anyway, thus the child can be executed in the same thread
+            self.child_state.run_inline(self.execution_history, backward_execution=self.backward_execution,
+                                        generate_run_id=False)
+        else:
+            self.child_state.start(self.execution_history, backward_execution=self.backward_execution,
+                                   generate_run_id=False)
 
-        self.child_state.join()
+            self.child_state.join()
 
         # this line is important to indicate the parent the current execution status
         # it may also change during the execution of an hierarchy state
@@ -249,7 +262,7 @@ class HierarchyState(ContainerState):
         # was executed; this leads to the backward and forward execution of a hierarchy child_state
         # having the exact same number of steps
         last_history_item = self.execution_history.get_last_history_item()
-        if last_history_item.state_reference is self:
+        if last_history_item is not None and last_history_item.state_reference is self:
             last_history_item = self.execution_history.pop_last_item()
             assert isinstance(last_history_item, CallItem)
             self.scoped_data = last_history_item.scoped_data
@@ -21,6 +21,7 @@ from future.utils import string_types
 from builtins import str
 from weakref import ref
 from copy import copy, deepcopy
+from threading import Lock
 
 from gtkmvc3.observable import Observable
 from rafcon.core.states.state import StateExecutionStatus
@@ -56,6 +57,15 @@ class LibraryState(State):
     :ivar dict allow_user_interaction: flag to indicate if the user can support in localizing moved libraries
     :ivar skip_runtime_data_initialization: flag to indicate if the runtime-data data structures have to be initialized,
                                             this is not needed e.g. in the case of a copy
+
+    If LIBRARY_STATE_SHARED_TEMPLATES is enabled, all library states of a library share the root state of the loaded
+    library as template. The library state then only gets copies of the outcomes and data ports of the template. The
+    state copy is created from the template on its first access, e.g. when the library state is executed. Thus,
+    executed library states still hold a full copy of their library.
+
+    If LIBRARY_STATE_LAZY_LOADING is enabled, the library is not even loaded on the creation of the library state.
+    Only the root state of the library is read to get its outcomes and data ports. The library is loaded completely
+    and shared as template, when the state copy is created.
     """
 
     yaml_tag = u'!LibraryState'
@@ -64,6 +74,8 @@ class LibraryState(State):
     _library_name = None
     _version = None
     _state_copy = None
+    _library_template = None
+    _lazy_library_loading = False
 
     _input_data_port_runtime_values = {}
     _use_runtime_value_input_data_ports = {}
@@ -100,15 +112,27 @@ class LibraryState(State):
             logger.info("New library name '{0}' is located at {1}".format(new_library_name, new_library_path))
 
         # key = load_library_root_state_timer.start()
-        lib_version, state_copy = library_manager.get_library_state_copy_instance(self.lib_os_path)
+        self._state_copy_lock = Lock()
+        state_copy = library_interface = None
+        if global_config.get_config_value("LIBRARY_STATE_LAZY_LOADING", False):
+            self._lazy_library_loading = True
+            lib_version, library_interface = library_manager.get_library_interface(self.lib_os_path)
+        elif global_config.get_config_value("LIBRARY_STATE_SHARED_TEMPLATES", False):
+            lib_version, self._library_template = library_manager.get_library_template(self.lib_os_path)
+            library_interface = self._library_template
+        else:
+            lib_version, state_copy = library_manager.get_library_state_copy_instance(self.lib_os_path)
         if not str(lib_version) == version and not str(lib_version) == "None":
             raise AttributeError("Library does not have the correct version!")
-        self.state_copy = state_copy
 
-        if safe_init:
-            LibraryState._safe_init(self, name)
+        if library_interface is not None:
+            LibraryState._template_init(self, name, safe_init, library_interface)
         else:
-            LibraryState._unsafe_init(self, name)
+            self.state_copy = state_copy
+            if safe_init:
+                LibraryState._safe_init(self, name)
+            else:
+                LibraryState._unsafe_init(self, name)
 
         if not skip_runtime_data_initialization:
             # load_library_root_state_timer.stop(key)
@@ -134,6 +158,7 @@ class LibraryState(State):
 
     def _unsafe_init(self, name):
         self.state_copy._parent = ref(self)
+        self.state_copy.invalidate_path()
         if name is None:
             self._name = self.state_copy.name
         self._outcomes = self.state_copy.outcomes
@@ -147,6 +172,44 @@ class LibraryState(State):
         for port_id, port in self._output_data_ports.items():
             port._parent = ref(self)
 
+    def _template_init(self, name, safe_init, template):
+        outcomes = {outcome_id: copy(outcome) for outcome_id, outcome in template.outcomes.items()}
+        input_data_ports = {port_id: copy(port) for port_id, port in template.input_data_ports.items()}
+        output_data_ports = {port_id: copy(port) for port_id, port in template.output_data_ports.items()}
+        if safe_init:
+            if name is None:
+                self.name = template.name
+            self.outcomes = outcomes
+            self.input_data_ports = input_data_ports
+            self.output_data_ports = output_data_ports
+        else:
+            if name is None:
+                self._name = template.name
+            self._outcomes = outcomes
+            self._input_data_ports = input_data_ports
+            self._output_data_ports = output_data_ports
+            for state_element in list(outcomes.values()) + list(input_data_ports.values()) + \
+                    list(output_data_ports.values()):
+                state_element._parent = ref(self)
+
+    def _copy_library_template(self):
+        """Creates the state copy of the library state from the shared library template
+
+        Like after a normal initialization, the state copy uses the outcomes and data ports of the library state.
+        """
+        state_copy = deepcopy(self._get_library_template())
+        state_copy._parent = ref(self)
+        state_copy._outcomes = self._outcomes
+        state_copy._input_data_ports = self._input_data_ports
+        state_copy._output_data_ports = self._output_data_ports
+        state_copy.invalidate_path()
+        return state_copy
+
+    def _get_library_template(self):
+        if self._library_template is None and self._lazy_library_loading:
+            _, self._library_template = library_manager.get_library_template(self.lib_os_path)
+        return self._library_template
+
     def _handle_runtime_values(self, input_data_port_runtime_values, use_runtime_value_input_data_ports,
                                output_data_port_runtime_values, use_runtime_value_output_data_ports):
         # handle input runtime values
@@ -212,7 +275,7 @@ class LibraryState(State):
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
-        return str(self) == str(other) and self._state_copy == other.state_copy
+        return str(self) == str(other) and self.library_root_state == other.library_root_state
 
     def __copy__(self):
         income = self._income
@@ -224,7 +287,7 @@ class LibraryState(State):
                                copy(self.output_data_port_runtime_values), copy(self.use_runtime_value_output_data_ports),
                                False, safe_init=False, skip_runtime_data_initialization=True)
 
-        state._semantic_data = deepcopy(self.semantic_data)
+        state._set_semantic_data(deepcopy(self.semantic_data))
         state._file_system_path = self.file_system_path
         return state
 
@@ -234,11 +297,13 @@ class LibraryState(State):
     def destroy(self, recursive=True):
         super(LibraryState, self).destroy(recursive)
         if recursive:
-            if self.state_copy:
-                self.state_copy.destroy(recursive)
-            else:
+            if self._state_copy:
+                self._state_copy.destroy(recursive)
+            elif self._library_template is None and not self._lazy_library_loading:
                 logger.verbose("Multiple calls of destroy {0}".format(self))
             self._state_copy = None
+            self._library_template = None
+            self._lazy_library_loading = False
 
     def run(self):
         """ This defines the sequence of actions that are taken when the library state is executed
@@ -407,9 +472,9 @@ class LibraryState(State):
                    input_data_port_runtime_values, use_runtime_value_input_data_ports,
                    output_data_port_runtime_values, use_runtime_value_output_data_ports, safe_init=False)
 
-    def update_hash(self, obj_hash):
-        super(LibraryState, self).update_hash(obj_hash)
-        self.state_copy.update_hash(obj_hash)
+    def update_hash_of_content(self, obj_hash):
+        super(LibraryState, self).update_hash_of_content(obj_hash)
+        self.library_root_state.update_hash(obj_hash)
 
     @staticmethod
     def state_to_dict(state):
@@ -427,26 +492,42 @@ class LibraryState(State):
         }
         return dict_representation
 
+    def invalidate_path(self):
+        """Resets the cached paths of the library state and of its state copy"""
+        super(LibraryState, self).invalidate_path()
+        if self._state_copy is not None:
+            self._state_copy.invalidate_path()
+
+    def _is_library_loaded(self):
+        # with LIBRARY_STATE_LAZY_LOADING, libraries that were not loaded yet are counted as a single state
+        return self._state_copy is not None or self._library_template is not None
+
     def get_states_statistics(self, hierarchy_level):
         """
         Returns the numer of child states. As per default states do not have child states return 1.
         :return:
         """
-        return self.state_copy.get_states_statistics(hierarchy_level)
+        if not self._is_library_loaded():
+            return super(LibraryState, self).get_states_statistics(hierarchy_level)
+        return self.library_root_state.get_states_statistics(hierarchy_level)
 
     def get_number_of_transitions(self):
         """
         Return the number of transitions for a state. Per default states do not have transitions.
         :return:
         """
-        return self.state_copy.get_number_of_transitions()
+        if not self._is_library_loaded():
+            return super(LibraryState, self).get_number_of_transitions()
+        return self.library_root_state.get_number_of_transitions()
 
     def get_number_of_data_flows(self):
         """
         Return the number of data flows for a state. Per default states do not have data flows.
         :return:
         """
-        return self.state_copy.get_number_of_data_flows()
+        if not self._is_library_loaded():
+            return super(LibraryState, self).get_number_of_data_flows()
+        return self.library_root_state.get_number_of_data_flows()
 
     #########################################################################
     # Properties for all class fields that must be observed by gtkmvc3
@@ -504,9 +585,30 @@ class LibraryState(State):
     def state_copy(self):
         """Property for the _state_copy field
 
+        If the library state uses a shared library template, the state copy is created on the first access.
         """
+        if self._state_copy is None and (self._library_template is not None or self._lazy_library_loading):
+            with self._state_copy_lock:
+                if self._state_copy is None:
+                    self._state_copy = self._copy_library_template()
         return self._state_copy
 
+    @property
+    def library_root_state(self):
+        """The root state of the library, as far as it is only read
+
+        This is the state copy, or the shared library template as long as the state copy was not created. The
+        returned state must not be changed.
+        """
+        if self._state_copy is not None:
+            return self._state_copy
+        return self._get_library_template()
+
+    @property
+    def state_copy_initialized(self):
+        """Whether the state copy exists, i.e. it is not created on the next access"""
+        return self._state_copy is not None
+
     @state_copy.setter
     @lock_state_machine
     @Observable.observed
@@ -51,21 +51,21 @@ class PreemptiveConcurrencyState(ConcurrencyState):
 
         try:
             concurrency_history_item = self.setup_forward_or_backward_execution()
-            concurrency_queue = self.start_child_states(concurrency_history_item)
+            scheduler = self.create_child_state_scheduler(concurrency_history_item)
+            finisher_state = None
 
             #######################################################
             # wait for the first threads to finish
             #######################################################
-            finished_thread_id = concurrency_queue.get()
-            finisher_state = self.states[finished_thread_id]
-            finisher_state.join()
-
-            # preempt all child states
-            if not self.backward_execution:
-                for state_id, state in self.states.items():
-                    state.recursively_preempt_states()
-            # join all states
-            for history_index, state in enumerate(self.states.values()):
+            for history_index, state in scheduler.finished_states():
+                if finisher_state is None:
+                    finisher_state = state
+                    finished_thread_id = state.state_id
+                    # preempt all child states
+                    if not self.backward_execution:
+                        scheduler.skip_pending_states()
+                        scheduler.preempt_running_states()
+                # join the states as they finish
                 self.join_state(state, history_index, concurrency_history_item)
                 self.add_state_execution_output_to_scoped_data(state.output_data, state)
                 self.update_scoped_variables_with_output_dictionary(state.output_data, state)
@@ -27,6 +27,7 @@ from future.utils import string_types
 import queue
 import copy
 import os
+import hashlib
 import threading
 from builtins import staticmethod
 from weakref import ref
@@ -44,6 +45,7 @@ from rafcon.core.state_elements.logical_port import Income, Outcome
 from rafcon.core.state_elements.scope import ScopedData
 from rafcon.core.storage import storage
 from rafcon.core.config import global_config
+from rafcon.core.execution.execution_pool import pooled_execution_enabled, get_execution_pool
 from rafcon.utils import classproperty
 from rafcon.utils import log
 from rafcon.utils import multi_event
@@ -75,6 +77,12 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
 
     _parent = None
     _state_element_attrs = ['income', 'outcomes', 'input_data_ports', 'output_data_ports']
+    # the cached digest of the hash of the state, including its child states, see get_hash_digest
+    _hash_digest = None
+    _hash_generation = 0
+    #: Names of observed methods, which only change the execution data of a state and thus not its hash
+    _hash_irrelevant_methods = frozenset(['parent', 'input_data', 'output_data', 'concurrency_queue', 'final_outcome',
+                                          'state_execution_status', 'scoped_data'])
 
     def __init__(self, name=None, state_id=None, input_data_ports=None, output_data_ports=None,
                  income=None, outcomes=None, parent=None, safe_init=True):
@@ -82,6 +90,9 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         Observable.__init__(self)
         self._state_id = None
         self._name = None
+        # the cached results of get_path for state ids and for names
+        self._path = None
+        self._path_by_name = None
         self._input_data_ports = {}
         self._output_data_ports = {}
         self._income = None
@@ -117,7 +128,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         self.thread = None
         self._run_id = None
 
-        self._semantic_data = Vividict()
+        self._set_semantic_data(Vividict())
 
         if state_id is None:
             self._state_id = state_id_generator()
@@ -225,9 +236,57 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         return self.state_to_dict(self)
 
     def update_hash(self, obj_hash):
+        obj_hash.update(self.get_hash_digest())
+        return obj_hash
+
+    def update_hash_of_content(self, obj_hash):
+        """Updates the hash with the data of the state
+
+        Derived classes extend this method with their data fields. Child states are to be added with their
+        :meth:`update_hash` method, so that their cached digests are used.
+
+        :param obj_hash: The hash object (see Python hashlib)
+        """
         Hashable.update_hash_from_dict(obj_hash, self.to_dict())
         Hashable.update_hash_from_dict(obj_hash, self.semantic_data)
-        return obj_hash
+
+    def get_hash_digest(self):
+        """Returns the digest of the hash of the state
+
+        The digest is cached until the state or one of its child states is modified. Thus, the hash of a state machine
+        is calculated from the hashes of its states like a Merkle tree and only the modified states and their ancestors
+        have to be hashed again.
+
+        :return: the SHA-256 digest of the state data
+        :rtype: bytes
+        """
+        hash_digest = self._hash_digest
+        if hash_digest is None:
+            hash_generation = self._hash_generation
+            obj_hash = hashlib.sha256()
+            self.update_hash_of_content(obj_hash)
+            hash_digest = obj_hash.digest()
+            # the state might have been modified while it was hashed
+            if hash_generation == self._hash_generation:
+                self._hash_digest = hash_digest
+        return hash_digest
+
+    def invalidate_hash(self):
+        """Resets the cached hash digests of the state and its ancestors
+
+        Is called automatically for all observed modifications of the state, its state elements, its script and its
+        semantic data. Other mutable values that are changed in place require an explicit call.
+        """
+        state = self
+        while isinstance(state, State):
+            state._hash_generation += 1
+            state._hash_digest = None
+            state = state.parent
+
+    def _notify_method_after(self, instance, name, res_val, args, kwargs):
+        if name not in self._hash_irrelevant_methods:
+            self.invalidate_hash()
+        super(State, self)._notify_method_after(instance, name, res_val, args, kwargs)
 
     @classmethod
     def from_dict(cls, dictionary):
@@ -281,14 +340,35 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
     def start(self, execution_history, backward_execution=False, generate_run_id=True):
         """ Starts the execution of the state in a new thread.
 
+        In the pooled execution mode (see EXECUTION_MODE in the config), the state is executed by a reusable worker
+        thread of the execution pool instead.
+
         :return:
         """
+        self._prepare_start(execution_history, backward_execution, generate_run_id)
+        if pooled_execution_enabled():
+            self.thread = get_execution_pool().submit(self.run)
+        else:
+            self.thread = threading.Thread(target=self.run)
+            self.thread.start()
+
+    def run_inline(self, execution_history, backward_execution=False, generate_run_id=True):
+        """ Executes the state in the calling thread
+
+        This is equivalent to calling :meth:`start` directly followed by :meth:`join`, without handing over the
+        execution to another thread.
+
+        :return:
+        """
+        self._prepare_start(execution_history, backward_execution, generate_run_id)
+        self.thread = None
+        self.run()
+
+    def _prepare_start(self, execution_history, backward_execution, generate_run_id):
         self.execution_history = execution_history
         if generate_run_id:
             self._run_id = run_id_generator()
         self.backward_execution = copy.copy(backward_execution)
-        self.thread = threading.Thread(target=self.run)
-        self.thread.start()
 
     def generate_run_id(self):
         self._run_id = run_id_generator()
@@ -566,26 +646,38 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         concatenates either State.state_id (always unique) or State.name (maybe not unique but human readable) as
         state identifier for the path.
 
+        The path is cached and only recreated, after the parent, the state id or the name of the state or of one of
+        its ancestors changed (see :meth:`invalidate_path`).
+
         :param str appendix: the part of the path that was already calculated by previous function calls
         :param bool by_name: The boolean enables name usage to generate the path
         :rtype: str
         :return: the full path to the root state
         """
-        if by_name:
-            state_identifier = self.name
-        else:
-            state_identifier = self.state_id
-
-        if not self.is_root_state:
-            if appendix is None:
-                return self.parent.get_path(state_identifier, by_name)
+        path = self._path_by_name if by_name else self._path
+        if path is None:
+            state_identifier = self.name if by_name else self.state_id
+            if self.is_root_state:
+                path = state_identifier
             else:
-                return self.parent.get_path(state_identifier + PATH_SEPARATOR + appendix, by_name)
-        else:
-            if appendix is None:
-                return state_identifier
+                path = self.parent.get_path(by_name=by_name) + PATH_SEPARATOR + state_identifier
+            if by_name:
+                self._path_by_name = path
             else:
-                return state_identifier + PATH_SEPARATOR + appendix
+                self._path = path
+
+        if appendix is None:
+            return path
+        return path + PATH_SEPARATOR + appendix
+
+    def invalidate_path(self):
+        """Resets the cached paths of the state
+
+        Must be called whenever the parent, the state id or the name of the state changes. The paths of child states
+        are reset as well.
+        """
+        self._path = None
+        self._path_by_name = None
 
     def get_storage_path(self, appendix=None):
         """ Recursively create the storage path of the state.
@@ -925,6 +1017,8 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 state_id = state_id_generator(used_state_ids=used_ids)
 
         self._state_id = state_id
+        self.invalidate_path()
+        self.invalidate_hash()
 
     def get_states_statistics(self, hierarchy_level):
         """Get states statistic tuple
@@ -1048,6 +1142,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 raise ValueError("Name must have at least one character")
 
         self._name = name
+        self.invalidate_path()
 
     @property
     def parent(self):
@@ -1073,6 +1168,7 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
                 raise TypeError("parent must be of type State or StateMachine or None")
 
             self._parent = ref(parent)
+        self.invalidate_path()
 
     @property
     def input_data_ports(self):
@@ -1277,7 +1373,6 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         return self._input_data
 
     @input_data.setter
-    @lock_state_machine
     #@Observable.observed
     def input_data(self, input_data):
         if not isinstance(input_data, dict):
@@ -1292,7 +1387,6 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         return self._output_data
 
     @output_data.setter
-    @lock_state_machine
     #@Observable.observed
     def output_data(self, output_data):
         if not isinstance(output_data, dict):
@@ -1306,7 +1400,6 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         return self._preempted.is_set()
 
     @preempted.setter
-    @lock_state_machine
     def preempted(self, preempted):
         if not isinstance(preempted, bool):
             raise TypeError("preempted must be of type bool")
@@ -1322,7 +1415,6 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         return self._started.is_set()
 
     @started.setter
-    @lock_state_machine
     def started(self, started):
         if not isinstance(started, bool):
             raise TypeError("started must be of type bool")
@@ -1338,7 +1430,6 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         return self._paused.is_set()
 
     @paused.setter
-    @lock_state_machine
     def paused(self, paused):
         if not isinstance(paused, bool):
             raise TypeError("paused must be of type bool")
@@ -1373,7 +1464,6 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         return self._concurrency_queue
 
     @concurrency_queue.setter
-    @lock_state_machine
     #@Observable.observed
     def concurrency_queue(self, concurrency_queue):
         if not isinstance(concurrency_queue, queue.Queue):
@@ -1392,7 +1482,6 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         return self._final_outcome
 
     @final_outcome.setter
-    @lock_state_machine
     #@Observable.observed
     def final_outcome(self, final_outcome):
         if not isinstance(final_outcome, Outcome):
@@ -1437,13 +1526,22 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         return self._state_execution_status
 
     @state_execution_status.setter
-    @lock_state_machine
-    @Observable.observed
     def state_execution_status(self, state_execution_status):
+        """Setter for the _state_execution_status field
+
+        Like all execution data, the execution status is set without acquiring the modification lock of the state
+        machine, as it does not change the structure of the state machine. Observers are only notified, if the status
+        changes.
+        """
         if not isinstance(state_execution_status, StateExecutionStatus):
             raise TypeError("state_execution_status must be of type StateExecutionStatus")
+        if state_execution_status is self._state_execution_status:
+            return
 
+        args = (self, state_execution_status)
+        self._notify_method_before(self, "state_execution_status", args, {})
         self._state_execution_status = state_execution_status
+        self._notify_method_after(self, "state_execution_status", None, args, {})
 
     @property
     def is_root_state(self):
@@ -1554,9 +1652,14 @@ class State(Observable, YAMLObject, JSONObject, Hashable):
         if not isinstance(semantic_data, dict):
             raise TypeError("semantic_data must be of type Vividict or dict")
         if isinstance(semantic_data, dict):
-            self._semantic_data = Vividict(semantic_data)
+            self._set_semantic_data(Vividict(semantic_data))
         else:
-            self._semantic_data = semantic_data
+            self._set_semantic_data(semantic_data)
+
+    def _set_semantic_data(self, semantic_data):
+        # semantic data is usually modified in place, which has to reset the cached hash
+        self._semantic_data = semantic_data
+        semantic_data.set_change_callback(self.invalidate_hash)
 
 
 StateType = Enum('STATE_TYPE', 'EXECUTION HIERARCHY BARRIER_CONCURRENCY PREEMPTION_CONCURRENCY LIBRARY DECIDER_STATE')
@@ -0,0 +1,125 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: library_cache
+   :synopsis: A module storing the files of library state machines in a single file, for a faster loading
+
+"""
+import os
+import pickle
+import hashlib
+
+import rafcon
+from rafcon.core.config import global_config
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+# increase, whenever the content of the cache files changes
+LIBRARY_CACHE_FORMAT_VERSION = 1
+
+
+def get_library_cache_path():
+    """Returns the directory of the library cache
+
+    :return: the expanded LIBRARY_CACHE_PATH of the config, an empty string if the cache is disabled
+    :rtype: str
+    """
+    cache_path = global_config.get_config_value("LIBRARY_CACHE_PATH", "")
+    return os.path.expanduser(cache_path) if cache_path else ""
+
+
+def _get_cache_file(cache_path, library_os_path):
+    # the cached state files are indexed by the paths derived from the library path, thus the path is not normalized:
+    # a library loaded through a differently spelled path has an entry of its own
+    key = hashlib.sha256(library_os_path.encode('utf-8')).hexdigest()
+    return os.path.join(cache_path, key + ".library")
+
+
+def _get_file_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+def _get_file_stats(library_os_path, state_files):
+    """Collects the modification times and sizes of all folders and files of a library
+
+    The folders are included, so that added or removed states and files change the stats as well.
+    """
+    paths = [library_os_path, state_files['state_machine_file_path']]
+    for state_path, files in state_files['states'].items():
+        paths.append(state_path)
+        paths.append(files['core_data_path'])
+        for key in ('semantic_data', 'script'):
+            if files[key] is not None:
+                paths.append(files[key + '_path'])
+    return dict((path, _get_file_stat(path)) for path in paths)
+
+
+def load_cached_library(library_os_path):
+    """Reads the files of a library stored by :func:`store_library_in_cache`
+
+    The cache entry is only used, if none of the folders and files of the library changed since it was stored.
+
+    :param str library_os_path: the path of the library state machine
+    :return: the content of the state machine file and the state files in the format of
+        :func:`rafcon.core.storage.storage.read_state_files`, or None if there is no valid cache entry
+    """
+    cache_path = get_library_cache_path()
+    if not cache_path:
+        return None
+    cache_file = _get_cache_file(cache_path, library_os_path)
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, 'rb') as f:
+            cache_entry = pickle.load(f)
+        if cache_entry['format_version'] != LIBRARY_CACHE_FORMAT_VERSION or \
+                cache_entry['rafcon_version'] != rafcon.__version__:
+            return None
+        for path, stat in cache_entry['file_stats'].items():
+            if _get_file_stat(path) != stat:
+                logger.debug("Library {0} changed since it was cached".format(library_os_path))
+                return None
+        return cache_entry['state_machine'], cache_entry['states']
+    except Exception as e:
+        logger.debug("Could not load cached library from {0}: {1}".format(cache_file, e))
+        return None
+
+
+def store_library_in_cache(library_os_path, state_machine_file_content, state_files):
+    """Stores the content of all files of a library in a single file in the cache directory
+
+    :param str library_os_path: the path of the library state machine
+    :param str state_machine_file_content: the content of the state machine file
+    :param dict state_files: the path of the state machine file and the files of all states, see
+        :func:`rafcon.core.storage.storage.read_state_files`
+    """
+    cache_path = get_library_cache_path()
+    if not cache_path:
+        return
+    cache_file = _get_cache_file(cache_path, library_os_path)
+    tmp_file = "{0}.{1}.tmp".format(cache_file, os.getpid())
+    try:
+        cache_entry = {
+            'format_version': LIBRARY_CACHE_FORMAT_VERSION,
+            'rafcon_version': rafcon.__version__,
+            'file_stats': _get_file_stats(library_os_path, state_files),
+            'state_machine': state_machine_file_content,
+            'states': state_files['states']
+        }
+        if not os.path.isdir(cache_path):
+            os.makedirs(cache_path)
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(cache_entry, f, protocol=2)
+        os.rename(tmp_file, cache_file)
+    except Exception as e:
+        logger.debug("Could not store library {0} in cache {1}: {2}".format(library_os_path, cache_file, e))
@@ -19,7 +19,9 @@
 from weakref import ref
 from future.utils import string_types
 from builtins import str
+import io
 import os
+import atexit
 import re
 import math
 import shutil
@@ -27,11 +29,15 @@ import glob
 import copy
 import yaml
 import warnings
+import tempfile
+import zipfile
+import threading
 from distutils.version import StrictVersion
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import rafcon
 
-from rafcon.utils.filesystem import read_file, write_file
+from rafcon.utils.filesystem import read_file
 from rafcon.utils import storage_utils
 from rafcon.utils import log
 from rafcon.utils.timer import measure_time
@@ -40,6 +46,7 @@ from rafcon.core.custom_exceptions import LibraryNotFoundException
 from rafcon.core.constants import DEFAULT_SCRIPT_PATH
 from rafcon.core.config import global_config
 from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import library_cache
 
 logger = log.get_logger(__name__)
 
@@ -54,11 +61,17 @@ SCRIPT_FILE = 'script.py'
 SEMANTIC_DATA_FILE = 'semantic_data.json'
 STATEMACHINE_FILE = 'statemachine.json'
 STATEMACHINE_FILE_OLD = 'statemachine.yaml'
+#: File extension of state machines packed into a single archive
+PACKED_STATE_MACHINE_EXTENSION = '.rafcon'
 ID_NAME_DELIMITER = "_"
 
 REPLACED_CHARACTERS_FOR_NO_OS_LIMITATION = {'/': '', r'\0': '', '<': '', '>': '', ':': '_',
                                             '\\': '', '|': '_', '?': '', '*': '_'}
 
+# the working folders of packed state machines, indexed by the absolute path of the archive, see get_unpacked_path
+_unpacked_paths = {}
+_unpacked_paths_lock = threading.Lock()
+
 # clean the DEFAULT_SCRIPT_PATH folder at each program start
 if os.path.exists(DEFAULT_SCRIPT_PATH):
     files = glob.glob(os.path.join(DEFAULT_SCRIPT_PATH, "*"))
@@ -146,6 +159,12 @@ def clean_path(base_path):
     return base_path
 
 
+def _update_json_backend():
+    """Selects the json backend used to read and write the state machine files according to the config"""
+    storage_utils.json_backend = global_config.get_config_value("STORAGE_JSON_BACKEND",
+                                                                storage_utils.JSON_BACKEND_JSONCONVERSION)
+
+
 def save_state_machine_to_path(state_machine, base_path, delete_old_state_machine=False, as_copy=False):
     """Saves a state machine recursively to the file system
 
@@ -157,6 +176,11 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
     :param bool delete_old_state_machine: Whether to delete any state machine existing at the given path
     :param bool as_copy: Whether to use a copy storage for the state machine
     """
+    _update_json_backend()
+    if is_packed_state_machine_path(base_path):
+        save_state_machine_to_packed_file(state_machine, base_path, delete_old_state_machine, as_copy)
+        return
+
     # warns the user in the logger when using deprecated names
     clean_path_from_deprecated_naming(base_path)
 
@@ -176,7 +200,8 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
         old_update_time = state_machine.last_update
         state_machine.last_update = storage_utils.get_current_time_string()
         state_machine_dict = state_machine.to_dict()
-        storage_utils.write_dict_to_json(state_machine_dict, os.path.join(base_path, STATEMACHINE_FILE))
+        write_file_if_changed(os.path.join(base_path, STATEMACHINE_FILE),
+                              storage_utils.dict_to_json_string(state_machine_dict))
 
         # set the file_system_path of the state machine
         if not as_copy:
@@ -197,6 +222,201 @@ def save_state_machine_to_path(state_machine, base_path, delete_old_state_machin
         state_machine.release_modification_lock()
 
 
+def is_packed_state_machine_path(path):
+    """Checks whether the path refers to a state machine packed into a single archive
+
+    In contrast to :func:`is_packed_state_machine`, the archive does not need to exist yet.
+
+    :param str path: the path to be checked
+    :rtype: bool
+    """
+    return path is not None and path.endswith(PACKED_STATE_MACHINE_EXTENSION)
+
+
+def get_unpacked_path(path):
+    """Returns the folder holding the files of the state machine at the given path
+
+    Packed state machines are unpacked to a working folder, which exists until RAFCON exits. Their states get paths
+    within this folder, so that their files, e.g. scripts and meta data, can be accessed like those of state machines
+    saved as folder. For all other state machines, the path itself is returned.
+
+    :param str path: the path of the state machine
+    :return: the working folder of a packed state machine, else the path
+    :rtype: str
+    """
+    if not is_packed_state_machine_path(path):
+        return path
+    file_path = os.path.abspath(path)
+    with _unpacked_paths_lock:
+        unpacked_path = _unpacked_paths.get(file_path)
+        if unpacked_path is None or not os.path.isdir(unpacked_path):
+            unpacked_path = tempfile.mkdtemp(prefix="rafcon_unpacked_")
+            _unpacked_paths[file_path] = unpacked_path
+        return unpacked_path
+
+
+def _remove_unpacked_files(unpacked_path):
+    shutil.rmtree(unpacked_path, ignore_errors=True)
+
+
+@atexit.register
+def _remove_unpacked_paths():
+    with _unpacked_paths_lock:
+        unpacked_paths = list(_unpacked_paths.values())
+        _unpacked_paths.clear()
+    for unpacked_path in unpacked_paths:
+        _remove_unpacked_files(unpacked_path)
+
+
+def save_state_machine_to_packed_file(state_machine, file_path, delete_old_state_machine=False, as_copy=False):
+    """Saves a state machine to a single archive file
+
+    The archive is a zip file containing the same files as the folder created by
+    :func:`save_state_machine_to_path`. The state machine is saved to the working folder of the archive (see
+    :func:`get_unpacked_path`) first, which is then packed by :func:`pack_state_machine`. Meta data stored in the
+    working folder, e.g. by the GUI, is packed as well.
+
+    :param rafcon.core.state_machine.StateMachine state_machine: the state_machine to be saved
+    :param str file_path: the path of the archive, should end with PACKED_STATE_MACHINE_EXTENSION
+    :param bool delete_old_state_machine: Whether to delete the files of the state machine existing at the given path
+    :param bool as_copy: Whether to use a copy storage for the state machine
+    """
+    state_machine.acquire_modification_lock()
+    try:
+        save_state_machine_to_path(state_machine, get_unpacked_path(file_path), delete_old_state_machine, as_copy)
+        pack_state_machine(file_path)
+        if not as_copy:
+            state_machine.file_system_path = copy.copy(file_path)
+        logger.debug("State machine with id {0} was saved at {1}".format(state_machine.state_machine_id, file_path))
+    finally:
+        state_machine.release_modification_lock()
+
+
+def pack_state_machine(file_path):
+    """Packs the working folder of a packed state machine into its archive
+
+    The archive is written to a temporary file first, which then replaces the target file, so that the target is
+    written with one sequential write and is never left half written.
+
+    :param str file_path: the path of the archive, should end with PACKED_STATE_MACHINE_EXTENSION
+    """
+    unpacked_path = get_unpacked_path(file_path)
+    file_path_dir = os.path.dirname(os.path.abspath(file_path))
+    if not os.path.exists(file_path_dir):
+        os.makedirs(file_path_dir)
+    temp_file_path = file_path + '.tmp'
+    try:
+        with zipfile.ZipFile(temp_file_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for dir_path, dir_names, file_names in os.walk(unpacked_path):
+                dir_names.sort()
+                for file_name in sorted(file_names):
+                    full_file_path = os.path.join(dir_path, file_name)
+                    archive.write(full_file_path, os.path.relpath(full_file_path, unpacked_path))
+        os.rename(temp_file_path, file_path)
+    except Exception:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        raise
+
+
+def is_packed_state_machine(path):
+    """Checks whether the path points to a state machine packed into a single archive
+
+    :param str path: the path to be checked
+    :rtype: bool
+    """
+    return os.path.isfile(path) and zipfile.is_zipfile(path)
+
+
+def read_packed_state_machine(file_path, unpacked_path=None):
+    """Reads all files of a state machine packed into a single archive
+
+    :param str file_path: the path of the archive
+    :param str unpacked_path: if given, the archive is also unpacked to this folder, replacing its previous content
+    :return: the content of the state machine file and the files of all states, in the format of
+        :func:`read_state_files`. The states are indexed by their path within the unpacked folder, e.g.
+        `<unpacked_path>/<root state>/<child state>`, or within the archive, if no unpacked folder is given.
+    :rtype: tuple(str, dict)
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        contents = dict((name, archive.read(name)) for name in archive.namelist())
+    if STATEMACHINE_FILE not in contents:
+        raise ValueError("Provided archive doesn't contain a valid state machine: {0}".format(file_path))
+
+    if unpacked_path is not None:
+        _remove_unpacked_files(unpacked_path)
+        for name, content in contents.items():
+            member_path = os.path.normpath(os.path.join(unpacked_path, *name.split('/')))
+            if not member_path.startswith(os.path.join(unpacked_path, '')):
+                raise ValueError("Provided archive contains a file outside of the state machine: {0}".format(name))
+            if not os.path.isdir(os.path.dirname(member_path)):
+                os.makedirs(os.path.dirname(member_path))
+            with open(member_path, 'wb') as file_pointer:
+                file_pointer.write(content)
+    contents = dict((name, content.decode('utf-8')) for name, content in contents.items())
+
+    base_path = file_path if unpacked_path is None else unpacked_path
+    state_files = {}
+    for name in sorted(contents):
+        state_dir, file_name = os.path.split(name)
+        if file_name != FILE_NAME_CORE_DATA:
+            continue
+        state_path = os.path.join(base_path, *state_dir.split('/'))
+        state_files[state_path] = {
+            'core_data_path': os.path.join(state_path, FILE_NAME_CORE_DATA),
+            'core_data': contents[name],
+            'semantic_data_path': os.path.join(state_path, SEMANTIC_DATA_FILE),
+            'semantic_data': contents.get(state_dir + '/' + SEMANTIC_DATA_FILE),
+            'script_path': os.path.join(state_path, SCRIPT_FILE),
+            'script': contents.get(state_dir + '/' + SCRIPT_FILE),
+            'child_state_paths': []
+        }
+    for state_path in sorted(state_files):
+        parent_state_path = os.path.dirname(state_path)
+        if parent_state_path in state_files:
+            state_files[parent_state_path]['child_state_paths'].append(state_path)
+    return contents[STATEMACHINE_FILE], state_files
+
+
+def write_file_if_changed(file_path, content):
+    """Writes a file, unless it already contains the given content
+
+    The file is skipped, if its current content equals the given content, e.g. if the state was not changed since the
+    state machine was loaded or saved. The content of the file is read each time, so that files modified by others
+    are always written again, even if their size and modification time did not change. Otherwise, the content is
+    written to a temporary file, which then replaces the file. Thus, the file is never left half written, e.g. if
+    RAFCON crashes while saving. The skipping can be disabled with STORAGE_INCREMENTAL_SAVE.
+
+    :param str file_path: the path of the file
+    :param str content: the content of the file
+    :return: whether the file was written
+    :rtype: bool
+    """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8')
+    if global_config.get_config_value("STORAGE_INCREMENTAL_SAVE", True):
+        # reading the file is cheaper than replacing it
+        try:
+            with io.open(file_path, encoding='utf-8') as file_pointer:
+                if file_pointer.read() == content:
+                    return False
+        except (IOError, OSError, UnicodeDecodeError):
+            pass
+    temp_file_path = "{0}.{1}.tmp".format(file_path, os.getpid())
+    try:
+        with io.open(temp_file_path, 'w', encoding='utf-8') as file_pointer:
+            file_pointer.write(content)
+        if os.path.exists(file_path):
+            # keep the permissions of the replaced file
+            shutil.copymode(file_path, temp_file_path)
+        os.rename(temp_file_path, file_path)
+    except Exception:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        raise
+    return True
+
+
 def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=False):
     """Saves the script file for a state to the directory of the state.
 
@@ -212,7 +432,7 @@ def save_script_file_for_state_and_source_path(state, state_path_full, as_copy=F
         destination_script_file = os.path.join(state_path_full, SCRIPT_FILE)
 
         try:
-            write_file(destination_script_file, state.script_text)
+            write_file_if_changed(destination_script_file, state.script_text)
         except Exception:
             logger.exception("Storing of script file failed: {0} -> {1}".format(state.get_path(),
                                                                                 destination_script_file))
@@ -234,8 +454,8 @@ def save_semantic_data_for_state(state, state_path_full):
 
     if state.semantic_data:
         try:
-            storage_utils.write_dict_to_json(state.semantic_data, destination_script_file)
-        except IOError:
+            write_file_if_changed(destination_script_file, storage_utils.dict_to_json_string(state.semantic_data))
+        except (IOError, OSError):
             logger.exception("Storing of semantic data for state {0} failed! Destination path: {1}".
                              format(state.get_path(), destination_script_file))
             raise
@@ -260,7 +480,8 @@ def save_state_recursively(state, base_path, parent_path, as_copy=False):
     if not os.path.exists(state_path_full):
         os.makedirs(state_path_full)
 
-    storage_utils.write_dict_to_json(state, os.path.join(state_path_full, FILE_NAME_CORE_DATA))
+    write_file_if_changed(os.path.join(state_path_full, FILE_NAME_CORE_DATA),
+                          storage_utils.dict_to_json_string(state))
     if not as_copy:
         state.file_system_path = state_path_full
 
@@ -277,31 +498,48 @@ def save_state_recursively(state, base_path, parent_path, as_copy=False):
 
 
 @measure_time
-def load_state_machine_from_path(base_path, state_machine_id=None):
+def load_state_machine_from_path(base_path, state_machine_id=None, use_library_cache=False):
     """Loads a state machine from the given path
 
     :param base_path: An optional base path for the state machine.
+    :param bool use_library_cache: Whether to use the persistent library cache (see LIBRARY_CACHE_PATH)
     :return: a tuple of the loaded container state, the version of the state and the creation time
     :raises ValueError: if the provided path does not contain a valid state machine
     """
     logger.debug("Loading state machine from path {0}...".format(base_path))
+    _update_json_backend()
+
+    state_files = None
+    states_base_path = base_path
+    use_library_cache = use_library_cache and bool(library_cache.get_library_cache_path()) and \
+        not is_packed_state_machine(base_path)
+    cached_library = library_cache.load_cached_library(base_path) if use_library_cache else None
+    if cached_library is not None:
+        logger.debug("Using cached library {0}".format(base_path))
+        state_machine_dict = storage_utils.load_objects_from_json_string(cached_library[0])
+        state_files = cached_library[1]
+    elif is_packed_state_machine(base_path):
+        # the states get paths within the working folder the archive is unpacked to
+        states_base_path = get_unpacked_path(base_path)
+        state_machine_file_content, state_files = read_packed_state_machine(base_path, states_base_path)
+        state_machine_dict = storage_utils.load_objects_from_json_string(state_machine_file_content)
+    else:
+        state_machine_file_path = os.path.join(base_path, STATEMACHINE_FILE)
+        state_machine_file_path_old = os.path.join(base_path, STATEMACHINE_FILE_OLD)
 
-    state_machine_file_path = os.path.join(base_path, STATEMACHINE_FILE)
-    state_machine_file_path_old = os.path.join(base_path, STATEMACHINE_FILE_OLD)
-
-    # was the root state specified as state machine base_path to load from?
-    if not os.path.exists(state_machine_file_path) and not os.path.exists(state_machine_file_path_old):
+        # was the root state specified as state machine base_path to load from?
+        if not os.path.exists(state_machine_file_path) and not os.path.exists(state_machine_file_path_old):
 
-        # catch the case that a state machine root file is handed
-        if os.path.exists(base_path) and os.path.isfile(base_path):
-            base_path = os.path.dirname(base_path)
-            state_machine_file_path = os.path.join(base_path, STATEMACHINE_FILE)
-            state_machine_file_path_old = os.path.join(base_path, STATEMACHINE_FILE_OLD)
+            # catch the case that a state machine root file is handed
+            if os.path.exists(base_path) and os.path.isfile(base_path):
+                base_path = states_base_path = os.path.dirname(base_path)
+                state_machine_file_path = os.path.join(base_path, STATEMACHINE_FILE)
+                state_machine_file_path_old = os.path.join(base_path, STATEMACHINE_FILE_OLD)
 
-        if not os.path.exists(state_machine_file_path) and not os.path.exists(state_machine_file_path_old):
-            raise ValueError("Provided path doesn't contain a valid state machine: {0}".format(base_path))
+            if not os.path.exists(state_machine_file_path) and not os.path.exists(state_machine_file_path_old):
+                raise ValueError("Provided path doesn't contain a valid state machine: {0}".format(base_path))
 
-    state_machine_dict = storage_utils.load_objects_from_json(state_machine_file_path)
+        state_machine_dict = storage_utils.load_objects_from_json(state_machine_file_path)
     if 'used_rafcon_version' in state_machine_dict:
         previously_used_rafcon_version = StrictVersion(state_machine_dict['used_rafcon_version']).version
         active_rafcon_version = StrictVersion(rafcon.__version__).version
@@ -345,11 +583,20 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
     else:
         root_state_storage_id = state_machine_dict['root_state_storage_id']
 
-    root_state_path = os.path.join(base_path, root_state_storage_id)
+    root_state_path = os.path.join(states_base_path, root_state_storage_id)
     state_machine.file_system_path = base_path
     dirty_states = []
+    number_of_threads = global_config.get_config_value("STATE_MACHINE_LOADER_THREADS", 8)
+    if cached_library is None and use_library_cache:
+        # the library is stored in the cache, thus all files have to be read anyway
+        state_files = read_state_files(root_state_path, max(number_of_threads, 1))
+        library_cache.store_library_in_cache(
+            base_path, read_file(state_machine_file_path),
+            {'state_machine_file_path': state_machine_file_path, 'states': state_files})
+    elif state_files is None and number_of_threads > 1:
+        state_files = read_state_files(root_state_path, number_of_threads)
     state_machine.root_state = load_state_recursively(parent=state_machine, state_path=root_state_path,
-                                                      dirty_states=dirty_states)
+                                                      dirty_states=dirty_states, state_files=state_files)
     if state_machine.root_state is None:
         return  # a corresponding exception has been handled with a proper error log in load_state_recursively
     if len(dirty_states) > 0:
@@ -369,16 +616,119 @@ def load_state_machine_from_path(base_path, state_machine_id=None):
     return state_machine
 
 
+def load_state_machine_interface(base_path, use_library_cache=False):
+    """Loads the root state of a state machine without its child states
+
+    Only the state machine file and the core data file of the root state are read. The returned root state provides
+    the interface of the state machine, e.g. the outcomes and data ports of a library.
+
+    :param base_path: the path of the state machine
+    :param bool use_library_cache: Whether to use the persistent library cache (see LIBRARY_CACHE_PATH)
+    :return: the version of the state machine and its root state without child states
+    :raises ValueError: if the provided path does not contain a valid state machine
+    """
+    _update_json_backend()
+    state_files = None
+    cached_library = None
+    if use_library_cache and library_cache.get_library_cache_path() and not is_packed_state_machine(base_path):
+        cached_library = library_cache.load_cached_library(base_path)
+    if cached_library is not None:
+        state_machine_file_content, state_files = cached_library
+    elif is_packed_state_machine(base_path):
+        state_machine_file_content, state_files = read_packed_state_machine(base_path)
+    else:
+        state_machine_file_content = _read_file_if_exists(os.path.join(base_path, STATEMACHINE_FILE))
+        if state_machine_file_content is None:
+            raise ValueError("Provided path doesn't contain a valid state machine: {0}".format(base_path))
+    state_machine_dict = storage_utils.load_objects_from_json_string(state_machine_file_content)
+    version = state_machine_dict['version'] if 'version' in state_machine_dict \
+        else state_machine_dict['state_machine_version']
+    root_state_storage_id = state_machine_dict['root_state_storage_id'] \
+        if 'root_state_storage_id' in state_machine_dict else state_machine_dict['root_state_id']
+
+    root_state_path = os.path.join(base_path, root_state_storage_id)
+    files = state_files[root_state_path] if state_files is not None else _read_state_files(root_state_path)
+    state_info = load_data_file_content(files['core_data'], files['core_data_path'])
+    root_state = state_info[0] if isinstance(state_info, tuple) else state_info
+    return version, root_state
+
+
 def load_state_from_path(state_path):
     """Loads a state from a given path
 
     :param state_path: The path of the state on the file system.
     :return: the loaded state
     """
+    _update_json_backend()
     return load_state_recursively(parent=None, state_path=state_path)
 
 
-def load_state_recursively(parent, state_path=None, dirty_states=[]):
+def _read_file_if_exists(file_path):
+    try:
+        with open(file_path, 'r') as file_pointer:
+            return file_pointer.read()
+    except (IOError, OSError):
+        return None
+
+
+def _read_state_files(state_path):
+    """Reads the files of a state without decoding them
+
+    :param str state_path: the path of the state on the file system
+    :return: a dict with the paths and the contents of the core data file, the semantic data file and the default
+        script file (None for missing files) and the paths of the child states
+    :rtype: dict
+    """
+    path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA)
+    # TODO: Should be removed with next minor release
+    if not os.path.exists(path_core_data):
+        path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA_OLD)
+
+    child_state_paths = []
+    for p in os.listdir(state_path) if os.path.isdir(state_path) else []:
+        child_state_path = os.path.join(state_path, p)
+        # folders not containing a valid state are skipped, e.g. __pycache__ folders created by pip
+        if os.path.isdir(child_state_path) and os.path.exists(os.path.join(child_state_path, FILE_NAME_CORE_DATA)):
+            child_state_paths.append(child_state_path)
+
+    path_semantic_data = os.path.join(state_path, SEMANTIC_DATA_FILE)
+    path_script = os.path.join(state_path, SCRIPT_FILE)
+    return {
+        'core_data_path': path_core_data,
+        'core_data': _read_file_if_exists(path_core_data),
+        'semantic_data_path': path_semantic_data,
+        'semantic_data': _read_file_if_exists(path_semantic_data),
+        'script_path': path_script,
+        'script': _read_file_if_exists(path_script),
+        'child_state_paths': child_state_paths
+    }
+
+
+def read_state_files(root_state_path, number_of_threads):
+    """Reads the files of a state and all its child states in parallel
+
+    The file system is traversed by a pool of threads, so that the latency of the file accesses overlaps. The files
+    are only read, the decoding and assembly of the states is done by :func:`load_state_recursively`.
+
+    :param str root_state_path: the path of the state on the file system
+    :param int number_of_threads: the number of threads reading the files
+    :return: the result of :func:`_read_state_files` for all states, indexed by the path of the state
+    :rtype: dict
+    """
+    state_files = {}
+    with ThreadPoolExecutor(max_workers=number_of_threads) as executor:
+        pending = {executor.submit(_read_state_files, root_state_path): root_state_path}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                state_path = pending.pop(future)
+                state_files[state_path] = files = future.result()
+                for child_state_path in files['child_state_paths']:
+                    pending[executor.submit(_read_state_files, child_state_path)] = child_state_path
+    return state_files
+
+
+def load_state_recursively(parent, state_path=None, dirty_states=[], state_files=None):
     """Recursively loads the state
 
     It calls this method on each sub-state of a container state.
@@ -386,29 +736,28 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
     :param parent:  the root state of the last load call to which the loaded state will be added
     :param state_path: the path on the filesystem where to find the meta file for the state
     :param dirty_states: a dict of states which changed during loading
+    :param dict state_files: the files of the state and its child states read in advance by :func:`read_state_files`.
+        If None, the files are read when needed.
     :return:
     """
     from rafcon.core.states.execution_state import ExecutionState
     from rafcon.core.states.container_state import ContainerState
     from rafcon.core.states.hierarchy_state import HierarchyState
 
-    path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA)
-
     logger.debug("Load state recursively: {0}".format(str(state_path)))
 
-    # TODO: Should be removed with next minor release
-    if not os.path.exists(path_core_data):
-        path_core_data = os.path.join(state_path, FILE_NAME_CORE_DATA_OLD)
+    files = state_files[state_path] if state_files is not None else _read_state_files(state_path)
+    path_core_data = files['core_data_path']
 
     try:
-        state_info = load_data_file(path_core_data)
+        state_info = load_data_file_content(files['core_data'], path_core_data)
     except ValueError as e:
         logger.exception("Error while loading state data: {0}".format(e))
         return
     except LibraryNotFoundException as e:
         logger.error("Library could not be loaded: {0}\n"
                      "Skipping library and continuing loading the state machine".format(e))
-        state_info = storage_utils.load_objects_from_json(path_core_data, as_dict=True)
+        state_info = storage_utils.load_objects_from_json_string(files['core_data'], as_dict=True)
         state_id = state_info["state_id"]
         dummy_state = HierarchyState(LIBRARY_NOT_FOUND_DUMMY_STATE_NAME, state_id=state_id)
         # set parent of dummy state
@@ -436,12 +785,15 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
 
     # read script file if state is an ExecutionState
     if isinstance(state, ExecutionState):
-        script_text = read_file(state_path, state.script.filename)
+        if state.script.filename == SCRIPT_FILE:
+            script_text = files['script']
+        else:
+            script_text = read_file(state_path, state.script.filename)
         state.script.set_script_without_compilation(script_text)
 
     # load semantic data
     try:
-        semantic_data = load_data_file(os.path.join(state_path, SEMANTIC_DATA_FILE))
+        semantic_data = load_data_file_content(files['semantic_data'], files['semantic_data_path'])
         state.semantic_data = semantic_data
     except Exception as e:
         # semantic data file does not have to be there
@@ -450,18 +802,12 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
     one_of_my_child_states_not_found = False
 
     # load child states
-    for p in os.listdir(state_path):
-        child_state_path = os.path.join(state_path, p)
-        if os.path.isdir(child_state_path):
-            if not os.path.exists(os.path.join(child_state_path, FILE_NAME_CORE_DATA)):
-                # this means that child_state_path is a folder, not containing a valid state
-                # this also happens when pip creates __pycache__ folders for the script.py files upon installing rafcon
-                continue
-            child_state = load_state_recursively(state, child_state_path, dirty_states)
-            if not child_state:
-                return None
-            if child_state.name is LIBRARY_NOT_FOUND_DUMMY_STATE_NAME:
-                one_of_my_child_states_not_found = True
+    for child_state_path in files['child_state_paths']:
+        child_state = load_state_recursively(state, child_state_path, dirty_states, state_files)
+        if not child_state:
+            return None
+        if child_state.name is LIBRARY_NOT_FOUND_DUMMY_STATE_NAME:
+            one_of_my_child_states_not_found = True
 
     if one_of_my_child_states_not_found:
         # omit adding transitions and data flows in this case
@@ -475,9 +821,11 @@ def load_state_recursively(parent, state_path=None, dirty_states=[]):
             state._transitions = transitions
             for _, transition in state.transitions.items():
                 transition._parent = ref(state)
+            state.invalidate_transition_index()
             state._data_flows = data_flows
             for _, data_flow in state.data_flows.items():
                 data_flow._parent = ref(state)
+            state.invalidate_data_flow_routing()
 
     state.file_system_path = state_path
 
@@ -499,6 +847,19 @@ def load_data_file(path_of_file):
     raise ValueError("Data file not found: {0}".format(path_of_file))
 
 
+def load_data_file_content(content, path_of_file):
+    """ Loads objects from the content of a file by using json.loads.
+
+    :param str content: the content of the file, None if the file does not exist
+    :param path_of_file: the path of the file, used for the error message
+    :return: the decoded file content
+    :raises exceptions.ValueError: if the file was not found
+    """
+    if content is not None:
+        return storage_utils.load_objects_from_json_string(content)
+    raise ValueError("Data file not found: {0}".format(path_of_file))
+
+
 def limit_text_max_length(text, max_length, separator='_'):
     """
     Limits the length of a string. The returned string will be the first `max_length/2` characters of the input string
@@ -518,14 +518,17 @@ class MenuBarController(ExtendedController):
             return False
 
     def on_delete_check_sm_running(self):
-        if not self.state_machine_execution_engine.finished_or_stopped():
+        running_contexts = [context for context in self.state_machine_execution_engine.get_execution_contexts()
+                            if not context.finished_or_stopped()]
+        if running_contexts:
             message_string = "The state machine is still running. Do you want to stop the execution before closing?"
             dialog = RAFCONButtonDialog(message_string, ["Stop execution", "Keep running"],
                                         message_type=Gtk.MessageType.QUESTION, parent=self.get_root_window())
             response_id = dialog.run()
             dialog.destroy()
             if response_id == 1:  # Stop execution
-                self.state_machine_execution_engine.stop()
+                for context in running_contexts:
+                    self.state_machine_execution_engine.stop(context.state_machine_id)
                 return False
             elif response_id == 2:  # Keep running
                 logger.debug("State machine will keep running!")
@@ -216,7 +216,10 @@ def save_state_machine(delete_old_state_machine=False, recent_opened_notificatio
                                        delete_old_state_machine=delete_old_state_machine, as_copy=as_copy)
     if recent_opened_notification:
         global_runtime_config.update_recently_opened_state_machines_with(state_machine_m.state_machine)
-    state_machine_m.store_meta_data(copy_path=copy_path if as_copy else None)
+    state_machine_m.store_meta_data(copy_path=storage.get_unpacked_path(copy_path) if as_copy else None)
+    if storage.is_packed_state_machine_path(copy_path if as_copy else sm_path):
+        # the meta data is stored after the core data, thus the state machine is packed again
+        storage.pack_state_machine(copy_path if as_copy else sm_path)
     logger.debug("Saved state machine and its meta data.")
     library_manager_model.state_machine_was_stored(state_machine_m, previous_path)
     return True
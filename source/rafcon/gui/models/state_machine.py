@@ -357,7 +357,7 @@ class StateMachineModel(MetaModel, Hashable):
         :param str path: Optional path to the meta data file. If not given, the path will be derived from the state
             machine's path on the filesystem
         """
-        meta_data_path = path if path is not None else self.state_machine.file_system_path
+        meta_data_path = path if path is not None else storage.get_unpacked_path(self.state_machine.file_system_path)
 
         if meta_data_path:
             path_meta_data = os.path.join(meta_data_path, storage.FILE_NAME_META_DATA)
@@ -391,7 +391,8 @@ class StateMachineModel(MetaModel, Hashable):
         if copy_path:
             meta_file_json = os.path.join(copy_path, storage.FILE_NAME_META_DATA)
         else:
-            meta_file_json = os.path.join(self.state_machine.file_system_path, storage.FILE_NAME_META_DATA)
+            meta_file_json = os.path.join(storage.get_unpacked_path(self.state_machine.file_system_path),
+                                          storage.FILE_NAME_META_DATA)
 
         storage_utils.write_dict_to_json(self.meta, meta_file_json)
 
@@ -41,6 +41,7 @@ from rafcon.core.state_machine import StateMachine
 from rafcon.core.states.hierarchy_state import HierarchyState
 import rafcon.core.singleton as core_singletons
 from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.execution.process_pool import shutdown_script_process_pool
 
 # utils
 from rafcon.gui.utils import wait_for_gui
@@ -407,6 +408,7 @@ def main():
         logger.info(_("State machine execution has finished"))
         core_singletons.state_machine_manager.delete_all_state_machines()
 
+    shutdown_script_process_pool()
     logger.info(_("Exiting ..."))
     logging.shutdown()
 
@@ -13,19 +13,200 @@
 from future.utils import string_types, native_str
 from builtins import range
 from builtins import str
+import os
 import shelve
 import json
 import pickle
+import struct
+import zlib
+from collections import Mapping
+from contextlib import contextmanager
 
 from rafcon.utils.vividict import Vividict
 from rafcon.utils import log
 logger = log.get_logger(__name__)
 
+# The binary execution log is an append-only sequence of records, each prefixed by its type, length and checksum.
+# When the log is closed, an index record (history_item_id -> offset of the record) and a trailer pointing to the
+# index are appended. If the trailer is missing (e.g. after a crash), the index is rebuilt by reading all complete
+# records.
+BINARY_LOG_MAGIC = b"RAFCONLOG\x01"
+BINARY_LOG_TRAILER_MAGIC = b"RAFCONIDX"
+_RECORD_HEADER = struct.Struct(">BII")  # record type, payload length, crc32 of payload
+_TRAILER = struct.Struct(">Q")  # offset of the index record
+_ITEM_RECORD = 1
+_INDEX_RECORD = 2
+
+
+class BinaryExecutionLogWriter(object):
+    """Writes history items to an append-only binary execution log
+
+    :ivar str filename: the path of the log file
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._index = {}
+        self._file = open(filename, 'wb')
+        self._file.write(BINARY_LOG_MAGIC)
+
+    def _write_record(self, record_type, data):
+        payload = pickle.dumps(data, protocol=2)
+        offset = self._file.tell()
+        self._file.write(_RECORD_HEADER.pack(record_type, len(payload), zlib.crc32(payload) & 0xffffffff))
+        self._file.write(payload)
+        return offset
+
+    def write_item(self, key, value):
+        """Appends a history item to the log
+
+        :param str key: the history_item_id of the item
+        :param dict value: the dictionary representation of the history item
+        """
+        self._index[key] = self._write_record(_ITEM_RECORD, (key, value))
+
+    def flush(self):
+        """Writes all appended records to the disk"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Appends the index and the trailer, writes them to the disk and closes the file"""
+        if self._file.closed:
+            return
+        index_offset = self._write_record(_INDEX_RECORD, self._index)
+        self._file.write(_TRAILER.pack(index_offset) + BINARY_LOG_TRAILER_MAGIC)
+        self.flush()
+        self._file.close()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+
+class BinaryExecutionLogReader(Mapping):
+    """Read-only, dictionary-like access to the history items of a binary execution log
+
+    The history items are read lazily from the file, using the history_item_id as key.
+
+    :ivar str filename: the path of the log file
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        if self._file.read(len(BINARY_LOG_MAGIC)) != BINARY_LOG_MAGIC:
+            self._file.close()
+            raise ValueError("{0} is no binary execution log".format(filename))
+        self._index = self._read_index()
+        if self._index is None:
+            self._index = self._rebuild_index()
+
+    def _read_record(self, offset):
+        """Reads the record at the given offset
+
+        :return: the type and the data of the record or None, if the record is incomplete or corrupt
+        """
+        self._file.seek(offset)
+        header = self._file.read(_RECORD_HEADER.size)
+        if len(header) < _RECORD_HEADER.size:
+            return None
+        record_type, length, crc = _RECORD_HEADER.unpack(header)
+        payload = self._file.read(length)
+        if len(payload) < length or zlib.crc32(payload) & 0xffffffff != crc:
+            return None
+        return record_type, pickle.loads(payload), offset + _RECORD_HEADER.size + length
+
+    def _read_index(self):
+        trailer_size = _TRAILER.size + len(BINARY_LOG_TRAILER_MAGIC)
+        self._file.seek(0, os.SEEK_END)
+        file_size = self._file.tell()
+        if file_size < len(BINARY_LOG_MAGIC) + trailer_size:
+            return None
+        self._file.seek(file_size - trailer_size)
+        trailer = self._file.read(trailer_size)
+        if trailer[_TRAILER.size:] != BINARY_LOG_TRAILER_MAGIC:
+            return None
+        record = self._read_record(_TRAILER.unpack(trailer[:_TRAILER.size])[0])
+        if record is None or record[0] != _INDEX_RECORD:
+            return None
+        return record[1]
+
+    def _rebuild_index(self):
+        """Reads all complete records of a log that was not closed properly"""
+        index = {}
+        offset = len(BINARY_LOG_MAGIC)
+        while True:
+            record = self._read_record(offset)
+            if record is None or record[0] != _ITEM_RECORD:
+                break
+            record_type, (key, _), next_offset = record
+            index[key] = offset
+            offset = next_offset
+        logger.info("Execution log {0} was not closed properly, read {1} history items".format(
+            self.filename, len(index)))
+        return index
+
+    def __getitem__(self, key):
+        record = self._read_record(self._index[key])
+        if record is None:
+            raise KeyError(key)
+        return record[1][1]
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        self._file.close()
+
+
+def is_binary_execution_log(filename):
+    """Checks whether a file is an execution log in the binary format
+
+    :param str filename: the path of the log file
+    :rtype: bool
+    """
+    with open(filename, 'rb') as f:
+        return f.read(len(BINARY_LOG_MAGIC)) == BINARY_LOG_MAGIC
+
+
+def open_execution_log(filename):
+    """Opens an execution log for reading, no matter whether it is a shelve or a binary execution log
+
+    :param str filename: the path of the log file
+    :return: a dictionary-like object mapping history_item_ids to history items
+    """
+    if os.path.isfile(filename) and is_binary_execution_log(filename):
+        return BinaryExecutionLogReader(filename)
+    return shelve.open(filename, 'r')
+
+
+@contextmanager
+def _opened_execution_log(execution_history_items):
+    """Opens the execution log if a filename is passed and closes it again afterwards
+
+    History items that are passed directly (e.g. an already opened log) are neither opened nor closed.
+    """
+    if not isinstance(execution_history_items, string_types):
+        yield execution_history_items
+        return
+    opened_execution_log = open_execution_log(execution_history_items)
+    try:
+        yield opened_execution_log
+    finally:
+        opened_execution_log.close()
+
 
 def log_to_raw_structure(execution_history_items):
     """
     :param dict execution_history_items: history items, in the simplest case
-           directly the opened shelve log file
+           directly the opened log file (see :func:`open_execution_log`) or its filename
     :return: start_item, the StateMachineStartItem of the log file
              previous, a dict mapping history_item_id --> history_item_id of previous history item
              next_, a dict mapping history_item_id --> history_item_id of the next history item (except if
@@ -35,6 +216,11 @@ def log_to_raw_structure(execution_history_items):
              grouped, a dict mapping run_id --> []list of history items with this run_id
     :rtype: tuple
     """
+    with _opened_execution_log(execution_history_items) as execution_history_items:
+        return _log_to_raw_structure(execution_history_items)
+
+
+def _log_to_raw_structure(execution_history_items):
     previous = {}
     next_ = {}
     concurrent = {}
@@ -85,7 +271,7 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
     The collapsed items hold input as well as output data (direct and scoped), and the outcome
     the state execution.
     :param dict execution_history_items: history items, in the simplest case
-           directly the opened shelve log file
+           directly the opened log file (see :func:`open_execution_log`) or its filename
     :param bool throw_on_pickle_error: flag if an error is thrown if an object cannot be un-pickled
     :param bool include_erroneous_data_ports: flag if to include erroneous data ports
     :param bool full_next: flag to indicate if the next relationship has also to be created at the end
@@ -101,13 +287,19 @@ def log_to_collapsed_structure(execution_history_items, throw_on_pickle_error=Tr
                     the state with that run_id
     :rtype: tuple
     """
+    with _opened_execution_log(execution_history_items) as execution_history_items:
+        return _log_to_collapsed_structure(execution_history_items, throw_on_pickle_error,
+                                           include_erroneous_data_ports, full_next)
+
 
+def _log_to_collapsed_structure(execution_history_items, throw_on_pickle_error, include_erroneous_data_ports,
+                                full_next):
     # for debugging purposes
     # execution_history_items_dict = dict()
     # for k, v in execution_history_items.items():
     #     execution_history_items_dict[k] = v
 
-    start_item, previous, next_, concurrent, grouped = log_to_raw_structure(execution_history_items)
+    start_item, previous, next_, concurrent, grouped = _log_to_raw_structure(execution_history_items)
 
     start_item = None
     collapsed_next = {}
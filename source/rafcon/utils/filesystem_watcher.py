@@ -0,0 +1,240 @@
+# Copyright (C) 2019 DLR
+#
+# All rights reserved. This program and the accompanying materials are made
+# available under the terms of the Eclipse Public License v1.0 which
+# accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v10.html
+
+"""
+.. module:: filesystem_watcher
+   :synopsis: A module to detect changes of watched directories, using inotify or polling
+
+"""
+import os
+import sys
+import errno
+import struct
+import ctypes
+import ctypes.util
+
+from rafcon.utils import log
+
+logger = log.get_logger(__name__)
+
+WATCHER_AUTO = "auto"
+WATCHER_INOTIFY = "inotify"
+WATCHER_POLLING = "polling"
+
+# see inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+INOTIFY_WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | \
+                     IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _get_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime, stat.st_ctime, stat.st_size
+
+
+class PollingWatcher(object):
+    """Detects changes of directories by comparing the stats of the directories and their files
+
+    The stats of a directory change, when entries are added, removed or renamed. Files modified in place are only
+    detected, if the directory is watched with `files=True`.
+    """
+
+    def __init__(self):
+        self._snapshots = {}
+
+    def _take_snapshot(self, path, files):
+        file_stats = None
+        if files:
+            try:
+                file_stats = dict((name, _get_stat(os.path.join(path, name))) for name in os.listdir(path))
+            except OSError:
+                file_stats = {}
+        return _get_stat(path), file_stats
+
+    def watch(self, path, files=False):
+        """Starts watching a directory
+
+        :param str path: the path of the directory
+        :param bool files: whether modifications of the files in the directory have to be detected
+        """
+        self._snapshots[path] = self._take_snapshot(path, files)
+
+    def unwatch(self, path):
+        """Stops watching a directory
+
+        :param str path: the path of the directory
+        """
+        self._snapshots.pop(path, None)
+
+    def get_changed_paths(self):
+        """Returns the watched directories that changed since the last call
+
+        Removed directories are not watched any more.
+
+        :return: the paths of the changed directories
+        :rtype: set
+        """
+        changed_paths = set()
+        for path, (stat, file_stats) in list(self._snapshots.items()):
+            new_stat = _get_stat(path)
+            if new_stat != stat:
+                changed_paths.add(path)
+            elif file_stats is not None and \
+                    any(_get_stat(os.path.join(path, name)) != file_stat for name, file_stat in file_stats.items()):
+                changed_paths.add(path)
+            else:
+                continue
+            if new_stat is None:
+                del self._snapshots[path]
+            else:
+                self._snapshots[path] = self._take_snapshot(path, file_stats is not None)
+        return changed_paths
+
+    def close(self):
+        self._snapshots.clear()
+
+
+class InotifyWatcher(object):
+    """Detects changes of directories with inotify
+
+    The events are read without blocking, whenever the changed directories are requested. Directories that cannot be
+    watched with inotify, e.g. because the limit of inotify watches is reached or the directory does not exist (yet), are
+    polled.
+
+    :raises OSError: if inotify is not available
+    """
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error_number = ctypes.get_errno()
+            raise OSError(error_number, os.strerror(error_number))
+        self._paths = {}
+        self._descriptors = {}
+        self._polling_watcher = PollingWatcher()
+
+    def watch(self, path, files=False):
+        """Starts watching a directory
+
+        :param str path: the path of the directory
+        :param bool files: not used, as inotify reports modifications of files as changes of their directory
+        """
+        if path in self._descriptors:
+            return
+        descriptor = self._libc.inotify_add_watch(self._fd, path.encode(sys.getfilesystemencoding()),
+                                                  INOTIFY_WATCH_MASK)
+        if descriptor < 0:
+            error_number = ctypes.get_errno()
+            if error_number == errno.ENOSPC:
+                logger.debug("Limit of inotify watches reached, polling {0}".format(path))
+            else:
+                logger.warning("Cannot watch {0} with inotify, polling it instead: {1}".format(
+                    path, os.strerror(error_number)))
+            self._polling_watcher.watch(path, files)
+            return
+        self._paths[descriptor] = path
+        self._descriptors[path] = descriptor
+
+    def unwatch(self, path):
+        """Stops watching a directory
+
+        :param str path: the path of the directory
+        """
+        self._polling_watcher.unwatch(path)
+        descriptor = self._descriptors.pop(path, None)
+        if descriptor is not None:
+            del self._paths[descriptor]
+            if self._libc.inotify_rm_watch(self._fd, descriptor) < 0:
+                # e.g. the directory was removed and the watch is already gone
+                logger.debug("Cannot remove the inotify watch of {0}: {1}".format(
+                    path, os.strerror(ctypes.get_errno())))
+
+    def _read_events(self):
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return
+                raise
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+                offset += INOTIFY_EVENT_HEADER.size + name_length
+                yield descriptor, mask
+
+    def get_changed_paths(self):
+        """Returns the watched directories that changed since the last call
+
+        Removed directories are not watched any more.
+
+        :return: the paths of the changed directories or None, if events were lost and any directory might have changed
+        :rtype: set
+        """
+        changed_paths = self._polling_watcher.get_changed_paths()
+        events_lost = False
+        for descriptor, mask in self._read_events():
+            if mask & IN_Q_OVERFLOW:
+                events_lost = True
+            path = self._paths.get(descriptor)
+            if path is None:
+                continue
+            changed_paths.add(path)
+            if mask & IN_IGNORED:
+                # the directory was removed
+                del self._paths[descriptor]
+                if self._descriptors.get(path) == descriptor:
+                    del self._descriptors[path]
+        return None if events_lost else changed_paths
+
+    def close(self):
+        self._polling_watcher.close()
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._paths.clear()
+        self._descriptors.clear()
+
+
+def create_watcher(watcher_type=WATCHER_AUTO):
+    """Creates a watcher for directories
+
+    :param str watcher_type: "inotify", "polling" or "auto" for inotify, if available, and polling otherwise
+    :return: the watcher
+    :rtype: InotifyWatcher | PollingWatcher
+    """
+    if watcher_type in (WATCHER_AUTO, WATCHER_INOTIFY):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            # AttributeError: the C library does not provide inotify
+            if watcher_type == WATCHER_INOTIFY:
+                logger.warning("Cannot use inotify, directories are polled instead: {0}".format(e))
+    elif watcher_type != WATCHER_POLLING:
+        raise ValueError("Unknown watcher type: {0}".format(watcher_type))
+    return PollingWatcher()
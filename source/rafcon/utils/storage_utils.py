@@ -18,10 +18,17 @@
 
 import json
 import yaml
+import threading
 from time import gmtime, strftime, strptime, mktime
+from future.utils import string_types, integer_types
 
 from jsonconversion.decoder import JSONObjectDecoder
 from jsonconversion.encoder import JSONObjectEncoder
+from jsonconversion.conversion import string2type, get_class_from_qualified_name
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 substitute_modules = {
     # backward compatibiliy (remove in next minor release): state elements
@@ -63,6 +70,13 @@ substitute_modules = {
 
 TIME_STRING_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+#: The "fast" json backend produces and reads the same files as the "jsonconversion" backend. It uses the C
+#: accelerated parts of the json module where possible and caches the classes of decoded objects.
+JSON_BACKEND_FAST = "fast"
+JSON_BACKEND_JSONCONVERSION = "jsonconversion"
+#: The json backend in use, selected by the STORAGE_JSON_BACKEND config value when loading or saving state machines
+json_backend = JSON_BACKEND_JSONCONVERSION
+
 
 def get_current_time_string():
     return strftime(TIME_STRING_FORMAT, gmtime())
@@ -99,6 +113,43 @@ def load_dict_from_yaml(path):
     return dictionary
 
 
+# only used for its default method, which converts objects to dictionaries
+_json_object_encoder = JSONObjectEncoder(builtins_str="__builtin__")
+
+
+def _to_json_compatible(obj):
+    """Converts objects to dictionaries, like the JSONObjectEncoder does during the encoding
+
+    The result only consists of the types the json module encodes by itself, so that no Python level isinstance checks
+    are needed during the encoding.
+    """
+    if obj is None or isinstance(obj, (string_types, bool, float) + integer_types):
+        return obj
+    if isinstance(obj, (set, tuple)):
+        # the JSONObjectEncoder does not encode tuples as lists
+        return _to_json_compatible(_json_object_encoder.default(obj))
+    if isinstance(obj, list):
+        return [_to_json_compatible(value) for value in obj]
+    if isinstance(obj, dict):
+        return dict((key, _to_json_compatible(value)) for key, value in obj.items())
+    return _to_json_compatible(_json_object_encoder.default(obj))
+
+
+def dict_to_json_string(dictionary, **kwargs):
+    """
+    Converts a dictionary to the json string written by :func:`write_dict_to_json`.
+    :param dictionary: The dictionary to be converted
+    :param kwargs: optional additional parameters for dumper
+    :return: the json string
+    """
+    if json_backend == JSON_BACKEND_FAST and not kwargs:
+        return json.dumps(_to_json_compatible(dictionary),
+                          indent=4, separators=(', ', ': '), sort_keys=True, check_circular=False)
+    return json.dumps(dictionary, cls=JSONObjectEncoder,
+                      indent=4, separators=(', ', ': '), builtins_str="__builtin__", sort_keys=True,
+                      check_circular=False, **kwargs)
+
+
 def write_dict_to_json(dictionary, path, **kwargs):
     """
     Write a dictionary to a json file.
@@ -106,24 +157,100 @@ def write_dict_to_json(dictionary, path, **kwargs):
     :param dictionary: The dictionary to get saved
     :param kwargs: optional additional parameters for dumper
     """
-    result_string = json.dumps(dictionary, cls=JSONObjectEncoder,
-                               indent=4, separators=(', ', ': '), builtins_str="__builtin__", sort_keys=True,
-                               check_circular=False, **kwargs)
+    result_string = dict_to_json_string(dictionary, **kwargs)
     with open(path, 'w') as f:
         # We cannot write directly to the file, as otherwise the 'encode' method wouldn't be called
         f.write(result_string)
 
 
+# the creation of a JSONObjectDecoder inspects the signature of its base class, thus the decoders are reused
+_json_object_decoders = threading.local()
+
+
+def _get_json_object_decoder():
+    decoder = getattr(_json_object_decoders, 'decoder', None)
+    if decoder is None:
+        decoder = _json_object_decoders.decoder = JSONObjectDecoder(substitute_modules=substitute_modules)
+    return decoder
+
+
+_classes = {}
+_types = {}
+
+
+def _get_class(qualified_name):
+    cls = _classes.get(qualified_name)
+    if cls is None:
+        cls = _classes[qualified_name] = get_class_from_qualified_name(qualified_name)
+    return cls
+
+
+def _get_type(type_string):
+    type_object = _types.get(type_string)
+    if type_object is None:
+        type_object = _types[type_string] = string2type(type_string)
+    return type_object
+
+
+def _may_be_integer(key):
+    # int() only accepts strings starting with a digit, a sign or whitespace
+    return key[:1].isdigit() or key[:1] in "+- \t\n\r\f\v"
+
+
+def _dict_to_object(dictionary):
+    """Object hook doing the same as the one of the JSONObjectDecoder, but faster
+
+    The classes and types are cached and only dictionaries with potentially numeric keys are converted.
+    """
+    if '__jsonqualname__' in dictionary:
+        qualified_name = dictionary.pop('__jsonqualname__')
+        cls = _get_class(substitute_modules.get(qualified_name, qualified_name))
+        if cls is tuple:
+            return tuple(dictionary['items'])
+        if cls is set:
+            return set(dictionary['items'])
+        if np and cls is np.ndarray:
+            return np.array(dictionary['items'])
+        if hasattr(cls, "from_dict"):
+            return cls.from_dict(dictionary)
+        return dictionary
+    if '__type__' in dictionary:
+        type_string = dictionary['__type__']
+        return _get_type(substitute_modules.get(type_string, type_string))
+    if not any(_may_be_integer(key) for key in dictionary):
+        return dictionary
+    converted_dictionary = {}
+    for key, value in dictionary.items():
+        if _may_be_integer(key):
+            try:
+                key = int(key)
+            except ValueError:
+                pass
+        converted_dictionary[key] = value
+    return converted_dictionary
+
+
+_fast_json_decoder = json.JSONDecoder(object_hook=_dict_to_object)
+
+
+def load_objects_from_json_string(json_string, as_dict=False):
+    """Loads a dictionary from the content of a json file.
+
+    :param str json_string: The content of the json file.
+    :return: The dictionary specified in the json string
+    """
+    if as_dict:
+        return json.loads(json_string)
+    if json_backend == JSON_BACKEND_FAST:
+        return _fast_json_decoder.decode(json_string)
+    return _get_json_object_decoder().decode(json_string)
+
+
 def load_objects_from_json(path, as_dict=False):
     """Loads a dictionary from a json file.
 
     :param path: The relative path of the json file.
     :return: The dictionary specified in the json file
     """
-    f = open(path, 'r')
-    if as_dict:
-        result = json.load(f)
-    else:
-        result = json.load(f, cls=JSONObjectDecoder, substitute_modules=substitute_modules)
-    f.close()
-    return result
+    with open(path, 'r') as f:
+        return load_objects_from_json_string(f.read(), as_dict)
@@ -32,11 +32,34 @@ class Vividict(dict, YAMLObject, JSONObject):
     #: Unique tag used for conversion to and from YAML objects
     yaml_tag = u'!Vividict'
 
+    #: Function called after each modification of the Vividict or one of its nested Vividicts
+    _change_callback = None
+
     def __init__(self, dictionary=None):
         super(Vividict, self).__init__()
         if dictionary:
             self.set_dict(dictionary)
 
+    def __getstate__(self):
+        # the change callback belongs to the owner of the Vividict and is neither copied nor pickled
+        state = self.__dict__.copy()
+        state.pop('_change_callback', None)
+        return state
+
+    def set_change_callback(self, callback):
+        """Sets a function, which is called after each modification of the Vividict or one of its nested Vividicts
+
+        :param callback: the function without arguments, None to remove the callback
+        """
+        self._change_callback = callback
+        for value in self.values():
+            if isinstance(value, Vividict):
+                value.set_change_callback(callback)
+
+    def _notify_change(self):
+        if self._change_callback is not None:
+            self._change_callback()
+
     def __missing__(self, key):
         """
         The main function of this class. If a key is missing it creates a new Vividict on the fly.
@@ -53,7 +76,37 @@ class Vividict(dict, YAMLObject, JSONObject):
         key = str(key)
         if type(value) is dict:
             value = Vividict(value)
+        if self._change_callback is not None and isinstance(value, Vividict):
+            value.set_change_callback(self._change_callback)
         super(Vividict, self).__setitem__(key, value)
+        self._notify_change()
+
+    def __delitem__(self, key):
+        super(Vividict, self).__delitem__(key)
+        self._notify_change()
+
+    def pop(self, *args):
+        value = super(Vividict, self).pop(*args)
+        self._notify_change()
+        return value
+
+    def popitem(self):
+        item = super(Vividict, self).popitem()
+        self._notify_change()
+        return item
+
+    def clear(self):
+        super(Vividict, self).clear()
+        self._notify_change()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
 
     def set_dict(self, new_dict):
         """Sets the dictionary of the Vividict
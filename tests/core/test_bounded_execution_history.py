@@ -0,0 +1,136 @@
+from builtins import range
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+from rafcon.core.singleton import state_machine_execution_engine, state_machine_manager
+from rafcon.core.execution.execution_history import ExecutionHistory, CallType, ConcurrencyItem
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+from rafcon.core.state_machine import StateMachine
+from rafcon.utils import log
+
+# test environment elements
+from tests import utils as testing_utils
+from tests.utils import wait_for_execution_engine_sync_counter
+
+logger = log.get_logger(__name__)
+
+SCRIPT_TEXT = """
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+
+def create_sequence(name, number_of_states):
+    hierarchy_state = HierarchyState(name)
+    last_state = None
+    for i in range(number_of_states):
+        state = ExecutionState("state" + str(i))
+        state.script_text = SCRIPT_TEXT
+        hierarchy_state.add_state(state)
+        if last_state is None:
+            hierarchy_state.set_start_state(state.state_id)
+        else:
+            hierarchy_state.add_transition(last_state.state_id, 0, state.state_id, None)
+        last_state = state
+    hierarchy_state.add_transition(last_state.state_id, 0, hierarchy_state.state_id, 0)
+    return hierarchy_state
+
+
+def set_history_limits(max_length=0, max_age=0):
+    # the config is kept in memory between tests
+    global_config.set_config_value("EXECUTION_HISTORY_MAX_LENGTH", max_length)
+    global_config.set_config_value("EXECUTION_HISTORY_MAX_AGE", max_age)
+
+
+def test_ring_buffer():
+    state = ExecutionState("state")
+    execution_history = ExecutionHistory(max_length=4)
+    for i in range(10):
+        execution_history.push_call_history_item(state, CallType.EXECUTE, None)
+    assert len(execution_history) == 4
+    assert execution_history.number_of_removed_items == 6
+    # the removed items are unlinked
+    assert execution_history[0].prev is None
+    assert execution_history[-1].prev is execution_history[-2]
+    assert len(execution_history[1:]) == 3
+
+    execution_history = ExecutionHistory(max_age=10)
+    for i in range(3):
+        execution_history.push_call_history_item(state, CallType.EXECUTE, None)
+    execution_history[0].timestamp -= 20
+    execution_history.push_call_history_item(state, CallType.EXECUTE, None)
+    assert len(execution_history) == 3
+
+
+def test_bounded_history_of_concurrency_state(caplog):
+    testing_utils.initialize_environment_core()
+    set_history_limits(max_length=6)
+
+    barrier_state = BarrierConcurrencyState("barrier_concurrency")
+    for i in range(3):
+        barrier_state.add_state(create_sequence("branch" + str(i), 10))
+    barrier_state.add_transition(barrier_state.states[UNIQUE_DECIDER_STATE_ID].state_id, 0, barrier_state.state_id, 0)
+    root_state = HierarchyState("root")
+    root_state.add_state(barrier_state)
+    root_state.set_start_state(barrier_state.state_id)
+    root_state.add_transition(barrier_state.state_id, 0, root_state.state_id, 0)
+    state_machine = StateMachine(root_state)
+    state_machine_manager.add_state_machine(state_machine)
+    try:
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        state_machine_execution_engine.join()
+
+        execution_history = state_machine.execution_histories[-1]
+        assert execution_history.max_length == 6
+        concurrency_items = [item for item in execution_history if isinstance(item, ConcurrencyItem)]
+        assert len(concurrency_items) == 1
+        for branch_history in concurrency_items[0].execution_histories:
+            assert branch_history.max_length == 6
+            assert len(branch_history) <= 6
+        assert any(branch_history.number_of_removed_items > 0
+                   for branch_history in concurrency_items[0].execution_histories)
+    finally:
+        set_history_limits()
+        state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_backward_stepping_within_retained_history(caplog):
+    testing_utils.initialize_environment_core()
+    set_history_limits(max_length=5)
+
+    state_machine = StateMachine(create_sequence("root", 6))
+    state_machine_manager.add_state_machine(state_machine)
+    try:
+        with state_machine_execution_engine._status.execution_condition_variable:
+            state_machine_execution_engine.synchronization_counter = 0
+        state_machine_execution_engine.step_mode(state_machine.state_machine_id)
+        wait_for_execution_engine_sync_counter(1, logger)
+        for i in range(4):
+            state_machine_execution_engine.step_into()
+            wait_for_execution_engine_sync_counter(1, logger)
+        execution_history = state_machine.execution_histories[-1]
+        assert len(execution_history) == 5
+
+        # the last two states can be stepped back, the ones before were removed from the history
+        for i in range(3):
+            state_machine_execution_engine.backward_step()
+            wait_for_execution_engine_sync_counter(1, logger)
+        assert len(execution_history) == 1
+        assert state_machine_execution_engine.status.execution_mode.name == "STEP_MODE"
+
+        state_machine_execution_engine.start()
+        state_machine_execution_engine.join()
+        assert state_machine.root_state.final_outcome.outcome_id == 0
+    finally:
+        set_history_limits()
+        state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=1)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,172 @@
+import time
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+from rafcon.core.storage import storage
+from rafcon.core.singleton import global_variable_manager, state_machine_manager, state_machine_execution_engine
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.concurrency_state import ConcurrencyState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.states.preemptive_concurrency_state import PreemptiveConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+
+# test environment elements
+from tests import utils as testing_utils
+
+BRANCH_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    if self.preemptive_wait(inputs["duration"]):
+        return -2
+    outputs["result"] = self.name
+    return 0
+"""
+
+DECIDER_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    gvm.set_variable("finished_branches", sorted(name for name, outcome in self.final_outcomes_dict.values()
+                                                 if outcome.outcome_id == 0))
+    return 0
+"""
+
+
+def create_branch(name, duration):
+    state = ExecutionState(name)
+    state.add_input_data_port("duration", "float", float(duration))
+    state.add_output_data_port("result", "str")
+    state.script_text = BRANCH_SCRIPT
+    return state
+
+
+def create_barrier_state(durations):
+    barrier_state = BarrierConcurrencyState("barrier")
+    for index, duration in enumerate(durations):
+        barrier_state.add_state(create_branch("branch" + str(index), duration))
+    decider_state = barrier_state.states[UNIQUE_DECIDER_STATE_ID]
+    decider_state.script_text = DECIDER_SCRIPT
+    barrier_state.add_transition(decider_state.state_id, 0, barrier_state.state_id, 0)
+    return barrier_state
+
+
+def create_preemptive_state(durations):
+    preemptive_state = PreemptiveConcurrencyState("preemptive")
+    for index, duration in enumerate(durations):
+        state = create_branch("branch" + str(index), duration)
+        preemptive_state.add_state(state)
+        preemptive_state.add_transition(state.state_id, 0, preemptive_state.state_id, 0)
+    return preemptive_state
+
+
+def execute(root_state):
+    state_machine = StateMachine(root_state)
+    state_machine_manager.add_state_machine(state_machine)
+    state_machine_execution_engine.start(state_machine.state_machine_id)
+    state_machine_execution_engine.join()
+    state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+
+def spy_on_child_states(monkeypatch):
+    """Records the order in which child states are joined and the number of simultaneously running child states"""
+    statistics = {'joined': [], 'running': 0, 'max_running': 0}
+    start_child_state = ConcurrencyState.start_child_state
+    join_state = ConcurrencyState.join_state
+
+    def start_child_state_spy(self, state, *args):
+        statistics['running'] += 1
+        statistics['max_running'] = max(statistics['max_running'], statistics['running'])
+        start_child_state(self, state, *args)
+
+    def join_state_spy(self, state, *args):
+        join_state(self, state, *args)
+        statistics['running'] -= 1
+        statistics['joined'].append(state.name)
+
+    monkeypatch.setattr(ConcurrencyState, "start_child_state", start_child_state_spy)
+    monkeypatch.setattr(ConcurrencyState, "join_state", join_state_spy)
+    return statistics
+
+
+def test_completion_order(caplog, monkeypatch):
+    testing_utils.initialize_environment_core()
+    try:
+        statistics = spy_on_child_states(monkeypatch)
+        barrier_state = create_barrier_state([0.6, 0.2, 0.4])
+        execute(barrier_state)
+        assert barrier_state.final_outcome.outcome_id == 0
+        # the child states are processed in the order they finish
+        assert statistics['joined'] == ["branch1", "branch2", "branch0"]
+        assert global_variable_manager.get_variable("finished_branches") == \
+            ["branch0", "branch1", "branch2"]
+    finally:
+        monkeypatch.undo()
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_quorum(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        barrier_state = create_barrier_state([0.1, 10, 0.1, 10])
+        barrier_state.quorum = 2
+        start_time = time.time()
+        execute(barrier_state)
+        assert time.time() - start_time < 5
+        assert barrier_state.final_outcome.outcome_id == 0
+        assert global_variable_manager.get_variable("finished_branches") == ["branch0", "branch2"]
+        branches = {state.name: state for state in barrier_state.states.values()}
+        assert branches["branch1"].final_outcome.outcome_id == -2
+        assert branches["branch3"].final_outcome.outcome_id == -2
+
+        # the quorum is stored with the state machine
+        path = testing_utils.get_unique_temp_path()
+        storage.save_state_machine_to_path(StateMachine(barrier_state), path)
+        assert storage.load_state_machine_from_path(path).root_state.quorum == 2
+        with pytest.raises(ValueError):
+            barrier_state.quorum = -1
+    finally:
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_max_running_branches(caplog, monkeypatch):
+    testing_utils.initialize_environment_core({"CONCURRENCY_MAX_RUNNING_BRANCHES": 3})
+    try:
+        statistics = spy_on_child_states(monkeypatch)
+        barrier_state = create_barrier_state([0.01] * 20)
+        execute(barrier_state)
+        assert barrier_state.final_outcome.outcome_id == 0
+        assert len(statistics['joined']) == 20
+        assert statistics['max_running'] == 3
+
+        # a preemptive concurrency state does not start further child states after the first one finished
+        del statistics['joined'][:]
+        preemptive_state = create_preemptive_state([10, 0.1, 10, 10, 10])
+        execute(preemptive_state)
+        assert preemptive_state.final_outcome.outcome_id == 0
+        assert sorted(statistics['joined']) == ["branch0", "branch1", "branch2"]
+
+        # no further child states are started after the concurrency state was stopped
+        global_config.set_config_value("CONCURRENCY_MAX_RUNNING_BRANCHES", 1)
+        del statistics['joined'][:]
+        barrier_state = create_barrier_state([1.] * 4)
+        state_machine = StateMachine(barrier_state)
+        state_machine_manager.add_state_machine(state_machine)
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        time.sleep(0.3)
+        start_time = time.time()
+        state_machine_execution_engine.stop()
+        state_machine_execution_engine.join()
+        state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        assert time.time() - start_time < 0.9
+        assert barrier_state.final_outcome.outcome_id == -2
+        assert statistics['joined'] == ["branch0"]
+    finally:
+        monkeypatch.undo()
+        global_config.set_config_value("CONCURRENCY_MAX_RUNNING_BRANCHES", 0)
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
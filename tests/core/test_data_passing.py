@@ -0,0 +1,89 @@
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+from rafcon.core.data_passing import share_value, pass_value
+from rafcon.core.global_variable_manager import GlobalVariableManager
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_elements.scope import ScopedData
+from rafcon.core.state_elements.data_port import OutputDataPort
+
+
+def set_data_passing_policy(policy):
+    # the config is kept in memory between tests
+    global_config.set_config_value("DATA_PASSING_POLICY", policy)
+
+
+def test_share_value():
+    np = pytest.importorskip("numpy")
+
+    value = (1, "a", 2.)
+    assert share_value(value) is value
+
+    value = [1, 2]
+    assert share_value(value) is not value
+    assert share_value(value) == value
+
+    array = np.arange(5)
+    view = share_value(array)
+    assert view.base is array
+    with pytest.raises(ValueError):
+        view[0] = 10
+    # the receiver has to copy the array in order to change it
+    changed = np.array(view)
+    changed[0] = 10
+    assert array[0] == 0
+
+    array = np.array([[1], [2]], dtype=object)
+    assert not np.shares_memory(share_value(array), array)
+
+
+def test_pass_value_policy():
+    np = pytest.importorskip("numpy")
+    array = np.ones(3)
+    try:
+        set_data_passing_policy("copy")
+        assert pass_value(array).base is None
+        set_data_passing_policy("reference")
+        assert pass_value(array).base is array
+    finally:
+        set_data_passing_policy("copy")
+
+
+def test_data_passing_by_reference():
+    np = pytest.importorskip("numpy")
+
+    state1 = ExecutionState("producer")
+    output_id = state1.add_output_data_port("cloud", "numpy.ndarray")
+    state2 = ExecutionState("consumer")
+    input_id = state2.add_input_data_port("cloud", "numpy.ndarray")
+    container = HierarchyState("container")
+    container.add_state(state1)
+    container.add_state(state2)
+    container.add_data_flow(state1.state_id, output_id, state2.state_id, input_id)
+
+    cloud = np.zeros((100, 3))
+    container.scoped_data[str(output_id) + state1.state_id] = \
+        ScopedData("cloud", cloud, np.ndarray, state1.state_id, OutputDataPort, parent=container)
+
+    gvm = GlobalVariableManager()
+    gvm.set_variable("cloud", cloud)
+    try:
+        set_data_passing_policy("reference")
+        inputs = container.get_inputs_for_state(state2)
+        assert np.shares_memory(inputs["cloud"], cloud)
+        with pytest.raises(ValueError):
+            inputs["cloud"][0, 0] = 1.
+        assert not gvm.get_variable("cloud").flags.writeable
+
+        set_data_passing_policy("copy")
+        inputs = container.get_inputs_for_state(state2)
+        assert not np.shares_memory(inputs["cloud"], cloud)
+        assert gvm.get_variable("cloud").flags.writeable
+    finally:
+        set_data_passing_policy("copy")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
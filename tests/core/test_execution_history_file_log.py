@@ -2,11 +2,24 @@
 import rafcon.core.singleton
 from rafcon.core.storage import storage as global_storage
 import rafcon.utils.execution_log as log_helper
+from rafcon.core.execution.execution_history import ExecutionHistory, AsyncExecutionHistoryStorage, CallType
+from rafcon.core.config import global_config
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
 
 # test environment elements
 import pytest
 from tests import utils as testing_utils
 import os
+import pickle
+import threading
+
+SCRIPT_TEXT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["output_1"] = int(self.name[-1])
+    return 0
+"""
 
 
 def test_execution_log(caplog):
@@ -62,6 +75,152 @@ def test_execution_log(caplog):
     finally:
         testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
 
+def create_state_machine():
+    root_state = HierarchyState("root")
+    last_state = None
+    for i in range(3):
+        state = ExecutionState("state" + str(i))
+        state.script_text = SCRIPT_TEXT
+        state.add_output_data_port("output_1", "int")
+        root_state.add_state(state)
+        if last_state is None:
+            root_state.set_start_state(state.state_id)
+        else:
+            root_state.add_transition(last_state.state_id, 0, state.state_id, None)
+        last_state = state
+    root_state.add_transition(last_state.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def test_binary_execution_log(caplog, monkeypatch):
+    opened_logs = []
+    open_execution_log = log_helper.open_execution_log
+
+    def open_execution_log_spy(filename):
+        opened_logs.append(open_execution_log(filename))
+        return opened_logs[-1]
+
+    try:
+        testing_utils.initialize_environment_core(
+            core_config={'EXECUTION_LOG_ENABLE': True,
+                         'EXECUTION_LOG_FORMAT': 'binary',
+                         'EXECUTION_LOG_PATH': testing_utils.get_unique_temp_path()+'/test_execution_log'})
+
+        state_machine = create_state_machine()
+        rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        filename = state_machine.get_last_execution_log_filename()
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+        assert log_helper.is_binary_execution_log(filename)
+        history_items = log_helper.open_execution_log(filename)
+        # start item, call and return item of the root state and call and return items of each child state
+        assert len(history_items) == 9
+
+        monkeypatch.setattr(log_helper, "open_execution_log", open_execution_log_spy)
+        start, next, concurrent, hierarchy, collapsed_items = log_helper.log_to_collapsed_structure(filename)
+        monkeypatch.undo()
+        assert start['state_name'] == 'StateMachineStartItem'
+        # logs opened from a filename are closed again
+        assert len(opened_logs) == 1
+        assert opened_logs[0]._file.closed
+        state2 = [v for v in collapsed_items.values() if v['state_name'] == 'state2'][0]
+        assert state2['data_outs']['output_1'] == 2
+        assert state2['outcome_name'] == 'success'
+
+        # a log that was not closed (e.g. due to a crash) can be read up to the last complete record
+        with open(filename, 'rb') as f:
+            data = f.read()
+        truncated_filename = filename + '.truncated'
+        with open(truncated_filename, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        truncated_history_items = log_helper.open_execution_log(truncated_filename)
+        assert 0 < len(truncated_history_items) < 9
+        for key, value in truncated_history_items.items():
+            assert value == history_items[key]
+    finally:
+        global_config.set_config_value('EXECUTION_LOG_ENABLE', False)
+        global_config.set_config_value('EXECUTION_LOG_FORMAT', 'shelve')
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=0)
+
+
+class SlowStorage(object):
+    filename = "slow_storage"
+
+    def __init__(self):
+        self.items = {}
+        self.may_store = threading.Event()
+        self.closed = False
+
+    def store_item(self, key, value):
+        self.may_store.wait()
+        self.items[key] = value
+
+    def flush(self):
+        pass
+
+    def close(self, make_read_and_writable_for_all=False):
+        self.closed = True
+
+
+@pytest.mark.parametrize("back_pressure_policy", ["block", "drop"])
+def test_async_execution_history_storage(back_pressure_policy):
+    storage = SlowStorage()
+    async_storage = AsyncExecutionHistoryStorage(storage, queue_size=2, back_pressure_policy=back_pressure_policy)
+    execution_history = ExecutionHistory(max_length=2)
+    execution_history.set_execution_history_storage(async_storage)
+    state = ExecutionState("state")
+    history_item_ids = []
+
+    def push_items():
+        for _ in range(10):
+            history_item = execution_history.push_call_history_item(state, CallType.EXECUTE, None, {})
+            history_item_ids.append(history_item.history_item_id)
+
+    pushing_thread = threading.Thread(target=push_items)
+    pushing_thread.start()
+    pushing_thread.join(0.5)
+    # the execution is only stalled by the storage, if the items must not be dropped
+    assert pushing_thread.is_alive() == (back_pressure_policy == "block")
+    storage.may_store.set()
+    pushing_thread.join()
+    async_storage.close()
+
+    assert storage.closed
+    assert len(storage.items) + async_storage.number_of_dropped_items == 10
+    if back_pressure_policy == "block":
+        assert async_storage.number_of_dropped_items == 0
+    else:
+        assert async_storage.number_of_dropped_items >= 7
+    # the links to the previous items are logged, although the items were removed from the bounded history
+    for prev_history_item_id, history_item_id in zip([None] + history_item_ids, history_item_ids):
+        if history_item_id in storage.items:
+            assert storage.items[history_item_id]['prev_history_item_id'] == prev_history_item_id
+
+
+def test_async_execution_history_storage_snapshot():
+    from rafcon.core.execution import execution_history as execution_history_module
+    storage = SlowStorage()
+    async_storage = AsyncExecutionHistoryStorage(storage)
+    execution_history = ExecutionHistory()
+    execution_history.set_execution_history_storage(async_storage)
+    state = ExecutionState("state")
+    input_data = {"values": [1]}
+    history_item = execution_history.push_call_history_item(state, CallType.EXECUTE, None, input_data)
+
+    # the item is logged with the data at the time it was pushed
+    state.name = "renamed"
+    input_data["values"].append(2)
+    storage.may_store.set()
+    # storages that were not closed are drained on exit
+    execution_history_module._close_async_storages()
+    assert storage.closed
+    record = storage.items[history_item.history_item_id]
+    assert record['state_name'] == "state"
+    assert pickle.loads(record['input_output_data']['values']) == [1]
+
+
 if __name__ == '__main__':
     test_execution_log(None)
     # pytest.main([__file__])
@@ -0,0 +1,159 @@
+import os
+import time
+import threading
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.config import global_config
+from rafcon.core.storage import storage
+from rafcon.core.singleton import global_variable_manager, state_machine_manager, state_machine_execution_engine
+from rafcon.core.execution.execution_pool import ExecutionPool, shutdown_execution_pool
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.states.preemptive_concurrency_state import PreemptiveConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def test_execution_pool_reuses_workers():
+    pool = ExecutionPool(max_workers=2)
+    thread_names = []
+
+    def task():
+        thread_names.append(threading.current_thread().name)
+
+    for _ in range(5):
+        pool.submit(task).join()
+    assert pool.number_of_workers == 1
+    assert len(set(thread_names)) == 1
+
+    # tasks never wait for a free worker and are not executed in the calling thread, even if the pool is exhausted
+    release = threading.Event()
+    tasks = [pool.submit(release.wait) for _ in range(4)]
+    time.sleep(0.1)
+    assert all(task.is_alive() for task in tasks)
+    assert pool.number_of_workers == 2
+    release.set()
+    for task in tasks:
+        task.join()
+    assert not any(task.is_alive() for task in tasks)
+
+    pool.shutdown()
+    assert pool.number_of_workers == 0
+
+
+def reset_execution_mode():
+    # the config is kept in memory between tests
+    global_config.set_config_value("EXECUTION_MODE", "threads")
+    global_config.set_config_value("EXECUTION_POOL_MAX_WORKERS", 16)
+    shutdown_execution_pool()
+
+
+def test_pooled_execution(caplog):
+    testing_utils.initialize_environment_core({"EXECUTION_MODE": "pooled",
+                                               "SCRIPT_RECOMPILATION_ON_STATE_EXECUTION": True})
+
+    sm = state_machine_execution_engine.execute_state_machine_from_path(
+        path=testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "error_propagation_test")))
+    state_machine_manager.remove_state_machine(sm.state_machine_id)
+    try:
+        assert sm.root_state.output_data["error_check"] == "successfull"
+    finally:
+        reset_execution_mode()
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=0, expected_errors=2)
+
+
+def trigger_stop(execution_engine):
+    while not global_variable_manager.variable_exists("s1"):
+        time.sleep(0.1)
+    execution_engine.stop()
+
+
+def test_pooled_execution_preemption_during_stop(caplog):
+    testing_utils.initialize_environment_core({"EXECUTION_MODE": "pooled", "EXECUTION_POOL_MAX_WORKERS": 1})
+
+    path = testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "preemption_behaviour_during_stop"))
+    state_machine = storage.load_state_machine_from_path(path)
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+
+    thread = threading.Thread(target=trigger_stop, args=[rafcon.core.singleton.state_machine_execution_engine])
+    thread.start()
+
+    rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+    rafcon.core.singleton.state_machine_execution_engine.join()
+
+    rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+    try:
+        assert global_variable_manager.get_variable("s1") == 1
+        assert global_variable_manager.get_variable("s2") == 1
+        assert not global_variable_manager.variable_exist("s3")
+    finally:
+        reset_execution_mode()
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+BLOCKING_BRANCH_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    if self.name == "finishing":
+        self.preemptive_wait(0.1)
+        return 0
+    # blocks until preempted
+    if self.preemptive_wait(10):
+        return -2
+    return 0
+"""
+
+WAITING_BRANCH_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    gvm.set_variable("arrived_" + self.name, True)
+    for _ in range(500):
+        if all(gvm.variable_exist("arrived_branch" + str(i)) for i in range(4)):
+            return 0
+        if self.preemptive_wait(0.01):
+            return -2
+    return -1
+"""
+
+
+def create_concurrency_state(concurrency_state, script_text, names):
+    for name in names:
+        state = ExecutionState(name)
+        state.script_text = script_text
+        concurrency_state.add_state(state)
+        if isinstance(concurrency_state, PreemptiveConcurrencyState):
+            concurrency_state.add_transition(state.state_id, 0, concurrency_state.state_id, 0)
+    if isinstance(concurrency_state, BarrierConcurrencyState):
+        concurrency_state.add_transition(UNIQUE_DECIDER_STATE_ID, 0, concurrency_state.state_id, 0)
+    return concurrency_state
+
+
+def test_pooled_execution_of_wide_concurrency_states(caplog):
+    testing_utils.initialize_environment_core({"EXECUTION_MODE": "pooled", "EXECUTION_POOL_MAX_WORKERS": 1})
+    try:
+        # the branches run concurrently, although the pool has less workers than branches
+        for concurrency_state in [
+                create_concurrency_state(PreemptiveConcurrencyState("preemptive"), BLOCKING_BRANCH_SCRIPT,
+                                         ["blocking0", "blocking1", "blocking2", "finishing"]),
+                create_concurrency_state(BarrierConcurrencyState("barrier"), WAITING_BRANCH_SCRIPT,
+                                         ["branch" + str(i) for i in range(4)])]:
+            state_machine = StateMachine(concurrency_state)
+            state_machine_manager.add_state_machine(state_machine)
+            start_time = time.time()
+            state_machine_execution_engine.start(state_machine.state_machine_id)
+            state_machine_execution_engine.join()
+            state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+            assert time.time() - start_time < 4
+            assert concurrency_state.final_outcome.outcome_id == 0
+    finally:
+        reset_execution_mode()
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
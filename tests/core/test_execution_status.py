@@ -0,0 +1,76 @@
+import pytest
+
+# core elements
+from rafcon.core.singleton import state_machine_execution_engine, state_machine_manager
+from rafcon.core.states.state import State, StateExecutionStatus
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+
+number_of_branches = 10
+
+
+def create_state_machine():
+    barrier_state = BarrierConcurrencyState("barrier_concurrency")
+    for i in range(number_of_branches):
+        barrier_state.add_state(ExecutionState("branch" + str(i)))
+    barrier_state.add_transition(barrier_state.states[UNIQUE_DECIDER_STATE_ID].state_id, 0, barrier_state.state_id, 0)
+    root_state = HierarchyState("root")
+    root_state.add_state(barrier_state)
+    root_state.set_start_state(barrier_state.state_id)
+    root_state.add_transition(barrier_state.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def test_execution_status_updates(caplog, monkeypatch):
+    testing_utils.initialize_environment_core()
+    state_machine = create_state_machine()
+    state_machine_manager.add_state_machine(state_machine)
+
+    modification_lock_acquisitions = []
+    acquire_modification_lock = StateMachine.acquire_modification_lock
+
+    def acquire_modification_lock_spy(self, blocking=True):
+        modification_lock_acquisitions.append(self)
+        return acquire_modification_lock(self, blocking)
+
+    status_notifications = []
+    notify_method_after = State._notify_method_after
+
+    def notify_method_after_spy(self, instance, name, res_val, args, kwargs):
+        if name == "state_execution_status":
+            status_notifications.append((self, args[1]))
+        notify_method_after(self, instance, name, res_val, args, kwargs)
+
+    try:
+        monkeypatch.setattr(StateMachine, "acquire_modification_lock", acquire_modification_lock_spy)
+        monkeypatch.setattr(State, "_notify_method_after", notify_method_after_spy)
+
+        # observers are only notified about changes of the execution status
+        state = state_machine.root_state
+        state.state_execution_status = StateExecutionStatus.ACTIVE
+        state.state_execution_status = StateExecutionStatus.ACTIVE
+        state.state_execution_status = StateExecutionStatus.INACTIVE
+        assert status_notifications == [(state, StateExecutionStatus.ACTIVE), (state, StateExecutionStatus.INACTIVE)]
+
+        # the execution does not acquire the modification lock to update the execution status
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        state_machine_execution_engine.join()
+        assert state_machine.root_state.final_outcome.outcome_id == 0
+        assert not modification_lock_acquisitions
+        for notified_state in set(state for state, _ in status_notifications):
+            statuses = [status for state, status in status_notifications if state is notified_state]
+            assert all(status is not next_status for status, next_status in zip(statuses, statuses[1:]))
+    finally:
+        monkeypatch.undo()
+        state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -1,3 +1,5 @@
+import time
+import threading
 from rafcon.core.global_variable_manager import GlobalVariableManager
 import pytest
 from tests import utils as testing_utils
@@ -58,6 +60,51 @@ def test_locks(caplog):
     testing_utils.assert_logger_warnings_and_errors(caplog, expected_warnings=1, expected_errors=1)
 
 
+def test_lock_waiting(caplog):
+    gvm = GlobalVariableManager()
+    gvm.set_variable('a', 1)
+    access_key = gvm.lock_variable('a')
+
+    # the variable cannot be locked while it is held
+    start_time = time.time()
+    assert gvm.lock_variable('a', block=True, timeout=0.2) is False
+    assert time.time() - start_time >= 0.2
+
+    # waiting threads get the lock in the order of their requests
+    locking_order = []
+
+    def lock_and_unlock(index):
+        thread_access_key = gvm.lock_variable('a', block=True)
+        locking_order.append(index)
+        gvm.unlock_variable('a', thread_access_key)
+
+    threads = []
+    for index in range(5):
+        thread = threading.Thread(target=lock_and_unlock, args=(index,), name="waiter" + str(index))
+        thread.start()
+        threads.append(thread)
+        while gvm.get_lock_statistics('a')['waiting_threads'] <= index:
+            time.sleep(0.001)
+    statistics = gvm.get_lock_statistics('a')
+    assert statistics['holder'] == threading.current_thread().name
+
+    # an unlocked variable is handed to the next waiting thread without delay
+    start_time = time.time()
+    gvm.unlock_variable('a', access_key)
+    for thread in threads:
+        thread.join()
+    assert time.time() - start_time < 0.1
+    assert locking_order == list(range(5))
+
+    statistics = gvm.get_lock_statistics()['a']
+    assert statistics['holder'] is None
+    assert statistics['waiting_threads'] == 0
+    assert statistics['contentions'] == 6
+    assert statistics['timeouts'] == 1
+    assert statistics['max_wait_time'] >= 0.2
+    testing_utils.assert_logger_warnings_and_errors(caplog, expected_warnings=1)
+
+
 def test_type_check(caplog):
     # valid
     gvm = GlobalVariableManager()
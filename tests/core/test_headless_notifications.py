@@ -0,0 +1,43 @@
+import pytest
+
+# core elements
+from rafcon.core import notifications
+from rafcon.core.states.execution_state import ExecutionState
+
+
+def test_headless_notifications(monkeypatch):
+    emitted_notifications = []
+    notify_method_after = notifications._notify_method_after
+
+    def notify_method_after_spy(self, instance, name, res_val, args, kwargs):
+        emitted_notifications.append(name)
+        notify_method_after(self, instance, name, res_val, args, kwargs)
+
+    monkeypatch.setattr(notifications, "_notify_method_after", notify_method_after_spy)
+    state = ExecutionState("state")
+    notifications.enable_headless_notifications()
+    try:
+        assert notifications.headless_notifications_enabled()
+        hash_before = state.mutable_hash().hexdigest()
+
+        # without observers, no notifications are emitted
+        state.name = "renamed"
+        assert not emitted_notifications
+        # the overrides of the notification methods are still called
+        assert state.mutable_hash().hexdigest() != hash_before
+
+        # registered observers are notified
+        observed_changes = []
+        observer = object()
+        state.add_observer(observer, "name",
+                           notify_after_function=lambda instance, res_val, args: observed_changes.append(args[1]))
+        state.name = "observed"
+        assert emitted_notifications == ["name"]
+        assert observed_changes == ["observed"]
+    finally:
+        notifications.disable_headless_notifications()
+    assert not notifications.headless_notifications_enabled()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
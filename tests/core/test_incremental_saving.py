@@ -0,0 +1,98 @@
+import io
+import os
+import stat
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.utils import storage_utils
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def create_state_machine():
+    root_state = HierarchyState("root")
+    for i in range(3):
+        state = ExecutionState("state" + str(i))
+        state.semantic_data["index"] = i
+        root_state.add_state(state)
+    return StateMachine(root_state)
+
+
+def get_file_inodes(path):
+    """Returns the inodes of all files, which change whenever a file is replaced"""
+    return dict((os.path.join(dir_path, file_name), os.stat(os.path.join(dir_path, file_name)).st_ino)
+                for dir_path, _, file_names in os.walk(path) for file_name in file_names)
+
+
+def test_incremental_saving():
+    path = os.path.join(testing_utils.get_unique_temp_path(), "state_machine")
+    state_machine = create_state_machine()
+    state = list(state_machine.root_state.states.values())[0]
+    storage.save_state_machine_to_path(state_machine, path)
+    inodes = get_file_inodes(path)
+    script_file = os.path.join(state.file_system_path, storage.SCRIPT_FILE)
+    core_data_file = os.path.join(state.file_system_path, storage.FILE_NAME_CORE_DATA)
+    state_machine_file = os.path.join(path, storage.STATEMACHINE_FILE)
+    try:
+        # only the changed script and the state machine file with the update time are written
+        state.script_text += "# changed\n"
+        storage.save_state_machine_to_path(state_machine, path)
+        new_inodes = get_file_inodes(path)
+        changed_files = set(path for path in inodes if inodes[path] != new_inodes[path])
+        assert changed_files - {state_machine_file} == {script_file}
+
+        # files modified by others are written again
+        storage_utils.write_dict_to_json({}, core_data_file)
+        storage.save_state_machine_to_path(state_machine, path)
+        assert storage.load_state_machine_from_path(path).root_state == state_machine.root_state
+
+        # files that already have the right content are not written, e.g. after loading
+        inodes = get_file_inodes(path)
+        storage.save_state_machine_to_path(storage.load_state_machine_from_path(path), path)
+        new_inodes = get_file_inodes(path)
+        assert set(path for path in inodes if inodes[path] != new_inodes[path]) <= {state_machine_file}
+
+        global_config.set_config_value("STORAGE_INCREMENTAL_SAVE", False)
+        storage.save_state_machine_to_path(state_machine, path)
+        inodes, new_inodes = new_inodes, get_file_inodes(path)
+        assert all(inodes[path] != new_inodes[path] for path in inodes)
+        # no temporary files are left
+        assert set(new_inodes) == set(inodes)
+    finally:
+        global_config.set_config_value("STORAGE_INCREMENTAL_SAVE", True)
+
+
+def test_write_file_if_changed():
+    path = testing_utils.get_unique_temp_path()
+    file_path = os.path.join(path, "script.py")
+    # non-ASCII content is written as UTF-8
+    assert storage.write_file_if_changed(file_path, u"# \u00e4\u00f6\u00fc\n")
+    with io.open(file_path, encoding='utf-8') as file_pointer:
+        assert file_pointer.read() == u"# \u00e4\u00f6\u00fc\n"
+
+    # the permissions of replaced files are kept
+    os.chmod(file_path, 0o751)
+    assert storage.write_file_if_changed(file_path, u"# changed\n")
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o751
+    assert not storage.write_file_if_changed(file_path, u"# changed\n")
+
+    # files modified by others between two saves are written again, even if their size and modification time did not
+    # change
+    file_stat = os.stat(file_path)
+    with io.open(file_path, 'w', encoding='utf-8') as file_pointer:
+        file_pointer.write(u"# edited!\n")
+    os.utime(file_path, (file_stat.st_atime, file_stat.st_mtime))
+    assert os.stat(file_path).st_size == file_stat.st_size
+    assert storage.write_file_if_changed(file_path, u"# changed\n")
+    with io.open(file_path, encoding='utf-8') as file_pointer:
+        assert file_pointer.read() == u"# changed\n"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
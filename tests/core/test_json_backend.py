@@ -0,0 +1,81 @@
+import os
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+from rafcon.core.storage import storage
+from rafcon.utils import storage_utils
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def get_json_files(path):
+    for folder_path, _, file_names in os.walk(path):
+        for file_name in (storage.STATEMACHINE_FILE, storage.FILE_NAME_CORE_DATA):
+            if file_name in file_names:
+                yield os.path.join(folder_path, file_name)
+
+
+def convert(json_string, json_backend):
+    storage_utils.json_backend = json_backend
+    try:
+        objects = storage_utils.load_objects_from_json_string(json_string)
+        return objects, storage_utils.dict_to_json_string(objects)
+    finally:
+        storage_utils.json_backend = storage_utils.JSON_BACKEND_JSONCONVERSION
+
+
+@pytest.mark.parametrize("state_machine_path", [
+    os.path.join(testing_utils.EXAMPLES_PATH, "functionality_examples"),
+    testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "multi_events_test"))
+])
+def test_fast_json_backend_is_compatible(caplog, state_machine_path):
+    testing_utils.initialize_environment_core()
+    try:
+        json_files = list(get_json_files(state_machine_path))
+        assert json_files
+        for json_file in json_files:
+            with open(json_file) as f:
+                json_string = f.read()
+            objects, fast_json_string = convert(json_string, storage_utils.JSON_BACKEND_FAST)
+            reference_objects, reference_json_string = convert(json_string,
+                                                               storage_utils.JSON_BACKEND_JSONCONVERSION)
+            assert type(objects) is type(reference_objects)
+            assert fast_json_string == reference_json_string
+            # objects decoded by one backend are encoded identically by the other one
+            storage_utils.json_backend = storage_utils.JSON_BACKEND_JSONCONVERSION
+            try:
+                assert storage_utils.dict_to_json_string(objects) == fast_json_string
+            finally:
+                storage_utils.json_backend = storage_utils.JSON_BACKEND_JSONCONVERSION
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_json_backend_is_selected_by_config(caplog):
+    state_machine_path = testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "multi_events_test"))
+    testing_utils.initialize_environment_core()
+    try:
+        storage.load_state_machine_from_path(state_machine_path)
+        assert storage_utils.json_backend == storage_utils.JSON_BACKEND_JSONCONVERSION
+        global_config.set_config_value("STORAGE_JSON_BACKEND", storage_utils.JSON_BACKEND_FAST)
+        storage.load_state_machine_from_path(state_machine_path)
+        assert storage_utils.json_backend == storage_utils.JSON_BACKEND_FAST
+    finally:
+        storage_utils.json_backend = storage_utils.JSON_BACKEND_JSONCONVERSION
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_fast_json_decoding():
+    storage_utils.json_backend = storage_utils.JSON_BACKEND_FAST
+    try:
+        json_string = storage_utils.dict_to_json_string({"1": (1, 2), "-2": {3, 4}, " 5": [float], "key": int})
+        assert storage_utils.load_objects_from_json_string(json_string) == \
+            {1: (1, 2), -2: {3, 4}, 5: [float], "key": int}
+    finally:
+        storage_utils.json_backend = storage_utils.JSON_BACKEND_JSONCONVERSION
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,83 @@
+import os
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.config import global_config
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT_TEXT = """
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+
+def create_library():
+    state = ExecutionState("execution")
+    state.script_text = SCRIPT_TEXT
+    state.add_input_data_port("input", "int", 0)
+    state.semantic_data["key"] = "value"
+    root_state = HierarchyState("library")
+    root_state.add_state(state)
+    root_state.set_start_state(state.state_id)
+    root_state.add_transition(state.state_id, 0, root_state.state_id, 0)
+    return StateMachine(root_state)
+
+
+def test_library_cache(caplog, monkeypatch):
+    testing_utils.initialize_environment_core()
+    cache_path = os.path.join(testing_utils.get_unique_temp_path(), "library_cache")
+    library_path = os.path.join(testing_utils.get_unique_temp_path(), "library")
+    storage.save_state_machine_to_path(create_library(), library_path)
+    try:
+        global_config.set_config_value("LIBRARY_CACHE_PATH", cache_path)
+        state_machine = storage.load_state_machine_from_path(library_path, use_library_cache=True)
+        assert len(os.listdir(cache_path)) == 1
+
+        # the cached library is loaded without reading the files of the library
+        read_state_files = storage.read_state_files
+        monkeypatch.setattr(storage, "read_state_files", None)
+        cached_state_machine = storage.load_state_machine_from_path(library_path, use_library_cache=True)
+        assert cached_state_machine.root_state == state_machine.root_state
+        cached_state = list(cached_state_machine.root_state.states.values())[0]
+        assert cached_state.script_text == SCRIPT_TEXT
+        assert cached_state.semantic_data["key"] == "value"
+        assert cached_state.file_system_path == list(state_machine.root_state.states.values())[0].file_system_path
+
+        # changes of the library invalidate the cache
+        monkeypatch.setattr(storage, "read_state_files", read_state_files)
+        with open(os.path.join(cached_state.file_system_path, storage.SCRIPT_FILE), 'w') as f:
+            f.write(SCRIPT_TEXT + "# changed\n")
+        changed_state_machine = storage.load_state_machine_from_path(library_path, use_library_cache=True)
+        changed_state = list(changed_state_machine.root_state.states.values())[0]
+        assert changed_state.script_text.endswith("# changed\n")
+
+        # the library manager uses the cache
+        rafcon.core.singleton.library_manager.clean_loaded_libraries()
+        monkeypatch.setattr(storage, "read_state_files", None)
+        version, state_copy = rafcon.core.singleton.library_manager.get_library_state_copy_instance(library_path)
+        assert list(state_copy.states.values())[0].script_text.endswith("# changed\n")
+
+        # a library loaded through a symbolic link has a cache entry of its own
+        monkeypatch.setattr(storage, "read_state_files", read_state_files)
+        linked_library_path = os.path.join(testing_utils.get_unique_temp_path(), "linked_library")
+        os.symlink(library_path, linked_library_path)
+        for _ in range(2):
+            linked_state_machine = storage.load_state_machine_from_path(linked_library_path, use_library_cache=True)
+            assert linked_state_machine.root_state == changed_state_machine.root_state
+            assert storage.load_state_machine_interface(linked_library_path, use_library_cache=True)
+        assert len(os.listdir(cache_path)) == 2
+    finally:
+        global_config.set_config_value("LIBRARY_CACHE_PATH", "")
+        rafcon.core.singleton.library_manager.clean_loaded_libraries()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,108 @@
+import os
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.utils import filesystem_watcher
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def create_library(name):
+    return StateMachine(ExecutionState(name))
+
+
+def inotify_available():
+    try:
+        filesystem_watcher.InotifyWatcher().close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+@pytest.mark.parametrize("watcher_type", [
+    filesystem_watcher.WATCHER_POLLING,
+    pytest.param(filesystem_watcher.WATCHER_INOTIFY,
+                 marks=pytest.mark.skipif(not inotify_available(), reason="inotify is not available"))
+])
+def test_incremental_library_refresh(caplog, monkeypatch, watcher_type):
+    library_root_path = os.path.join(testing_utils.get_unique_temp_path(), "libraries")
+    for library_path in ("first/library_a", "first/library_b", "second/library_c"):
+        storage.save_state_machine_to_path(create_library(os.path.basename(library_path)),
+                                           os.path.join(library_root_path, library_path))
+    testing_utils.initialize_environment_core({"LIBRARY_WATCHER": watcher_type},
+                                              libraries={"watched": library_root_path})
+    library_manager = rafcon.core.singleton.library_manager
+    listed_paths = []
+    listdir = os.listdir
+
+    def listdir_spy(path):
+        listed_paths.append(path)
+        return listdir(path)
+
+    try:
+        assert set(library_manager.libraries["watched"]["first"]) == {"library_a", "library_b"}
+        library_a_path = library_manager.libraries["watched"]["first"]["library_a"]
+        library_c_path = library_manager.libraries["watched"]["second"]["library_c"]
+        library_manager.get_library_template(library_a_path)
+        library_manager.get_library_template(library_c_path)
+
+        # unchanged folders are not read again
+        monkeypatch.setattr(os, "listdir", listdir_spy)
+        library_manager.refresh_libraries()
+        assert not listed_paths
+        assert set(library_manager.libraries["watched"]) == {"first", "second"}
+
+        # only the changed folder and the folders containing it are read again
+        monkeypatch.setattr(os, "listdir", listdir)
+        storage.save_state_machine_to_path(create_library("library_d"),
+                                           os.path.join(library_root_path, "second", "library_d"))
+        monkeypatch.setattr(os, "listdir", listdir_spy)
+        library_manager.refresh_libraries()
+        monkeypatch.setattr(os, "listdir", listdir)
+        assert set(listed_paths) == {library_root_path, os.path.join(library_root_path, "second")}
+        assert set(library_manager.libraries["watched"]["second"]) == {"library_c", "library_d"}
+        assert set(library_manager.libraries["watched"]["first"]) == {"library_a", "library_b"}
+
+        # only the changed library is loaded again
+        state_folder = next(folder_path for folder_path, _, file_names in os.walk(library_a_path)
+                            if storage.SCRIPT_FILE in file_names)
+        with open(os.path.join(state_folder, storage.SCRIPT_FILE), 'a') as f:
+            f.write("# changed\n")
+        library_manager.refresh_libraries()
+        assert library_a_path not in library_manager._loaded_libraries
+        assert library_c_path in library_manager._loaded_libraries
+        _, root_state = library_manager.get_library_template(library_a_path)
+        assert root_state.script_text.endswith("# changed\n")
+    finally:
+        monkeypatch.setattr(os, "listdir", listdir)
+        library_watcher = library_manager._library_watcher
+        library_manager.prepare_destruction()
+        assert library_manager._library_watcher is None
+        if watcher_type == filesystem_watcher.WATCHER_INOTIFY:
+            assert library_watcher._fd == -1
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+@pytest.mark.skipif(not inotify_available(), reason="inotify is not available")
+def test_inotify_watcher_falls_back_to_polling():
+    watcher = filesystem_watcher.InotifyWatcher()
+    missing_path = os.path.join(testing_utils.get_unique_temp_path(), "missing")
+    try:
+        # directories that cannot be watched with inotify are polled
+        watcher.watch(missing_path)
+        assert missing_path not in watcher._descriptors
+        assert not watcher.get_changed_paths()
+        os.makedirs(missing_path)
+        assert watcher.get_changed_paths() == {missing_path}
+        watcher.unwatch(missing_path)
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,99 @@
+import os
+import pytest
+
+# core elements
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+from rafcon.utils import storage_utils
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT_TEXT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["output"] = inputs["input"] + 1
+    return 0
+"""
+
+
+def create_state_machine():
+    state = ExecutionState("execution")
+    state.script_text = SCRIPT_TEXT
+    input_id = state.add_input_data_port("input", "int", 0)
+    output_id = state.add_output_data_port("output", "int", 0)
+    state.semantic_data["key"] = "value"
+    root_state = HierarchyState("root")
+    root_state.add_state(state)
+    root_state.set_start_state(state.state_id)
+    root_state.add_transition(state.state_id, 0, root_state.state_id, 0)
+    root_input_id = root_state.add_input_data_port("input", "int", 1)
+    root_output_id = root_state.add_output_data_port("output", "int", 0)
+    root_state.add_data_flow(root_state.state_id, root_input_id, state.state_id, input_id)
+    root_state.add_data_flow(state.state_id, output_id, root_state.state_id, root_output_id)
+    return StateMachine(root_state)
+
+
+def test_packed_state_machine(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        state_machine = create_state_machine()
+        file_path = os.path.join(testing_utils.get_unique_temp_path(), "packed" + storage.PACKED_STATE_MACHINE_EXTENSION)
+        storage.save_state_machine_to_path(state_machine, file_path)
+        assert os.path.isfile(file_path)
+        assert storage.is_packed_state_machine(file_path)
+        assert state_machine.file_system_path == file_path
+        assert not state_machine.marked_dirty
+
+        loaded_state_machine = storage.load_state_machine_from_path(file_path)
+        assert loaded_state_machine.root_state == state_machine.root_state
+        assert loaded_state_machine.file_system_path == file_path
+        child_state = list(loaded_state_machine.root_state.states.values())[0]
+        assert child_state.script_text == SCRIPT_TEXT
+        assert child_state.semantic_data["key"] == "value"
+        # the states get paths within the folder the archive was unpacked to
+        unpacked_path = storage.get_unpacked_path(file_path)
+        assert child_state.file_system_path.startswith(unpacked_path + os.sep)
+        assert os.path.isfile(os.path.join(child_state.file_system_path, storage.SCRIPT_FILE))
+
+        # meta data stored in the unpacked folder, e.g. by the GUI, is packed as well
+        storage_utils.write_dict_to_json({"gui": "meta"},
+                                         os.path.join(child_state.file_system_path, storage.FILE_NAME_META_DATA))
+        storage.pack_state_machine(file_path)
+        storage.load_state_machine_from_path(file_path)
+        assert storage.load_data_file(os.path.join(child_state.file_system_path, storage.FILE_NAME_META_DATA)) == \
+            {"gui": "meta"}
+
+        # saving again replaces the archive
+        loaded_state_machine.root_state.name = "renamed"
+        storage.save_state_machine_to_path(loaded_state_machine, file_path)
+        assert storage.load_state_machine_from_path(file_path).root_state.name == "renamed"
+        assert os.listdir(os.path.dirname(file_path)) == [os.path.basename(file_path)]
+
+        # the unpacked folders are removed on exit
+        storage._remove_unpacked_paths()
+        assert not os.path.exists(unpacked_path)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_pack_existing_state_machine(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        path = testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", "stepping_test_with_library"))
+        state_machine = storage.load_state_machine_from_path(path)
+        file_path = os.path.join(testing_utils.get_unique_temp_path(), "packed" + storage.PACKED_STATE_MACHINE_EXTENSION)
+        storage.save_state_machine_to_path(state_machine, file_path, as_copy=True)
+        assert state_machine.file_system_path == path
+
+        loaded_state_machine = storage.load_state_machine_from_path(file_path)
+        assert loaded_state_machine.root_state == state_machine.root_state
+        assert loaded_state_machine.root_state.get_states_statistics(0) == \
+            state_machine.root_state.get_states_statistics(0)
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
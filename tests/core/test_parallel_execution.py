@@ -0,0 +1,153 @@
+from builtins import range
+import pytest
+
+# core elements
+from rafcon.core.singleton import state_machine_execution_engine, state_machine_manager, global_variable_manager
+from rafcon.core.execution.execution_status import StateMachineExecutionStatus
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+
+number_of_state_machines = 30
+
+FAST_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+RELEASED_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    while not gvm.variable_exist("released"):
+        self.preemptive_wait(0.01)
+    return 0
+"""
+
+WAITING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    self.preemptive_wait(10)
+    return 0
+"""
+
+
+def create_state_machine(name, script_text=FAST_SCRIPT, number_of_states=3):
+    root_state = HierarchyState(name)
+    previous_state = None
+    for i in range(number_of_states):
+        state = ExecutionState("state" + str(i))
+        state.script_text = script_text
+        root_state.add_state(state)
+        if previous_state is None:
+            root_state.set_start_state(state.state_id)
+        else:
+            root_state.add_transition(previous_state.state_id, 0, state.state_id, None)
+        previous_state = state
+    root_state.add_transition(previous_state.state_id, 0, root_state.state_id, 0)
+    state_machine = StateMachine(root_state)
+    state_machine_manager.add_state_machine(state_machine)
+    return state_machine
+
+
+def test_parallel_execution_stress(caplog):
+    testing_utils.initialize_environment_core()
+    state_machines = [create_state_machine("parallel" + str(i), RELEASED_SCRIPT)
+                      for i in range(number_of_state_machines)]
+    try:
+        for state_machine in state_machines:
+            state_machine_execution_engine.start(state_machine.state_machine_id)
+        global_variable_manager.set_variable("released", True)
+
+        # the first state machine is executed in the default context, all others in contexts of their own
+        contexts = [state_machine_execution_engine.get_execution_context(state_machine.state_machine_id)
+                    for state_machine in state_machines]
+        assert contexts[0] is state_machine_execution_engine.get_execution_context()
+        assert len(set(contexts)) == number_of_state_machines
+
+        for state_machine in state_machines:
+            assert state_machine_execution_engine.join(state_machine_id=state_machine.state_machine_id)
+            assert state_machine_execution_engine.finished_or_stopped(state_machine.state_machine_id)
+            assert state_machine.root_state.final_outcome.outcome_id == 0
+            assert len(state_machine.execution_histories) == 1
+    finally:
+        for state_machine in state_machines:
+            state_machine_execution_engine.stop(state_machine.state_machine_id)
+            state_machine_execution_engine.join(state_machine_id=state_machine.state_machine_id)
+            state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        if global_variable_manager.variable_exist("released"):
+            global_variable_manager.delete_variable("released")
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_independent_execution_control(caplog):
+    testing_utils.initialize_environment_core()
+    waiting_state_machine = create_state_machine("waiting", WAITING_SCRIPT, number_of_states=1)
+    paused_state_machine = create_state_machine("paused")
+    finishing_state_machine = create_state_machine("finishing")
+    state_machines = [waiting_state_machine, paused_state_machine, finishing_state_machine]
+    try:
+        state_machine_execution_engine.start(waiting_state_machine.state_machine_id)
+        state_machine_execution_engine.start(paused_state_machine.state_machine_id)
+        state_machine_execution_engine.pause(paused_state_machine.state_machine_id)
+        paused_context = state_machine_execution_engine.get_execution_context(paused_state_machine.state_machine_id)
+        assert paused_context.status.execution_mode is StateMachineExecutionStatus.PAUSED
+        assert state_machine_execution_engine.status.execution_mode is StateMachineExecutionStatus.STARTED
+
+        # another state machine finishes, while the first one waits and the second one is paused
+        state_machine_execution_engine.start(finishing_state_machine.state_machine_id)
+        assert state_machine_execution_engine.join(state_machine_id=finishing_state_machine.state_machine_id)
+        assert finishing_state_machine.root_state.final_outcome.outcome_id == 0
+        assert paused_context.status.execution_mode is StateMachineExecutionStatus.PAUSED
+        assert paused_context.state_machine_running
+        assert state_machine_manager.active_state_machine_id == waiting_state_machine.state_machine_id
+
+        # the paused state machine is resumed without affecting the waiting one
+        state_machine_execution_engine.start(paused_state_machine.state_machine_id)
+        assert state_machine_execution_engine.join(state_machine_id=paused_state_machine.state_machine_id)
+        assert paused_state_machine.root_state.final_outcome.outcome_id == 0
+        assert not state_machine_execution_engine.finished_or_stopped()
+
+        # stopping the waiting state machine preempts it
+        state_machine_execution_engine.stop(waiting_state_machine.state_machine_id)
+        assert state_machine_execution_engine.join(state_machine_id=waiting_state_machine.state_machine_id)
+        assert waiting_state_machine.root_state.final_outcome.outcome_id == -2
+        assert state_machine_manager.active_state_machine_id is None
+    finally:
+        for state_machine in state_machines:
+            state_machine_execution_engine.stop(state_machine.state_machine_id)
+            state_machine_execution_engine.join(state_machine_id=state_machine.state_machine_id)
+            state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_control_of_state_machine_not_executed(caplog):
+    testing_utils.initialize_environment_core()
+    waiting_state_machine = create_state_machine("waiting", WAITING_SCRIPT, number_of_states=1)
+    idle_state_machine = create_state_machine("idle")
+    state_machines = [waiting_state_machine, idle_state_machine]
+    try:
+        state_machine_execution_engine.start(waiting_state_machine.state_machine_id)
+        assert state_machine_execution_engine.get_execution_context(idle_state_machine.state_machine_id) is None
+        assert state_machine_execution_engine.finished_or_stopped(idle_state_machine.state_machine_id)
+
+        # controlling a state machine that is not executed does not affect the executed one
+        state_machine_execution_engine.pause(idle_state_machine.state_machine_id)
+        state_machine_execution_engine.stop(idle_state_machine.state_machine_id)
+        assert not state_machine_execution_engine.join(0.1, idle_state_machine.state_machine_id)
+        assert state_machine_execution_engine.status.execution_mode is StateMachineExecutionStatus.STARTED
+        assert not waiting_state_machine.root_state.preempted
+
+        state_machine_execution_engine.stop(waiting_state_machine.state_machine_id)
+        assert state_machine_execution_engine.join(state_machine_id=waiting_state_machine.state_machine_id)
+        assert waiting_state_machine.root_state.final_outcome.outcome_id == -2
+    finally:
+        for state_machine in state_machines:
+            state_machine_execution_engine.stop(state_machine.state_machine_id)
+            state_machine_execution_engine.join(state_machine_id=state_machine.state_machine_id)
+            state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_warnings=6)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,38 @@
+import os
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+from rafcon.core.storage import storage
+
+# test environment elements
+from tests import utils as testing_utils
+
+
+def load_state_machine(path, number_of_threads):
+    try:
+        global_config.set_config_value("STATE_MACHINE_LOADER_THREADS", number_of_threads)
+        return storage.load_state_machine_from_path(path)
+    finally:
+        global_config.set_config_value("STATE_MACHINE_LOADER_THREADS", 8)
+
+
+@pytest.mark.parametrize("state_machine_name", ["stepping_test_with_library",
+                                                os.path.join("backward_compatibility", "0.14.0")])
+def test_parallel_loading(caplog, state_machine_name):
+    testing_utils.initialize_environment_core()
+    try:
+        path = testing_utils.get_test_sm_path(os.path.join("unit_test_state_machines", state_machine_name))
+        state_machine = load_state_machine(path, 0)
+        parallel_loaded_state_machine = load_state_machine(path, 4)
+
+        assert parallel_loaded_state_machine.root_state == state_machine.root_state
+        assert parallel_loaded_state_machine.root_state.get_states_statistics(0) == \
+            state_machine.root_state.get_states_statistics(0)
+        assert parallel_loaded_state_machine.file_system_path == state_machine.file_system_path
+    finally:
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
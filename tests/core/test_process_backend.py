@@ -0,0 +1,147 @@
+import os
+import time
+from copy import copy
+import pytest
+
+# core elements
+from rafcon.core.storage import storage
+from rafcon.core.singleton import global_variable_manager, state_machine_manager, state_machine_execution_engine
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+from rafcon.core.execution.process_pool import shutdown_script_process_pool
+
+# test environment elements
+from tests import utils as testing_utils
+
+number_of_branches = 3
+
+SCRIPT_TEXT = """
+import os
+
+def execute(self, inputs, outputs, gvm):
+    self.persistent_variables["runs"] = self.persistent_variables.get("runs", 0) + 1
+    gvm.set_variable(self.name, inputs["value"] * 2)
+    outputs["pid"] = os.getpid()
+    outputs["value"] = gvm.get_variable(self.name) + gvm.get_variable("offset")
+    return "success"
+"""
+
+DECIDER_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+WAITING_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    if self.preemptive_wait(10):
+        return "preempted"
+    return 0
+"""
+
+ERROR_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    raise ValueError("failure in worker")
+"""
+
+
+def create_process_state(name, script_text=SCRIPT_TEXT, value=0):
+    state = ExecutionState(name)
+    state.add_input_data_port("value", "int", value)
+    state.add_output_data_port("value", "int")
+    state.add_output_data_port("pid", "int")
+    state.script_text = script_text
+    state.execution_backend = "process"
+    return state
+
+
+def create_state_machine():
+    barrier_state = BarrierConcurrencyState("barrier")
+    for i in range(number_of_branches):
+        state = create_process_state("branch" + str(i), value=i)
+        barrier_state.add_state(state)
+    decider_state = barrier_state.states[UNIQUE_DECIDER_STATE_ID]
+    decider_state.script_text = DECIDER_SCRIPT
+    barrier_state.add_transition(decider_state.state_id, 0, barrier_state.state_id, 0)
+    return StateMachine(barrier_state)
+
+
+def execute(state_machine):
+    state_machine_manager.add_state_machine(state_machine)
+    state_machine_execution_engine.start(state_machine.state_machine_id)
+    state_machine_execution_engine.join()
+    state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+
+
+def test_process_backend(caplog):
+    testing_utils.initialize_environment_core({"SCRIPT_PROCESS_POOL_SIZE": 2})
+    try:
+        state_machine = create_state_machine()
+        global_variable_manager.set_variable("offset", 1)
+        branches = sorted((state for state in state_machine.root_state.states.values()
+                           if state.state_id != UNIQUE_DECIDER_STATE_ID), key=lambda state: state.name)
+        for _ in range(2):
+            execute(state_machine)
+        assert state_machine.root_state.final_outcome.outcome_id == 0
+
+        # the scripts are executed in the worker processes, with inputs, outputs and global variables transferred
+        worker_pids = set()
+        for index, state in enumerate(branches):
+            assert state.output_data["value"] == index * 2 + 1
+            assert state.output_data["pid"] != os.getpid()
+            worker_pids.add(state.output_data["pid"])
+            assert global_variable_manager.get_variable(state.name) == index * 2
+            assert state.persistent_variables["runs"] == 2
+        assert 1 <= len(worker_pids) <= 2
+    finally:
+        shutdown_script_process_pool()
+        testing_utils.remove_all_gvm_variables()
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_process_backend_preemption_and_errors(caplog):
+    testing_utils.initialize_environment_core()
+    try:
+        waiting_state = create_process_state("waiting", WAITING_SCRIPT)
+        state_machine = StateMachine(waiting_state)
+        state_machine_manager.add_state_machine(state_machine)
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        time.sleep(0.5)
+        start_time = time.time()
+        state_machine_execution_engine.stop()
+        state_machine_execution_engine.join()
+        state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        assert time.time() - start_time < 2
+        assert waiting_state.final_outcome.outcome_id == -2
+
+        # errors of the script are raised in the RAFCON process
+        error_state = create_process_state("error", ERROR_SCRIPT)
+        execute(StateMachine(error_state))
+        assert error_state.final_outcome.outcome_id == -1
+        assert isinstance(error_state.output_data["error"], ValueError)
+    finally:
+        shutdown_script_process_pool()
+        testing_utils.shutdown_environment_only_core(caplog=caplog, expected_errors=1)
+
+
+def test_process_backend_storage():
+    state = create_process_state("stored")
+    path = testing_utils.get_unique_temp_path()
+    storage.save_state_machine_to_path(StateMachine(state), path)
+    loaded_state_machine = storage.load_state_machine_from_path(path)
+    assert loaded_state_machine.root_state.execution_backend == "process"
+    assert loaded_state_machine.root_state == state
+
+    # states differing only in their execution backend are neither equal nor hashed equally
+    thread_state = copy(state)
+    thread_state.execution_backend = "thread"
+    assert thread_state != state
+    assert thread_state.get_hash_digest() != state.get_hash_digest()
+
+    with pytest.raises(ValueError):
+        state.execution_backend = "cluster"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
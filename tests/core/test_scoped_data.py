@@ -68,5 +68,34 @@ def test_scoped_data(caplog):
         testing_utils.assert_logger_warnings_and_errors(caplog)
 
 
+def test_scoped_data_routing_follows_data_flows():
+    root_state = create_state_machine().root_state
+    state1 = [state for state in root_state.states.values() if state.name == "first_state"][0]
+    state2 = [state for state in root_state.states.values() if state.name == "second_state"][0]
+    root_input_id = root_state.get_io_data_port_id_from_name_and_type("data_input_port1", InputDataPort)
+    state1_output_id = state1.get_io_data_port_id_from_name_and_type("data_output_port1", OutputDataPort)
+    scoped_variable_id = root_state.add_scoped_variable("scoped_variable1", "float", 0.)
+
+    root_state.add_input_data_to_scoped_data({"data_input_port1": 1.0})
+    assert root_state.get_inputs_for_state(state1) == {"data_input_port1": 1.0}
+    assert root_state.get_inputs_for_state(state2) == {"data_input_port1": None}
+
+    # the routing tables are updated when data flows are added ...
+    data_flow_id = root_state.add_data_flow(root_state.state_id, root_input_id, root_state.state_id,
+                                            scoped_variable_id)
+    root_state.add_input_data_to_scoped_data({"data_input_port1": 2.0})
+    assert root_state.scoped_data[str(scoped_variable_id) + root_state.state_id].value == 2.0
+
+    # ... modified ...
+    root_state.data_flows[data_flow_id].modify_origin(state1.state_id, state1_output_id)
+    root_state.update_scoped_variables_with_output_dictionary({"data_output_port1": 3.0}, state1)
+    assert root_state.scoped_data[str(scoped_variable_id) + root_state.state_id].value == 3.0
+
+    # ... and removed
+    root_state.remove_data_flow(data_flow_id)
+    root_state.update_scoped_variables_with_output_dictionary({"data_output_port1": 4.0}, state1)
+    assert root_state.scoped_data[str(scoped_variable_id) + root_state.state_id].value == 3.0
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
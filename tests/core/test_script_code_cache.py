@@ -0,0 +1,150 @@
+import os
+import threading
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+import rafcon.core.script as script_module
+from rafcon.core.script import Script, get_compiled_code, clear_code_cache
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.singleton import state_machine_manager, state_machine_execution_engine
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT_TEXT = """
+counter = 0
+
+def execute(self, inputs, outputs, gvm):
+    global counter
+    counter += 1
+    outputs["counter"] = counter
+    return 0
+"""
+
+
+def test_code_cache():
+    code = get_compiled_code(SCRIPT_TEXT, "script.py")
+    assert get_compiled_code(SCRIPT_TEXT, "script.py") is code
+    assert get_compiled_code(SCRIPT_TEXT, "other_script.py") is not code
+    assert get_compiled_code(SCRIPT_TEXT + "\n", "script.py") is not code
+
+
+def test_recompilation_with_code_cache():
+    script = Script()
+    script.script = SCRIPT_TEXT
+    outputs = {"counter": None}
+    try:
+        # the module is built anew for each execution, even though the script is not compiled again
+        global_config.set_config_value("SCRIPT_RECOMPILATION_ON_STATE_EXECUTION", True)
+        for _ in range(2):
+            script.execute(None, outputs=outputs)
+            assert outputs["counter"] == 1
+
+        # changes of the script are applied on the next execution
+        script.script = SCRIPT_TEXT.replace("counter += 1", "counter += 2")
+        script.execute(None, outputs=outputs)
+        assert outputs["counter"] == 2
+    finally:
+        global_config.set_config_value("SCRIPT_RECOMPILATION_ON_STATE_EXECUTION", True)
+
+
+def test_persistent_code_cache():
+    cache_path = os.path.join(testing_utils.get_unique_temp_path(), "code_cache")
+    try:
+        global_config.set_config_value("SCRIPT_CODE_CACHE_PATH", cache_path)
+        code = get_compiled_code(SCRIPT_TEXT, "persistent_script.py")
+        assert len(os.listdir(cache_path)) == 1
+
+        clear_code_cache()
+        loaded_code = get_compiled_code(SCRIPT_TEXT, "persistent_script.py")
+        assert loaded_code is not code
+        assert loaded_code == code
+
+        # corrupt cache files are ignored
+        cache_file = os.path.join(cache_path, os.listdir(cache_path)[0])
+        with open(cache_file, 'wb') as f:
+            f.write(b'corrupt')
+        clear_code_cache()
+        assert get_compiled_code(SCRIPT_TEXT, "persistent_script.py") == code
+    finally:
+        global_config.set_config_value("SCRIPT_CODE_CACHE_PATH", "")
+
+
+def test_bounded_code_cache(monkeypatch):
+    cache_path = os.path.join(testing_utils.get_unique_temp_path(), "code_cache")
+    monkeypatch.setattr(script_module, "CODE_CACHE_MAX_ENTRIES", 3)
+    monkeypatch.setattr(script_module, "CODE_CACHE_MAX_FILES", 3)
+    try:
+        global_config.set_config_value("SCRIPT_CODE_CACHE_PATH", cache_path)
+        clear_code_cache()
+        first_code = get_compiled_code(SCRIPT_TEXT, "script_0.py")
+        for i in range(1, 5):
+            # the first script is used recently and thus not removed
+            assert get_compiled_code(SCRIPT_TEXT, "script_0.py") is first_code
+            get_compiled_code(SCRIPT_TEXT, "script_{0}.py".format(i))
+            assert len(script_module._code_cache) <= 3
+            assert len(os.listdir(cache_path)) <= 3
+        assert get_compiled_code(SCRIPT_TEXT, "script_0.py") is first_code
+        assert len(script_module._code_cache) == 3
+    finally:
+        global_config.set_config_value("SCRIPT_CODE_CACHE_PATH", "")
+        clear_code_cache()
+
+
+# the module body of each script waits for the module body of the other script
+RENDEZVOUS_SCRIPT_TEXT = """
+import tests.core.test_script_code_cache as test_module
+test_module.rendezvous.wait(5)
+
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+rendezvous = threading.Barrier(2)
+
+
+def test_concurrent_compilation():
+    scripts = [Script(), Script()]
+    for script in scripts:
+        script.script = RENDEZVOUS_SCRIPT_TEXT
+    threads = [threading.Thread(target=script.compile_module) for script in scripts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not rendezvous.broken
+    assert all(script.compiled_module for script in scripts)
+
+
+def test_precompilation_on_start(caplog, monkeypatch):
+    testing_utils.initialize_environment_core({"SCRIPT_RECOMPILATION_ON_STATE_EXECUTION": True})
+    precompiled_scripts = []
+    precompile = Script.precompile
+
+    def precompile_spy(script):
+        precompiled_scripts.append(script)
+        precompile(script)
+    monkeypatch.setattr(Script, "precompile", precompile_spy)
+
+    barrier_state = BarrierConcurrencyState("barrier_concurrency")
+    for i in range(4):
+        barrier_state.add_state(ExecutionState("branch" + str(i)))
+    barrier_state.add_transition(barrier_state.states[UNIQUE_DECIDER_STATE_ID].state_id, 0, barrier_state.state_id, 0)
+    state_machine = StateMachine(barrier_state)
+    state_machine_manager.add_state_machine(state_machine)
+    try:
+        state_machine_execution_engine.start(state_machine.state_machine_id)
+        state_machine_execution_engine.join()
+        # the scripts of the branches and of the decider state
+        assert len(precompiled_scripts) == 5
+    finally:
+        state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
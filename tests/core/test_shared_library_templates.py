@@ -0,0 +1,143 @@
+import os
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.states.library_state import LibraryState
+from rafcon.core.state_elements.data_port import InputDataPort, OutputDataPort
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+
+# test environment elements
+from tests import utils as testing_utils
+
+SCRIPT_TEXT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["output"] = inputs["input"] + 1
+    return 0
+"""
+
+number_of_library_states = 3
+
+
+def create_library():
+    state = ExecutionState("increment")
+    state.script_text = SCRIPT_TEXT
+    state.add_input_data_port("input", "int", 0)
+    state.add_output_data_port("output", "int")
+    return StateMachine(state)
+
+
+def create_state_machine(library_name="increment"):
+    root_state = HierarchyState("root")
+    last_state = None
+    for i in range(number_of_library_states):
+        state = LibraryState("shared_templates", library_name, "0.1", library_name + str(i))
+        root_state.add_state(state)
+        input_id = state.get_io_data_port_id_from_name_and_type("input", InputDataPort)
+        if last_state is None:
+            root_state.set_start_state(state.state_id)
+            root_input_id = root_state.add_input_data_port("input", "int", 1)
+            root_state.add_data_flow(root_state.state_id, root_input_id, state.state_id, input_id)
+        else:
+            root_state.add_transition(last_state.state_id, 0, state.state_id, None)
+            root_state.add_data_flow(last_state.state_id,
+                                     last_state.get_io_data_port_id_from_name_and_type("output", OutputDataPort),
+                                     state.state_id, input_id)
+        last_state = state
+    root_state.add_transition(last_state.state_id, 0, root_state.state_id, 0)
+    root_output_id = root_state.add_output_data_port("output", "int")
+    root_state.add_data_flow(last_state.state_id,
+                             last_state.get_io_data_port_id_from_name_and_type("output", OutputDataPort),
+                             root_state.state_id, root_output_id)
+    return StateMachine(root_state)
+
+
+def test_shared_library_templates(caplog):
+    library_root_path = os.path.join(testing_utils.get_unique_temp_path(), "libraries")
+    storage.save_state_machine_to_path(create_library(), os.path.join(library_root_path, "increment"))
+    testing_utils.initialize_environment_core({"LIBRARY_STATE_SHARED_TEMPLATES": True},
+                                              libraries={"shared_templates": library_root_path})
+    state_machine_path = os.path.join(testing_utils.get_unique_temp_path(), "state_machine")
+    storage.save_state_machine_to_path(create_state_machine(), state_machine_path)
+    state_machine = storage.load_state_machine_from_path(state_machine_path)
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    try:
+        library_states = list(state_machine.root_state.states.values())
+        template = library_states[0].library_root_state
+        # the library states are not copied when they are loaded, but share the root state of the library
+        for library_state in library_states:
+            assert library_state._state_copy is None
+            assert library_state.library_root_state is template
+            assert library_state.outcomes[0].parent is library_state
+        assert state_machine.root_state.get_states_statistics(0) == (4, 2)
+
+        # collecting the scripts to be compiled on start does not create the state copies
+        execution_engine = rafcon.core.singleton.state_machine_execution_engine
+        assert not execution_engine._get_execution_states_recursively(state_machine)
+        assert not any(library_state.state_copy_initialized for library_state in library_states)
+
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        assert state_machine.root_state.output_data["output"] == 4
+
+        # the executed library states got their own copy, the template was not used for the execution
+        for library_state in library_states:
+            state_copy = library_state._state_copy
+            assert state_copy is not None and state_copy is not template
+            assert state_copy.parent is library_state
+            assert state_copy.outcomes is library_state.outcomes
+            assert state_copy.get_path().startswith(library_state.get_path())
+        assert template.output_data == {}
+
+        # changes of a state copy do not affect the template and the other library states
+        library_states[0].state_copy.script_text = SCRIPT_TEXT.replace("+ 1", "+ 2")
+        assert template.script_text == SCRIPT_TEXT
+        assert library_states[1].state_copy.script_text == SCRIPT_TEXT
+    finally:
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+def test_lazy_library_loading(caplog):
+    library_root_path = os.path.join(testing_utils.get_unique_temp_path(), "libraries")
+    storage.save_state_machine_to_path(create_library(), os.path.join(library_root_path, "increment"))
+    testing_utils.initialize_environment_core({"LIBRARY_STATE_LAZY_LOADING": True},
+                                              libraries={"shared_templates": library_root_path})
+    library_manager = rafcon.core.singleton.library_manager
+    # a library using the increment library three times
+    storage.save_state_machine_to_path(create_state_machine(), os.path.join(library_root_path, "nested"))
+    library_manager.refresh_libraries()
+    state_machine_path = os.path.join(testing_utils.get_unique_temp_path(), "state_machine")
+    storage.save_state_machine_to_path(create_state_machine("nested"), state_machine_path)
+    library_manager.clean_loaded_libraries()
+    state_machine = storage.load_state_machine_from_path(state_machine_path)
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    try:
+        # only the interface of the nested library was read
+        assert not library_manager._loaded_libraries
+        assert list(library_manager._library_interfaces) == [os.path.join(library_root_path, "nested")]
+        library_states = list(state_machine.root_state.states.values())
+        for library_state in library_states:
+            assert not library_state.state_copy_initialized
+            assert library_state.get_number_of_transitions() == 0
+        assert state_machine.root_state.get_states_statistics(0) == (4, 2)
+
+        rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+        rafcon.core.singleton.state_machine_execution_engine.join()
+        assert state_machine.root_state.output_data["output"] == 10
+
+        # both libraries were loaded during the execution
+        assert len(library_manager._loaded_libraries) == 2
+        for library_state in library_states:
+            assert library_state.state_copy_initialized
+            assert library_state.get_number_of_transitions() == 4
+    finally:
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
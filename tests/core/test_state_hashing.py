@@ -0,0 +1,111 @@
+from builtins import range
+from copy import deepcopy
+import pytest
+
+# core elements
+from rafcon.core.states.state import State
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_elements.data_port import InputDataPort
+from rafcon.core.state_machine import StateMachine
+
+
+def create_state_machine():
+    root_state = HierarchyState("root")
+    for i in range(3):
+        hierarchy_state = HierarchyState("hierarchy" + str(i))
+        for j in range(3):
+            state = ExecutionState("execution" + str(j))
+            state.add_input_data_port("input", "int", 0)
+            hierarchy_state.add_state(state)
+        root_state.add_state(hierarchy_state)
+    return StateMachine(root_state)
+
+
+def get_hash(state_machine):
+    return state_machine.mutable_hash().hexdigest()
+
+
+def test_cached_state_hashes(monkeypatch):
+    state_machine = create_state_machine()
+    initial_hash = get_hash(state_machine)
+    assert get_hash(deepcopy(state_machine)) == initial_hash
+
+    hashed_states = []
+    update_hash_of_content = State.update_hash_of_content
+
+    def update_hash_of_content_spy(self, obj_hash):
+        hashed_states.append(self)
+        update_hash_of_content(self, obj_hash)
+
+    monkeypatch.setattr(State, "update_hash_of_content", update_hash_of_content_spy)
+
+    # unchanged states are not hashed again
+    assert get_hash(state_machine) == initial_hash
+    assert not hashed_states
+
+    # only the modified state and its ancestors are hashed again
+    hierarchy_state = list(state_machine.root_state.states.values())[0]
+    execution_state = list(hierarchy_state.states.values())[0]
+    execution_state.script_text = "# changed"
+    changed_hash = get_hash(state_machine)
+    assert changed_hash != initial_hash
+    assert set(hashed_states) == {execution_state, hierarchy_state, state_machine.root_state}
+
+    # modifications of state elements change the hash of their state
+    del hashed_states[:]
+    input_data_port_id = execution_state.get_io_data_port_id_from_name_and_type("input", InputDataPort)
+    execution_state.input_data_ports[input_data_port_id].default_value = 1
+    assert get_hash(state_machine) not in (initial_hash, changed_hash)
+    assert set(hashed_states) == {execution_state, hierarchy_state, state_machine.root_state}
+
+    # the cached hashes equal the hashes of a new state machine
+    monkeypatch.undo()
+    assert get_hash(deepcopy(state_machine)) == get_hash(state_machine)
+
+    # execution data does not change the hash
+    hashed_states = []
+    monkeypatch.setattr(State, "update_hash_of_content", update_hash_of_content_spy)
+    execution_state.output_data = {"output": 1}
+    get_hash(state_machine)
+    assert not hashed_states
+
+
+def test_hash_invalidation_of_unobserved_modifications():
+    state_machine = create_state_machine()
+    hierarchy_state = list(state_machine.root_state.states.values())[0]
+    execution_state = list(hierarchy_state.states.values())[0]
+    hashes = [get_hash(state_machine)]
+
+    def assert_hash_changed():
+        new_hash = get_hash(state_machine)
+        assert new_hash not in hashes
+        assert get_hash(deepcopy(state_machine)) == new_hash
+        hashes.append(new_hash)
+
+    execution_state.change_state_id("NEWID")
+    assert_hash_changed()
+
+    # the script is not observed by its state
+    execution_state.script.script = "# changed"
+    assert_hash_changed()
+
+    # semantic data changed in place
+    execution_state.semantic_data["key"] = "value"
+    assert_hash_changed()
+    execution_state.semantic_data["nested"]["key"] = 1
+    assert_hash_changed()
+    execution_state.semantic_data["nested"]["key"] = 2
+    assert_hash_changed()
+    del execution_state.semantic_data["key"]
+    assert_hash_changed()
+
+    # the semantic data of copied states invalidates the hash of the copy
+    copied_state = deepcopy(execution_state)
+    copied_state.semantic_data["copy"] = True
+    assert get_hash(state_machine) == hashes[-1]
+    assert "copy" not in execution_state.semantic_data
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
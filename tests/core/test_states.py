@@ -261,8 +261,34 @@ def test_port_and_outcome_removal(caplog):
     assert_logger_warnings_and_errors(caplog)
 
 
+def test_cached_state_paths(caplog):
+    state = ExecutionState("state")
+    inner_container = ContainerState("inner")
+    inner_container.add_state(state)
+    container = ContainerState("outer")
+    container.add_state(inner_container)
+
+    assert state.get_path() == "/".join([container.state_id, inner_container.state_id, state.state_id])
+    assert state.get_path(by_name=True) == "outer/inner/state"
+    assert state.get_path("appendix", by_name=True) == "outer/inner/state/appendix"
+
+    # the cached paths of all descendants are updated, if an ancestor changes
+    inner_container.name = "renamed"
+    assert state.get_path(by_name=True) == "outer/renamed/state"
+    container.change_state_id("NEWID")
+    assert state.get_path() == "/".join(["NEWID", inner_container.state_id, state.state_id])
+    state.change_state_id("CHILD")
+    assert state.get_path() == "/".join(["NEWID", inner_container.state_id, "CHILD"])
+
+    container.remove_state(inner_container.state_id, recursive=False, destroy=False)
+    assert state.get_path(by_name=True) == "renamed/state"
+
+    assert_logger_warnings_and_errors(caplog)
+
+
 if __name__ == '__main__':
     test_create_state(None)
     test_port_and_outcome_removal(None)
     test_create_container_state(None)
+    test_cached_state_paths(None)
     # pytest.main([__file__])
@@ -81,5 +81,34 @@ def test_transition_creation(caplog):
     rafcon.core.singleton.state_machine_manager.delete_all_state_machines()
 
 
+def test_transition_lookup_for_outcome():
+    sm = create_state_machine()
+    root_state = sm.root_state
+    states_by_name = {state.name: state for state in root_state.states.values()}
+    state1 = states_by_name["DummyState1"]
+    state2 = states_by_name["DummyState2"]
+
+    transition = root_state.get_transition_for_outcome(state1, state1.outcomes[3])
+    assert transition.to_state == state2.state_id
+    assert root_state.get_transition_for_outcome(state1, state1.outcomes[-1]) is None
+
+    # modifications of the transition origin are reflected by the lookup
+    root_state.remove_transition(root_state.get_transition_for_outcome(state1, state1.outcomes[4]).transition_id)
+    assert root_state.get_transition_for_outcome(state1, state1.outcomes[4]) is None
+    transition.from_outcome = 4
+    assert root_state.get_transition_for_outcome(state1, state1.outcomes[3]) is None
+    assert root_state.get_transition_for_outcome(state1, state1.outcomes[4]) is transition
+    transition.modify_origin(state1.state_id, 3)
+    assert root_state.get_transition_for_outcome(state1, state1.outcomes[3]) is transition
+
+    # the lookup also works for loaded state machines, whose transitions are assigned directly
+    storage_path = testing_utils.get_unique_temp_path()
+    storage.save_state_machine_to_path(sm, storage_path)
+    sm_loaded = storage.load_state_machine_from_path(storage_path)
+    loaded_state1 = sm_loaded.root_state.states[state1.state_id]
+    loaded_transition = sm_loaded.root_state.get_transition_for_outcome(loaded_state1, loaded_state1.outcomes[3])
+    assert loaded_transition.transition_id == transition.transition_id
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
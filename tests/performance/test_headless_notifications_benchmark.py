@@ -0,0 +1,48 @@
+from builtins import range
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core import notifications
+from rafcon.core.state_machine import StateMachine
+
+# test environment elements
+from tests import utils as testing_utils
+from tests.performance.core_performance import create_hierarchy_state
+
+number_of_states = 100
+
+SCRIPT_TEXT = """
+def execute(self, inputs, outputs, gvm):
+    outputs["output1"] = inputs["input1"]
+    return 0
+"""
+
+
+def create_state_machine():
+    root_state = create_hierarchy_state(number_of_states)
+    for state in root_state.states.values():
+        state.script_text = SCRIPT_TEXT
+    return StateMachine(root_state)
+
+
+def execute_state_machine(state_machine):
+    rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+    rafcon.core.singleton.state_machine_execution_engine.join()
+
+
+@pytest.mark.parametrize("headless", [False, True])
+def test_execution_with_headless_notifications(benchmark, caplog, headless):
+    testing_utils.initialize_environment_core()
+    state_machine = create_state_machine()
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    if headless:
+        notifications.enable_headless_notifications()
+    try:
+        benchmark.pedantic(execute_state_machine, args=(state_machine,), iterations=1, rounds=10)
+        assert state_machine.root_state.final_outcome.outcome_id == 1
+        benchmark.extra_info["time_per_step"] = benchmark.stats.stats.mean / number_of_states
+    finally:
+        notifications.disable_headless_notifications()
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
@@ -0,0 +1,39 @@
+import os
+import pytest
+
+# core elements
+from rafcon.core.storage import storage
+from rafcon.utils import storage_utils
+
+# test environment elements
+from tests import utils as testing_utils
+
+example_state_machines = ["tutorials/99_bottles_of_beer", "functionality_examples"]
+json_backends = [storage_utils.JSON_BACKEND_FAST, storage_utils.JSON_BACKEND_JSONCONVERSION]
+
+
+def get_example_state_machine_paths():
+    paths = []
+    for example in example_state_machines:
+        for folder_path, _, file_names in os.walk(os.path.join(testing_utils.EXAMPLES_PATH, example)):
+            if storage.STATEMACHINE_FILE in file_names:
+                paths.append(folder_path)
+    return paths
+
+
+def load_and_save(paths):
+    for path in paths:
+        state_machine = storage.load_state_machine_from_path(path)
+        storage.save_state_machine_to_path(state_machine, os.path.join(testing_utils.get_unique_temp_path(), "copy"))
+
+
+@pytest.mark.parametrize("json_backend", json_backends)
+def test_load_and_save_examples(benchmark, caplog, json_backend):
+    testing_utils.initialize_environment_core({"STORAGE_JSON_BACKEND": json_backend})
+    paths = get_example_state_machine_paths()
+    assert paths
+    try:
+        benchmark.pedantic(load_and_save, args=(paths,), iterations=1, rounds=5)
+    finally:
+        storage_utils.json_backend = storage_utils.JSON_BACKEND_JSONCONVERSION
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
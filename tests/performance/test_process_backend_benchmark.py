@@ -0,0 +1,62 @@
+from builtins import range
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+from rafcon.core.execution.process_pool import shutdown_script_process_pool
+
+# test environment elements
+from tests import utils as testing_utils
+
+number_of_branches = 4
+
+CPU_BOUND_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    total = 0
+    for i in range(2000000):
+        total += i % 7
+    outputs["total"] = total
+    return 0
+"""
+
+DECIDER_SCRIPT = """
+def execute(self, inputs, outputs, gvm):
+    return 0
+"""
+
+
+def create_state_machine(execution_backend):
+    barrier_state = BarrierConcurrencyState("barrier")
+    for i in range(number_of_branches):
+        state = ExecutionState("branch" + str(i))
+        state.add_output_data_port("total", "int")
+        state.script_text = CPU_BOUND_SCRIPT
+        state.execution_backend = execution_backend
+        barrier_state.add_state(state)
+    decider_state = barrier_state.states[UNIQUE_DECIDER_STATE_ID]
+    decider_state.script_text = DECIDER_SCRIPT
+    barrier_state.add_transition(decider_state.state_id, 0, barrier_state.state_id, 0)
+    return StateMachine(barrier_state)
+
+
+def execute_state_machine(state_machine):
+    rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+    rafcon.core.singleton.state_machine_execution_engine.join()
+
+
+@pytest.mark.parametrize("execution_backend", ["thread", "process"])
+def test_cpu_bound_concurrency(benchmark, caplog, execution_backend):
+    testing_utils.initialize_environment_core({"SCRIPT_PROCESS_POOL_SIZE": number_of_branches})
+    state_machine = create_state_machine(execution_backend)
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    try:
+        benchmark.pedantic(execute_state_machine, args=(state_machine,), iterations=1, rounds=5, warmup_rounds=1)
+        assert state_machine.root_state.final_outcome.outcome_id == 0
+    finally:
+        shutdown_script_process_pool()
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
+        testing_utils.shutdown_environment_only_core(caplog=caplog)
@@ -0,0 +1,78 @@
+from builtins import range
+from builtins import str
+import threading
+import pytest
+
+# core elements
+import rafcon.core.singleton
+from rafcon.core.config import global_config
+from rafcon.core.script import clear_code_cache
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.barrier_concurrency_state import BarrierConcurrencyState
+from rafcon.core.constants import UNIQUE_DECIDER_STATE_ID
+from rafcon.core.state_machine import StateMachine
+
+# a script with some module level code, which is executed whenever the script module is built
+SCRIPT_TEXT = """
+import json
+import collections
+from tests.performance import test_script_compilation_benchmark as benchmark_module
+
+LOOKUP = dict((str(i), i) for i in range(1000))
+
+
+def execute(self, inputs, outputs, gvm):
+    benchmark_module.branch_started()
+    return 0
+"""
+
+started_branches = []
+all_branches_started = threading.Event()
+
+
+def branch_started():
+    started_branches.append(threading.current_thread())
+    if len(started_branches) == number_of_branches:
+        all_branches_started.set()
+
+
+number_of_branches = 32
+
+
+def create_wide_barrier_concurrency_state():
+    barrier_state = BarrierConcurrencyState("wide_barrier_concurrency")
+    for i in range(number_of_branches):
+        state = ExecutionState("branch" + str(i))
+        # make the script texts differ, so that each branch requires its own compilation
+        state.script_text = SCRIPT_TEXT + "\nBRANCH = {0}\n".format(i)
+        barrier_state.add_state(state)
+    barrier_state.add_transition(barrier_state.states[UNIQUE_DECIDER_STATE_ID].state_id, 0, barrier_state.state_id, 0)
+    return barrier_state
+
+
+def reset():
+    rafcon.core.singleton.state_machine_execution_engine.join()
+    clear_code_cache()
+    del started_branches[:]
+    all_branches_started.clear()
+
+
+def start_state_machine(state_machine):
+    """Starts the state machine and waits until the scripts of all branches are executed"""
+    rafcon.core.singleton.state_machine_execution_engine.start(state_machine.state_machine_id)
+    all_branches_started.wait()
+
+
+@pytest.mark.parametrize("precompilation", [False, True])
+def test_wide_concurrency_start_up(benchmark, precompilation):
+    state_machine = StateMachine(create_wide_barrier_concurrency_state())
+    rafcon.core.singleton.state_machine_manager.add_state_machine(state_machine)
+    global_config.set_config_value("SCRIPT_PRECOMPILATION_ON_START", precompilation)
+    try:
+        # start the execution once, so that the modules imported by the scripts are loaded
+        start_state_machine(state_machine)
+        benchmark.pedantic(start_state_machine, args=(state_machine,), setup=reset, iterations=1, rounds=10)
+    finally:
+        reset()
+        global_config.set_config_value("SCRIPT_PRECOMPILATION_ON_START", True)
+        rafcon.core.singleton.state_machine_manager.remove_state_machine(state_machine.state_machine_id)
@@ -0,0 +1,49 @@
+from builtins import range
+from builtins import str
+import os
+import pytest
+
+# core elements
+from rafcon.core.config import global_config
+from rafcon.core.states.execution_state import ExecutionState
+from rafcon.core.states.hierarchy_state import HierarchyState
+from rafcon.core.state_machine import StateMachine
+from rafcon.core.storage import storage
+
+# test environment elements
+from tests import utils as testing_utils
+
+number_of_hierarchy_states = 20
+number_of_execution_states = 20
+
+
+def create_large_state_machine():
+    root_state = HierarchyState("root")
+    for i in range(number_of_hierarchy_states):
+        hierarchy_state = HierarchyState("hierarchy" + str(i))
+        for j in range(number_of_execution_states):
+            state = ExecutionState("execution" + str(j))
+            state.add_input_data_port("input", "int", 0)
+            state.add_output_data_port("output", "int", 0)
+            state.semantic_data["key"] = j
+            hierarchy_state.add_state(state)
+        root_state.add_state(hierarchy_state)
+    return StateMachine(root_state)
+
+
+@pytest.fixture(scope="module")
+def state_machine_path():
+    path = os.path.join(testing_utils.get_unique_temp_path(), "large_state_machine")
+    storage.save_state_machine_to_path(create_large_state_machine(), path)
+    return path
+
+
+@pytest.mark.parametrize("number_of_threads", [0, 8])
+def test_state_machine_loading(benchmark, state_machine_path, number_of_threads):
+    global_config.set_config_value("STATE_MACHINE_LOADER_THREADS", number_of_threads)
+    try:
+        state_machine = benchmark.pedantic(storage.load_state_machine_from_path, args=(state_machine_path,),
+                                           iterations=1, rounds=5)
+        assert len(state_machine.root_state.states) == number_of_hierarchy_states
+    finally:
+        global_config.set_config_value("STATE_MACHINE_LOADER_THREADS", 8)
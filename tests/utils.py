@@ -409,7 +409,7 @@ def patch_gtkmvc3_model_mt():
 
     original_ModelMT_notify_observer = gtkmvc3.model_mt.ModelMT.__notify_observer__
     original_state_start = rafcon.core.states.state.State.start
-    original_run_state_machine = rafcon.core.execution.execution_engine.ExecutionEngine._run_active_state_machine
+    original_run_state_machine = rafcon.core.execution.execution_engine.ExecutionEngine._run_state_machine
     print(original_ModelMT_notify_observer, original_run_state_machine, original_state_start)
     state_threads = []
 
@@ -423,24 +423,24 @@ def patch_gtkmvc3_model_mt():
         state_threads.append(self.thread)
         self.thread.start()
 
-    def _patched_run_active_state_machine(self):
-        """Store running state machine and observe its status
+    def _patched_run_state_machine(self, context, state_machine):
+        """Run the state machine in the given execution context and observe its status
         """
         import queue
-        # Create new concurrency queue for root state to be able to synchronize with the execution
-        self._ExecutionEngine__running_state_machine = self.state_machine_manager.get_active_state_machine()
-        self._ExecutionEngine__running_state_machine.root_state.concurrency_queue = queue.Queue(maxsize=0)
-
-        if self._ExecutionEngine__running_state_machine:
-            self._ExecutionEngine__running_state_machine.start()
-
-            self._ExecutionEngine__wait_for_finishing_thread = threading.Thread(target=self._wait_for_finishing)
+        if state_machine:
+            context.state_machine = state_machine
+            # Create new concurrency queue for root state to be able to synchronize with the execution
+            state_machine.root_state.concurrency_queue = queue.Queue(maxsize=0)
+            context.state_machine_running = True
+            state_machine.start()
+
+            context.wait_for_finishing_thread = threading.Thread(target=self._wait_for_finishing, args=(context,))
             # !!!!!!!!!!!!! patched line !!!!!!!!!!!!!
-            state_threads.append(self._ExecutionEngine__wait_for_finishing_thread)
-            self._ExecutionEngine__wait_for_finishing_thread.start()
+            state_threads.append(context.wait_for_finishing_thread)
+            context.wait_for_finishing_thread.start()
         else:
             logger.warning("Currently no active state machine! Please create a new state machine.")
-            self.set_execution_mode(StateMachineExecutionStatus.STOPPED)
+            self._set_execution_mode_of_context(context, StateMachineExecutionStatus.STOPPED)
 
     def __patched__notify_observer__(self, observer, method, *args, **kwargs):
         """This makes a call either through the Gtk.idle list or a
@@ -487,7 +487,7 @@ def patch_gtkmvc3_model_mt():
 
     gtkmvc3.model_mt.ModelMT.__notify_observer__ = __patched__notify_observer__
     rafcon.core.states.state.State.start = state_start
-    rafcon.core.execution.execution_engine.ExecutionEngine._run_active_state_machine = _patched_run_active_state_machine
+    rafcon.core.execution.execution_engine.ExecutionEngine._run_state_machine = _patched_run_state_machine
 
 
 def unpatch_gtkmvc3_model_mt():